@@ -1,177 +1,306 @@
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from io import StringIO
-from json import loads
+from json import load
 import os
-from pathlib import Path
-import shutil
-from xml.dom import minidom
+import time
+from xml.sax.saxutils import XMLGenerator
 import xml.etree.cElementTree as ET
 
 import click
-from setup_data_to_json import SetupToJson
+from simulation_suites import SimulationSuites
 
 
 class collectTestSuites:
 
-    def generate(self, setup_py_file_path='test/setup.py',
-                 inoutdir_simulation_results_dir_path='test/SimulationResults'):
-        # --------------------------
-        # extract data from setup.py
-        # --------------------------
-        extractor = SetupToJson()
-        file_path = open(setup_py_file_path, 'r')
-        print("reading {}".format(setup_py_file_path))
-        json_string = extractor.extract(setup_py_file_path)
-        static_setup_data = loads(json_string)
-
-        test_suite_data_dict = {}
-        for test_suite in static_setup_data["test_suites"]:
-            if "testsuite-indexes" in test_suite:
-                for i in range(int(test_suite["testsuite-indexes"])):
-                    test_suite_data_dict["{}_{:d}".format(
-                        test_suite["testsuite-name"], i)] = {"file": test_suite["file"], "test_cases_dict": {}}
-            else:
-                test_suite_data_dict[test_suite["testsuite-name"]] = {"file": test_suite["file"], "test_cases_dict": {}}
+    def parse_test_case(self, p):
+        tcaseTree = ET.parse(p)
+        tcase = tcaseTree.getroot()
+        test_case = {"attributes": {"name": tcase.attrib['name'],
+                                    "assertions": tcase.attrib['assertions'],
+                                    "classname": tcase.attrib['classname'],
+                                    "file": tcase.attrib['file'],
+                                    "line": tcase.attrib['line']},
+                     "properties": [(e.attrib["name"], e.attrib["value"]) for e in tcase.findall('./properties/property')]}
+        for k in ["skipped", "error", "failure"]:
+            e = tcase.find('./' + k)
+            test_case[k] = None if e is None else e.attrib.get("message")
+            test_case[k + "-present"] = e is not None
+        return test_case
 
-        for test_suite, test_suite_data in test_suite_data_dict.items():
-            for f in os.listdir(inoutdir_simulation_results_dir_path):
-                p = inoutdir_simulation_results_dir_path + '/' + f
-                if os.path.isfile(p):
-                    if Path(f).suffix == '.xml' and f.startswith(test_suite) and f[len(test_suite)] == '_':
-                        test_suite_data["test_cases_dict"][f] = {}
-                        test_suite_data["test_cases_dict"][f]["end-date"] = datetime.fromtimestamp(
-                            Path(p).stat().st_mtime)
-                        fs = f.replace('.xml', '.start')
-                        ps = inoutdir_simulation_results_dir_path + '/' + fs
-                        test_suite_data["test_cases_dict"][f]["start-date"] = datetime.fromtimestamp(
-                            Path(ps).stat().st_mtime)
+    def index_test_cases(self, inoutdir_simulation_results_dir_path, test_suites):
+        # the directory is listed once, each .xml is assigned to the longest suite name it starts with
+        test_cases_dict = {test_suite: [] for test_suite in test_suites}
+        for f in sorted(os.listdir(inoutdir_simulation_results_dir_path)):
+            stem, suffix = os.path.splitext(f)
+            if suffix != '.xml':
+                continue
+            i = stem.rfind('_')
+            while i > 0:
+                if stem[:i] in test_cases_dict:
+                    test_cases_dict[stem[:i]].append(f)
+                    break
+                i = stem.rfind('_', 0, i)
+        return test_cases_dict
+
+    def read_usage(self, p):
+        if not os.path.isfile(p):
+            return None
+        with open(p, "r") as f:
+            return load(f)
+
+    def summarize(self, test_suite, test_suite_data, test_cases, tsuites_start, usage):
+        tsuite = {"name": test_suite, "file": test_suite_data["file"], "test_cases": test_cases,
+                  "tests": 0, "skipped": 0, "errors": 0, "failures": 0, "assertions": 0, "properties": []}
+        tsuite_start = None
+        tsuite_end = None
+        for test_case in test_cases:
+            tsuite["tests"] += 1
+            tsuite["assertions"] += int(test_case["attributes"]["assertions"])
+            tsuite["skipped"] += 1 if test_case["skipped-present"] else 0
+            tsuite["errors"] += 1 if test_case["error-present"] else 0
+            tsuite["failures"] += 1 if test_case["failure-present"] else 0
+            if tsuite_start is None or test_case["start-date"] < tsuite_start:
+                tsuite_start = test_case["start-date"]
+            if tsuite_end is None or test_case["end-date"] > tsuite_end:
+                tsuite_end = test_case["end-date"]
+        if tsuite["tests"] == 0:
+            # the suite left no test case results, e.g. it aborted before its first test case
+            tsuite["errors"] += 1
+            tsuite_start = tsuites_start
+            tsuite_end = tsuites_start
+        tsuite["timestamp"] = tsuite_start.isoformat()
+        tsuite["time"] = str((tsuite_end - tsuite_start).total_seconds())
+        if usage is not None:
+            # measured by the runner for the whole simulator process instead of between test case file mtimes
+            tsuite["timestamp"] = datetime.fromtimestamp(usage["start"]).isoformat()
+            tsuite["time"] = "{:.6f}".format(usage["wall_time"])
+            tsuite["properties"] = [("wall-time", "{:.6f}".format(usage["wall_time"])),
+                                    ("user-cpu-time", "{:.6f}".format(usage["user_time"])),
+                                    ("system-cpu-time", "{:.6f}".format(usage["system_time"])),
+                                    ("peak-rss-kb", str(usage["peak_rss_kb"])),
+                                    ("exit-code", str(usage["exit_code"]))]
+        return tsuite
+
+    def write_text_file(self, xg, name, p):
+        xg.startElement(name, {})
+        if os.path.isfile(p):
+            with open(p, "r") as f:
+                for chunk in iter(lambda: f.read(1 << 16), ""):
+                    xg.characters(chunk)
+        xg.endElement(name)
 
+    def write_element(self, xg, e, indent):
+        xg.ignorableWhitespace(indent)
+        xg.startElement(e.tag, e.attrib)
+        if e.text is not None and e.text.strip():
+            xg.characters(e.text)
+        for c in e:
+            self.write_element(xg, c, indent + "   ")
+        if len(e):
+            xg.ignorableWhitespace(indent)
+        xg.endElement(e.tag)
+
+    def write_test_suite(self, xg, tsuite, inoutdir_simulation_results_dir_path):
+        xg.ignorableWhitespace("\n   ")
+        xg.startElement("testsuite", {"name": tsuite["name"],
+                                      "tests": str(tsuite["tests"]),
+                                      "skipped": str(tsuite["skipped"]),
+                                      "errors": str(tsuite["errors"]),
+                                      "failures": str(tsuite["failures"]),
+                                      "assertions": str(tsuite["assertions"]),
+                                      "timestamp": tsuite["timestamp"],
+                                      "time": tsuite["time"],
+                                      "file": tsuite["file"]})
+        if tsuite["properties"]:
+            xg.ignorableWhitespace("\n      ")
+            xg.startElement("properties", {})
+            for name, value in tsuite["properties"]:
+                xg.ignorableWhitespace("\n         ")
+                xg.startElement("property", {"name": name, "value": value})
+                xg.endElement("property")
+            xg.ignorableWhitespace("\n      ")
+            xg.endElement("properties")
+        xg.ignorableWhitespace("\n      ")
+        self.write_text_file(xg, "system-out", inoutdir_simulation_results_dir_path + '/' + tsuite["name"] + ".out")
+        xg.ignorableWhitespace("\n      ")
+        self.write_text_file(xg, "system-err", inoutdir_simulation_results_dir_path + '/' + tsuite["name"] + ".err")
+        for test_case in tsuite["test_cases"]:
+            xg.ignorableWhitespace("\n      ")
+            attributes = dict(test_case["attributes"])
+            attributes["time"] = str((test_case["end-date"] - test_case["start-date"]).total_seconds())
+            xg.startElement("testcase", attributes)
+            xg.ignorableWhitespace("\n         ")
+            xg.startElement("properties", {})
+            for name, value in test_case["properties"]:
+                xg.ignorableWhitespace("\n            ")
+                xg.startElement("property", {"name": name, "value": value})
+                xg.endElement("property")
+            if test_case["properties"]:
+                xg.ignorableWhitespace("\n         ")
+            xg.endElement("properties")
+            for k in ["skipped", "error", "failure"]:
+                if test_case[k + "-present"]:
+                    xg.ignorableWhitespace("\n         ")
+                    xg.startElement(k, {} if test_case[k] is None else {"message": test_case[k]})
+                    xg.endElement(k)
+            xg.ignorableWhitespace("\n      ")
+            xg.endElement("testcase")
+        xg.ignorableWhitespace("\n   ")
+        xg.endElement("testsuite")
+
+    def select_test_suites(self, setup_py_file_path, inoutdir_simulation_results_dir_path):
+        suites = SimulationSuites()
+        static_setup_data = suites.read(setup_py_file_path)
+        test_suite_data_dict = suites.expand(static_setup_data)
+
+        # a sharded run only collects the suites it has simulated
+        shp = inoutdir_simulation_results_dir_path + "/testSuitesSimulation.shard"
+        if os.path.isfile(shp):
+            with open(shp, "r") as f:
+                shard_test_suites = load(f)["test_suites"]
+            test_suite_data_dict = {k: v for k, v in test_suite_data_dict.items() if k in shard_test_suites}
+
+        # a rerun of failed suites only collects the rerun suites and patches them into the existing report
+        rerun_test_suites = None
+        rrp = inoutdir_simulation_results_dir_path + "/testSuitesSimulation.rerun"
+        if os.path.isfile(rrp):
+            with open(rrp, "r") as f:
+                rerun_test_suites = load(f)["test_suites"]
+            test_suite_data_dict = {k: v for k, v in test_suite_data_dict.items() if k in rerun_test_suites}
+        return test_suite_data_dict, rerun_test_suites
+
+    def collect(self, test_suite_data_dict, rerun_test_suites, inoutdir_simulation_results_dir_path, executor,
+                parsed, final=True):
         p = inoutdir_simulation_results_dir_path + '/' + "testSuitesSimulation.start"
-        tsuites_start = datetime.fromtimestamp(Path(p).stat().st_mtime)
+        tsuites_start = datetime.fromtimestamp(os.stat(p).st_mtime)
         p = inoutdir_simulation_results_dir_path + '/' + "testSuitesSimulation.end"
-        tsuites_end = datetime.fromtimestamp(Path(p).stat().st_mtime)
-        tsuites_tests = 0
-        tsuites_skipped = 0
-        tsuites_errors = 0
-        tsuites_failures = 0
-        tsuites_assertions = 0
-        tsuites = ET.Element("testsuites", name="testSuitesSimulation")
+        tsuites_end = datetime.fromtimestamp(os.stat(p).st_mtime) if final else datetime.now()
+
+        # parsed test cases are kept by file name and mtime, so a watching collector only parses new files
+        test_case_files_dict = self.index_test_cases(inoutdir_simulation_results_dir_path, test_suite_data_dict)
+        test_case_files = []
+        for test_suite in test_suite_data_dict:
+            for f in test_case_files_dict[test_suite]:
+                mtime = os.stat(inoutdir_simulation_results_dir_path + '/' + f).st_mtime
+                test_case_files.append((f, mtime))
+        new_test_case_files = [k for k in test_case_files if k not in parsed]
+        if final:
+            print("processing {:d} test cases of {:d} suites".format(len(test_case_files), len(test_suite_data_dict)))
+        paths = [inoutdir_simulation_results_dir_path + '/' + f for f, mtime in new_test_case_files]
+        for k, test_case in zip(new_test_case_files, executor.map(self.parse_test_case_if_complete, paths,
+                                                                  [final] * len(paths), chunksize=64)):
+            if test_case is not None:
+                parsed[k] = test_case
+                if test_case["failure-present"] or test_case["error-present"]:
+                    print("failed {}".format(test_case["attributes"]["name"]))
+
+        tsuites_dict = {}
         for test_suite, test_suite_data in test_suite_data_dict.items():
-            print("processing {}".format(test_suite))
-            tsuite = ET.SubElement(tsuites, "testsuite", name=test_suite)
-            tsuite_system_out = ET.SubElement(tsuite, "system-out")
-            sop = inoutdir_simulation_results_dir_path + '/' + test_suite + ".out"
-            with open(sop, "r") as f:
-                tsuite_system_out.text = f.read()
-            tsuite_system_err = ET.SubElement(tsuite, "system-err")
-            soe = inoutdir_simulation_results_dir_path + '/' + test_suite + ".err"
-            with open(soe, "r") as f:
-                tsuite_system_err.text = f.read()
-
-            tsuite_tests = 0
-            tsuite_skipped = 0
-            tsuite_errors = 0
-            tsuite_failures = 0
-            tsuite_assertions = 0
-            tsuite_assertions = 0
-            tsuite_start = None
-            tsuite_end = None
-            test_cases_dict = test_suite_data["test_cases_dict"]
-            for k, test_cases_dict in test_cases_dict.items():
-                print("processing {}".format(k))
-                tsuite_tests += 1
-                p = inoutdir_simulation_results_dir_path + '/' + k
-                tcaseTree = ET.parse(p)
-                tcase = tcaseTree.getroot()
-                tcase_name = tcaseTree.find('.').attrib['name']
-                tcase_assertions = tcaseTree.find('.').attrib['assertions']
-                tsuite_assertions += int(tcase_assertions)
-                tcase_classname = tcaseTree.find('.').attrib['classname']
-                tcase_file = tcaseTree.find('.').attrib['file']
-                tcase_line = tcaseTree.find('.').attrib['file']
-                tcase_start = test_cases_dict["start-date"]
-                tcase_end = test_cases_dict["end-date"]
-                td = tcase_end - tcase_start
-                if tsuite_start is None:
-                    tsuite_start = tcase_start
-                else:
-                    if tcase_start < tsuite_start:
-                        tsuite_start = tcase_start
-                if tsuite_end is None:
-                    tsuite_end = tcase_end
-                else:
-                    if tsuite_end > tcase_end:
-                        tsuite_end = tcase_end
-                tcase_time = str(td.total_seconds())
-                tcase_properties = tcaseTree.findall('./properties/property')
-                tcase_skipped = tcaseTree.find('./skipped')
-                tcase_error = tcaseTree.find('./error')
-                tcase_failure = tcaseTree.find('./failure')
-
-                testcase = ET.SubElement(tsuite, "testcase",
-                                         name=tcase_name,
-                                         assertions=tcase_assertions,
-                                         classname=tcase_classname,
-                                         file=tcase_file,
-                                         line=tcase_line,
-                                         time=tcase_time)
-                properties = ET.SubElement(testcase, "properties")
-
-                for tcase_property in tcase_properties:
-                    ET.SubElement(
-                        properties,
-                        "property",
-                        name=tcase_property.attrib["name"],
-                        value=tcase_property.attrib["value"])
-
-                if tcase_skipped is not None:
-                    tsuite_skipped += 1
-                    if tcase_skipped.attrib["message"] is not None:
-                        ET.SubElement(testcase, "skipped", message=tcase_skipped.attrib["message"])
-                    else:
-                        ET.SubElement(testcase, "skipped")
-
-                if tcase_error is not None:
-                    tsuite_error += 1
-                    if tcase_error.attrib["message"] is not None:
-                        ET.SubElement(testcase, "error", message=tcase_error.attrib["message"])
-                    else:
-                        ET.SubElement(testcase, "error")
-
-                if tcase_failure is not None:
-                    tsuite_failures += 1
-                    if tcase_failure.attrib["message"] is not None:
-                        ET.SubElement(testcase, "failure", message=tcase_failure.attrib["message"])
-                    else:
-                        ET.SubElement(testcase, "failure")
-
-            tsuite.set("tests", str(tsuite_tests))
-            tsuite.set("skipped", str(tsuite_skipped))
-            tsuite.set("errors", str(tsuite_errors))
-            tsuite.set("failures", str(tsuite_failures))
-            tsuite.set("assertions", str(tsuite_assertions))
-            tsuite.set("timestamp", str(tsuite_start.isoformat()))
-            tsuite.set("time", str((tsuite_end - tsuite_start).total_seconds()))
-            tsuite.set("file", test_suite_data["file"])
-
-            tsuites_tests += tsuite_tests
-            tsuites_skipped += tsuite_skipped
-            tsuites_errors += tsuite_errors
-            tsuites_failures += tsuite_failures
-            tsuites_assertions += tsuite_assertions
-            tsuites.set("tests", str(tsuites_tests))
-            tsuites.set("skipped", str(tsuites_skipped))
-            tsuites.set("errors", str(tsuites_errors))
-            tsuites.set("failures", str(tsuites_failures))
-            tsuites.set("assertions", str(tsuites_assertions))
-            tsuites.set("timestamp", str(tsuites_start.isoformat()))
-            tsuites.set("time", str((tsuites_end - tsuites_start).total_seconds()))
-
-        ts_str = minidom.parseString(ET.tostring(tsuites)).toprettyxml(indent="   ")
+            test_cases = []
+            for f in test_case_files_dict[test_suite]:
+                p = inoutdir_simulation_results_dir_path + '/' + f
+                k = (f, os.stat(p).st_mtime)
+                if k not in parsed:
+                    continue
+                test_case = parsed[k]
+                test_case["end-date"] = datetime.fromtimestamp(k[1])
+                ps = p[:-len('.xml')] + '.start'
+                test_case["start-date"] = datetime.fromtimestamp(os.stat(ps).st_mtime if os.path.isfile(ps) else k[1])
+                test_cases.append(test_case)
+            if test_cases or final:
+                usage = self.read_usage(inoutdir_simulation_results_dir_path + '/' + test_suite + ".usage")
+                tsuites_dict[test_suite] = self.summarize(test_suite, test_suite_data, test_cases, tsuites_start,
+                                                          usage)
+
         tsp = inoutdir_simulation_results_dir_path + "/testSuitesSimulation.xml"
-        print("writing {}".format(tsp))
-        with open(tsp, "w") as f:
-            f.write(ts_str)
+        tsuites_timing = {"timestamp": tsuites_start.isoformat(),
+                          "time": str((tsuites_end - tsuites_start).total_seconds())}
+        # ordered list of suites to write, each either freshly collected or kept from the existing report
+        entries = [tsuites_dict[test_suite] for test_suite in tsuites_dict]
+        if rerun_test_suites is not None and os.path.isfile(tsp):
+            if final:
+                print("patching {}".format(tsp))
+            existing = ET.parse(tsp).getroot()
+            tsuites_timing = {k: existing.attrib.get(k, v) for k, v in tsuites_timing.items()}
+            entries = []
+            for e in existing.findall("testsuite"):
+                entries.append(tsuites_dict.pop(e.attrib["name"], e))
+            entries += tsuites_dict.values()
+
+        tsuites_attributes = {"name": "testSuitesSimulation"}
+        for k in ["tests", "skipped", "errors", "failures", "assertions"]:
+            tsuites_attributes[k] = str(sum(int(e.attrib[k]) if ET.iselement(e) else e[k] for e in entries))
+        tsuites_attributes.update(tsuites_timing)
+
+        if final:
+            print("writing {}".format(tsp))
+        # written aside and renamed, so readers always see a complete report
+        tmp = "{}.{:d}.tmp".format(tsp, os.getpid())
+        with open(tmp, "w", encoding="utf-8") as f:
+            xg = XMLGenerator(f, "utf-8", short_empty_elements=True)
+            xg.startDocument()
+            xg.startElement("testsuites", tsuites_attributes)
+            for e in entries:
+                if ET.iselement(e):
+                    self.write_element(xg, e, "\n   ")
+                else:
+                    self.write_test_suite(xg, e, inoutdir_simulation_results_dir_path)
+            xg.ignorableWhitespace("\n")
+            xg.endElement("testsuites")
+            xg.ignorableWhitespace("\n")
+            xg.endDocument()
+        os.replace(tmp, tsp)
+        rrp = inoutdir_simulation_results_dir_path + "/testSuitesSimulation.rerun"
+        if final and rerun_test_suites is not None and os.path.isfile(rrp):
+            # the rerun is patched in, a later collection must not be restricted to its suites again
+            os.remove(rrp)
+        tsuites_attributes["finished"] = str(len(tsuites_dict))
+        return tsuites_attributes
+
+    def parse_test_case_if_complete(self, p, final):
+        # while watching a test case file may still be written by the simulator
+        try:
+            return self.parse_test_case(p)
+        except ET.ParseError:
+            if final:
+                raise
+            return None
+
+    def generate(self, setup_py_file_path='test/setup.py',
+                 inoutdir_simulation_results_dir_path='test/SimulationResults',
+                 jobs=0, watch=False, watch_interval=2.0):
+        parsed = {}
+        with ProcessPoolExecutor(max_workers=jobs if jobs > 0 else None) as executor:
+            if watch:
+                # only the marker the runner writes once it has removed the stale results and markers of an
+                # earlier run is followed, the partial report is refreshed as long as it exists
+                p = inoutdir_simulation_results_dir_path + '/' + "testSuitesSimulation.running"
+                print("waiting for {}".format(p))
+                while not os.path.isfile(p):
+                    time.sleep(watch_interval)
+                test_suite_data_dict, rerun_test_suites = self.select_test_suites(
+                    setup_py_file_path, inoutdir_simulation_results_dir_path)
+                summary = None
+                while os.path.isfile(p):
+                    if os.path.isfile(inoutdir_simulation_results_dir_path + '/' + "testSuitesSimulation.start"):
+                        tsuites_attributes = self.collect(test_suite_data_dict, rerun_test_suites,
+                                                          inoutdir_simulation_results_dir_path, executor, parsed,
+                                                          final=False)
+                        last_summary = summary
+                        summary = "{} of {:d} suites, tests {}, failures {}, errors {}, skipped {}".format(
+                            tsuites_attributes["finished"], len(test_suite_data_dict), tsuites_attributes["tests"],
+                            tsuites_attributes["failures"], tsuites_attributes["errors"], tsuites_attributes["skipped"])
+                        if summary != last_summary:
+                            print(summary)
+                    time.sleep(watch_interval)
+                # the final collection takes the end time of the run from testSuitesSimulation.end
+                while not os.path.isfile(inoutdir_simulation_results_dir_path + '/' + "testSuitesSimulation.end"):
+                    time.sleep(watch_interval)
+            else:
+                test_suite_data_dict, rerun_test_suites = self.select_test_suites(
+                    setup_py_file_path, inoutdir_simulation_results_dir_path)
+            self.collect(test_suite_data_dict, rerun_test_suites, inoutdir_simulation_results_dir_path, executor,
+                         parsed)
 
 
 @click.command()
@@ -179,10 +308,17 @@ class collectTestSuites:
 @click.option('--inoutdir_simulation_results_dir_path',
               default='../../../simulation/SimulationResults',
               help='input and output directory with testcaseTrees to combine')
-def generate(infile, inoutdir_simulation_results_dir_path):
+@click.option('--jobs', default=0, help='number of processes parsing test case files, 0 uses all cpus')
+@click.option('--watch', is_flag=True,
+              help='keep a partial testSuitesSimulation.xml up to date while the runner of the suites is running')
+@click.option('--watch_interval', default=2.0, help='seconds between two polls in watch mode')
+def generate(infile, inoutdir_simulation_results_dir_path, jobs, watch, watch_interval):
     obj = collectTestSuites()
     obj. generate(setup_py_file_path=infile,
-                  inoutdir_simulation_results_dir_path=inoutdir_simulation_results_dir_path
+                  inoutdir_simulation_results_dir_path=inoutdir_simulation_results_dir_path,
+                  jobs=jobs,
+                  watch=watch,
+                  watch_interval=watch_interval
                   )
 
 
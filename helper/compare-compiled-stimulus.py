@@ -0,0 +1,92 @@
+import difflib
+import os
+import subprocess
+
+import click
+from simulation_suites import SimulationSuites
+from stimulus_compiler import StimulusCompiler
+
+
+class CompareCompiledStimulus:
+
+    # lines only printed while the stimulus is loaded differ between the two forms
+    loader_prefixes = ("include found: ", "nested include found", "error: unable to open include file",
+                       "loading compiled stimulus file ")
+
+    def find_test(self, static_setup_data, name):
+        for test in static_setup_data.get("test_suites", []) + static_setup_data.get("test_labs", []):
+            if name in (test.get("testsuite-name"), test.get("testlab-name")):
+                return test
+        raise click.ClickException("{} is neither a test suite nor a test lab of the setup".format(name))
+
+    def run_simulation(self, executable, args, work_dir_path, log_file_path):
+        with open(log_file_path, "w") as fo:
+            exit_code = subprocess.call([executable] + args, cwd=work_dir_path, stdout=fo, stderr=subprocess.STDOUT)
+        with open(log_file_path, "r", encoding="latin-1") as f:
+            lines = [l for l in f.read().split("\n") if not l.startswith(self.loader_prefixes)]
+        return exit_code, lines
+
+    def compare_test(self, name, test, executable, work_dir_path, stimulus_path, compare_dir_path):
+        compiled_stimulus_path = compare_dir_path + '/'
+        suites = SimulationSuites()
+        csp = compiled_stimulus_path + suites.compiled_stimulus_file(test["entry-file"])
+        os.makedirs(os.path.dirname(csp), exist_ok=True)
+        StimulusCompiler().compile(stimulus_path, test["entry-file"], csp)
+        interpreted_exit_code, interpreted = self.run_simulation(
+            executable, suites.arguments(test, stimulus_path), work_dir_path, compare_dir_path + '/' + name + ".out")
+        compiled_exit_code, compiled = self.run_simulation(
+            executable, suites.arguments(test, stimulus_path, compiled_stimulus_path), work_dir_path,
+            compare_dir_path + '/' + name + "_compiled.out")
+        diff = list(difflib.unified_diff(interpreted, compiled, name + ".out", name + "_compiled.out", lineterm=""))
+        if interpreted_exit_code != compiled_exit_code:
+            diff.append("exit code {:d} interpreted, {:d} compiled".format(interpreted_exit_code, compiled_exit_code))
+        return diff
+
+    def compare(self, setup_py_file_path='setup.py',
+                indir_simulation_work_dir_path='simulation/ghdl/work',
+                indir_stimulus_path='tb/simstm',
+                outdir_compare_dir_path='simulation/CompiledStimulusCompare',
+                tests=None):
+        static_setup_data = SimulationSuites().read(setup_py_file_path)
+        work_dir_path = os.path.abspath(indir_simulation_work_dir_path)
+        stimulus_path = os.path.abspath(indir_stimulus_path) + '/'
+        compare_dir_path = os.path.abspath(outdir_compare_dir_path)
+        executable = work_dir_path + '/' + static_setup_data["tb_top_entity"].lower()
+        os.makedirs(compare_dir_path, exist_ok=True)
+
+        # the interpreted and the compiled stimulus of a test must load the same program and print the same
+        differing = []
+        for name in tests or ["testLabBasicIncludeNested"]:
+            diff = self.compare_test(name, self.find_test(static_setup_data, name), executable, work_dir_path,
+                                     stimulus_path, compare_dir_path)
+            if diff:
+                print("\n".join(diff))
+                differing.append(name)
+            else:
+                print("{} compiled output equals interpreted output".format(name))
+        if differing:
+            raise click.ClickException("compiled output differs from interpreted output: {}".format(
+                ", ".join(differing)))
+
+
+@click.command()
+@click.option('--infile', default='setup.py', help='setup_py_file_path')
+@click.option('--indir_simulation_work_dir_path', default='simulation/ghdl/work',
+              help='work directory containing the elaborated simulation binary')
+@click.option('--indir_stimulus_path', default='tb/simstm', help='directory containing the stimulus files')
+@click.option('--outdir_compare_dir_path', default='simulation/CompiledStimulusCompare',
+              help='output directory for the compiled stimulus files and both simulation outputs')
+@click.option('--test', 'tests', multiple=True,
+              help='test suite or test lab name, may be repeated, testLabBasicIncludeNested if omitted')
+def compare(infile, indir_simulation_work_dir_path, indir_stimulus_path, outdir_compare_dir_path, tests):
+    obj = CompareCompiledStimulus()
+    obj. compare(setup_py_file_path=infile,
+                 indir_simulation_work_dir_path=indir_simulation_work_dir_path,
+                 indir_stimulus_path=indir_stimulus_path,
+                 outdir_compare_dir_path=outdir_compare_dir_path,
+                 tests=list(tests)
+                 )
+
+
+if __name__ == '__main__':
+    compare()
@@ -0,0 +1,113 @@
+import hashlib
+from json import dump, load
+import os
+import subprocess
+
+import click
+from hdl_dependencies import HdlDependencies
+from simulation_suites import SimulationSuites
+
+
+class CompileHdlFiles:
+
+    def file_hash(self, file_path):
+        h = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        return h.hexdigest()
+
+    def analyze_arguments(self, shf, base_dir_path):
+        args = ["-a", "-v"]
+        if '2008' in shf['file_type']:
+            args.append("--std=08")
+        if 'ghdl_options' in shf:
+            args += shf['ghdl_options']
+        args.append(base_dir_path + '/' + shf['file'])
+        return args
+
+    def analysis_hash(self, hdl_file, hdl_file_dict, deps, base_dir_path, hashes):
+        if hdl_file not in hashes:
+            shf = hdl_file_dict[hdl_file]
+            h = hashlib.sha256()
+            h.update(self.file_hash(base_dir_path + '/' + hdl_file).encode())
+            h.update(shf['file_type'].encode())
+            h.update(" ".join(self.analyze_arguments(shf, '')).encode())
+            for dep in deps[hdl_file]:
+                h.update(self.analysis_hash(dep, hdl_file_dict, deps, base_dir_path, hashes).encode())
+            hashes[hdl_file] = h.hexdigest()
+        return hashes[hdl_file]
+
+    def compile(self, setup_py_file_path='test/setup.py',
+                indir_base_dir_path='.',
+                indir_simulation_work_dir_path='simulation/ghdl/work',
+                ghdl_executable='ghdl'):
+        static_setup_data = SimulationSuites().read(setup_py_file_path)
+        dependencies = HdlDependencies()
+        hdl_files = dependencies.ordered_hdl_files(static_setup_data)
+        base_dir_path = os.path.abspath(indir_base_dir_path)
+        work_dir_path = os.path.abspath(indir_simulation_work_dir_path)
+        os.makedirs(work_dir_path, exist_ok=True)
+
+        for shf in hdl_files:
+            if shf['file_type'] == 'Verilog':
+                raise click.ClickException("Verilog is not supported by ghdl: {}".format(shf['file']))
+
+        # a file is analyzed again if its content, its options or the hash of a file it uses changed
+        deps = dependencies.dependencies(base_dir_path, hdl_files)
+        hdl_file_dict = {shf['file']: shf for shf in hdl_files}
+        hashes = {}
+        for shf in hdl_files:
+            self.analysis_hash(shf['file'], hdl_file_dict, deps, base_dir_path, hashes)
+
+        hfp = work_dir_path + "/hdl-analysis-hashes.json"
+        analyzed = {}
+        if os.path.isfile(hfp):
+            with open(hfp, "r") as f:
+                analyzed = load(f)
+
+        # ghdl rewrites the library file of its workdir on every analysis, so the files are analyzed one after the
+        # other in dependency order, consecutive files with the same options by a single ghdl call
+        batches = []
+        for wave in dependencies.waves(deps, hdl_files):
+            for shf in wave:
+                if analyzed.get(shf['file']) == hashes[shf['file']]:
+                    continue
+                options = self.analyze_arguments(shf, base_dir_path)[:-1]
+                if batches and batches[-1][0] == options:
+                    batches[-1][1].append(shf)
+                else:
+                    batches.append((options, [shf]))
+        print("analyzing {:d} of {:d} files with {:d} ghdl calls".format(
+            sum(len(batch) for options, batch in batches), len(hdl_files), len(batches)))
+
+        for options, batch in batches:
+            for shf in batch:
+                print("analyzing {}".format(shf['file']))
+            subprocess.run([ghdl_executable] + options + [base_dir_path + '/' + shf['file'] for shf in batch],
+                           cwd=work_dir_path, check=True)
+            for shf in batch:
+                analyzed[shf['file']] = hashes[shf['file']]
+            self.write_hashes(hfp, analyzed)
+
+    def write_hashes(self, hashes_file_path, analyzed):
+        with open(hashes_file_path, "w") as f:
+            dump(analyzed, f, indent=4)
+
+
+@click.command()
+@click.option('--infile', default='setup.py', help='setup_py_file_path')
+@click.option('--indir_base_dir_path', default='.', help='project directory the hdl file paths are relative to')
+@click.option('--indir_simulation_work_dir_path', default='simulation/ghdl/work', help='ghdl work directory')
+@click.option('--ghdl_executable', default='ghdl', help='ghdl executable')
+def compile(infile, indir_base_dir_path, indir_simulation_work_dir_path, ghdl_executable):
+    obj = CompileHdlFiles()
+    obj. compile(setup_py_file_path=infile,
+                 indir_base_dir_path=indir_base_dir_path,
+                 indir_simulation_work_dir_path=indir_simulation_work_dir_path,
+                 ghdl_executable=ghdl_executable
+                 )
+
+
+if __name__ == '__main__':
+    compile()
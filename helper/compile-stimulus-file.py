@@ -0,0 +1,32 @@
+import os
+
+import click
+from stimulus_compiler import StimulusCompiler
+
+
+class CompileStimulusFile:
+
+    def compile(self, indir_stimulus_path='tb/simstm',
+                stimulus_file='testMain.stm',
+                outfile_path='simulation/CompiledStimulus/testMain.stmc'):
+        stimulus_path = os.path.abspath(indir_stimulus_path) + '/'
+        outfile_path = os.path.abspath(outfile_path)
+        os.makedirs(os.path.dirname(outfile_path), exist_ok=True)
+        records = StimulusCompiler().compile(stimulus_path, stimulus_file, outfile_path)
+        print("compiled {} into {:d} records".format(stimulus_file, records))
+
+
+@click.command()
+@click.option('--indir_stimulus_path', default='tb/simstm', help='directory containing the stimulus files')
+@click.option('--infile', default='testMain.stm', help='entry stimulus file relative to the stimulus directory')
+@click.option('--outfile', default='simulation/CompiledStimulus/testMain.stmc', help='compiled stimulus file')
+def compile(indir_stimulus_path, infile, outfile):
+    obj = CompileStimulusFile()
+    obj. compile(indir_stimulus_path=indir_stimulus_path,
+                 stimulus_file=infile,
+                 outfile_path=outfile
+                 )
+
+
+if __name__ == '__main__':
+    compile()
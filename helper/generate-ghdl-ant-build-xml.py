@@ -13,7 +13,6 @@ from setup_data_to_json import SetupToJson
 class GenAntBuildXml:
     def generate(self, setup_py_file_path='test/setup.py', simulation_subdir_path='test/modelsim/build_modelsim.xml'):
         target_prefix = 'ghdl-'
-        time_stamps_prefix = 'simulation/' + 'ghdl' + "/work/TimeStamps/"
         simulation_dir_prefix = 'simulation/' + 'ghdl' + '/'
 
         # --------------------------
@@ -45,21 +44,6 @@ class GenAntBuildXml:
             "tb_data_file_list": tb_data_file_list,
         }
 
-        test_suite_data_dict = {}
-        if "test_suites" in static_setup_data:
-            for test_suite in static_setup_data["test_suites"]:
-                if "testsuite-indexes" in test_suite:
-                    for i in range(int(test_suite["testsuite-indexes"])):
-                        test_suite_data_dict["{}_{:d}".format(test_suite["testsuite-name"],
-                                                              i)] = {"file": test_suite["file"],
-                                                                     "entry-file": test_suite["entry-file"],
-                                                                     "entry-label": test_suite["entry-label"],
-                                                                     "index": str(i)}
-                else:
-                    test_suite_data_dict[test_suite["testsuite-name"]] = {"file": test_suite["file"],
-                                                                          "entry-file": test_suite["entry-file"],
-                                                                          "entry-label": test_suite["entry-label"]}
-
         test_lab_data_dict = {}
         if "test_labs" in static_setup_data:
             for test_lab in static_setup_data["test_labs"]:
@@ -67,20 +51,16 @@ class GenAntBuildXml:
                                                                 "entry-file": test_lab["entry-file"],
                                                                 "entry-label": test_lab["entry-label"]}
 
-        simulation_hdl_file_list = src_data_file_list + tb_data_file_list
-
-        ordered_hdl_file_dict = {}
-
-        for shf in simulation_hdl_file_list:
-            if 'IP-XACT' not in shf['file_type']:
-                ordered_hdl_file_dict[shf['hdl_order']] = shf
-
-        ordered_hdl_file_dict = dict(sorted(ordered_hdl_file_dict.items()))
-
         root = ET.Element("project", name='ghdl')
 
         ET.SubElement(root, "property", name="ghdl-executable", value="ghdl")
         ET.SubElement(root, "property", name="gtkwave-executable", value="gtkwave")
+        ET.SubElement(root, "property", name="simulation-jobs", value="0")
+        ET.SubElement(root, "property", name="simulation-shard", value="1/1")
+        ET.SubElement(root, "property", name="simulation-cache-dir", value="simulation/SimulationCache")
+        ET.SubElement(root, "property", name="simulation-fail-fast", value="none")
+        ET.SubElement(root, "property", name="simulation-compiled-stimulus-dir", value="simulation/CompiledStimulus")
+        ET.SubElement(root, "property", name="simulation-benchmark-baseline", value="")
 
         t = ET.SubElement(root, "target", name=target_prefix + "prepare", description="make work folder")
         ET.SubElement(t, "mkdir", dir=simulation_dir_prefix + "work")
@@ -96,11 +76,17 @@ class GenAntBuildXml:
             description="all from scratch until interactive simulation",
             depends=" ghdl-clean, ghdl-prepare, ghdl-compile, ghdl-elaborate, ghdl-simulate-suites, ghdl-exit-on-junit-errors-or-failures")
 
-        s = ' '
-        for kohf, shf in ordered_hdl_file_dict.items():
-            s += '-do_compile_' + target_prefix + shf['file'].replace('/', '_') + ', '
-        s = s[:-2]
-        ET.SubElement(root, "target", name=target_prefix + "compile", depends=s, description="compile all")
+        t = ET.SubElement(root, "target", name=target_prefix + "compile", description="compile all")
+        ex = ET.SubElement(t, "exec", executable="${python-executable}", failonerror="true")
+        ET.SubElement(ex, "arg", value="helper/compile-ghdl-hdl-files.py")
+        ET.SubElement(ex, "arg", value="--infile")
+        ET.SubElement(ex, "arg", value="setup.py")
+        ET.SubElement(ex, "arg", value="--indir_base_dir_path")
+        ET.SubElement(ex, "arg", value="${basedir}")
+        ET.SubElement(ex, "arg", value="--indir_simulation_work_dir_path")
+        ET.SubElement(ex, "arg", value=simulation_dir_prefix + "work")
+        ET.SubElement(ex, "arg", value="--ghdl_executable")
+        ET.SubElement(ex, "arg", value="${ghdl-executable}")
 
         t = ET.SubElement(root, "target", name=target_prefix + "elaborate", description="elaborate")
         ex = ET.SubElement(t, "exec", executable="${ghdl-executable}", dir=simulation_dir_prefix + "work")
@@ -153,62 +139,79 @@ class GenAntBuildXml:
         echo.text = "ENDED"
 
         if "test_suites" in static_setup_data:
-            t = ET.SubElement(root, "target", name=target_prefix +
-                              "simulate-suites", description="simulate all suites parallel")
-            ET.SubElement(t, "delete", dir=simulation_dir_prefix + "../SimulationResults")
-            ET.SubElement(t, "mkdir", dir=simulation_dir_prefix + "../SimulationResults")
-            echo = ET.SubElement(t, "echo", file=simulation_dir_prefix +
-                                 "../SimulationResults/testSuitesSimulation.start", append="false")
-            echo.text = "STARTED"
-            prl = ET.SubElement(t, "parallel", threadCount="8")
-
-            for test_suite, test_suite_data in test_suite_data_dict.items():
-                ex = ET.SubElement(
-                    prl,
-                    "exec",
-                    executable="${basedir}/" +
+            # the rerun target keeps the results directory and patches the existing testSuitesSimulation.xml
+            for suites_target, suites_description, rerun_failed in [
+                    ("simulate-suites", "simulate all suites parallel", False),
+                    ("rerun-failed-suites", "rerun suites with failures, errors or missing results", True)]:
+                t = ET.SubElement(root, "target", name=target_prefix + suites_target, description=suites_description)
+                if not rerun_failed:
+                    ET.SubElement(t, "delete", dir=simulation_dir_prefix + "../SimulationResults")
+                    ET.SubElement(t, "mkdir", dir=simulation_dir_prefix + "../SimulationResults")
+                # a rerun keeps the results directory, the end marker of the earlier run must not be seen
+                ET.SubElement(t, "delete", file=simulation_dir_prefix + "../SimulationResults/testSuitesSimulation.end")
+                echo = ET.SubElement(t, "echo", file=simulation_dir_prefix +
+                                     "../SimulationResults/testSuitesSimulation.start", append="false")
+                echo.text = "STARTED"
+                ex = ET.SubElement(t, "exec", executable="${python-executable}")
+                ET.SubElement(ex, "arg", value="helper/run-ghdl-simulation-suites.py")
+                ET.SubElement(ex, "arg", value="--infile")
+                ET.SubElement(ex, "arg", value="setup.py")
+                ET.SubElement(ex, "arg", value="--indir_simulation_work_dir_path")
+                ET.SubElement(ex, "arg", value=simulation_dir_prefix + "work")
+                ET.SubElement(ex, "arg", value="--indir_stimulus_path")
+                ET.SubElement(ex, "arg", value="tb/simstm")
+                ET.SubElement(ex, "arg", value="--outdir_simulation_results_dir_path")
+                ET.SubElement(ex, "arg", value="simulation/SimulationResults")
+                ET.SubElement(ex, "arg", value="--history_file_path")
+                ET.SubElement(ex, "arg", value="simulation/testSuitesSimulationHistory.json")
+                ET.SubElement(ex, "arg", value="--shard")
+                ET.SubElement(ex, "arg", value="${simulation-shard}")
+                ET.SubElement(ex, "arg", value="--cache_dir_path")
+                ET.SubElement(ex, "arg", value="${simulation-cache-dir}")
+                ET.SubElement(ex, "arg", value="--fail_fast")
+                ET.SubElement(ex, "arg", value="${simulation-fail-fast}")
+                ET.SubElement(ex, "arg", value="--compiled_stimulus_dir_path")
+                ET.SubElement(ex, "arg", value="${simulation-compiled-stimulus-dir}")
+                ET.SubElement(ex, "arg", value="--ghdl_executable")
+                ET.SubElement(ex, "arg", value="${ghdl-executable}")
+                ET.SubElement(ex, "arg", value="--jobs")
+                ET.SubElement(ex, "arg", value="${simulation-jobs}")
+                if rerun_failed:
+                    ET.SubElement(ex, "arg", value="--rerun_failed")
+
+                echo = ET.SubElement(
+                    t,
+                    "echo",
+                    file="${basedir}/" +
                     simulation_dir_prefix +
-                    "work/" +
-                    context['tb_top_entity'].lower(),
-                    dir=simulation_dir_prefix +
-                    "work")
-                ET.SubElement(ex, "redirector",
-                              output=simulation_dir_prefix + "../SimulationResults/" + test_suite + ".out",
-                              error=simulation_dir_prefix + "../SimulationResults/" + test_suite + ".err",
-                              alwayslog="true")
+                    "../SimulationResults/testSuitesSimulation.end",
+                    append="false")
+                echo.text = "ENDED"
 
-                ET.SubElement(ex, "arg", value="--stop-time=100ms")
-                ET.SubElement(ex, "arg", value="-gstimulus_path=${basedir}/tb/simstm/")
-                ET.SubElement(ex, "arg", value="-gstimulus_file=" + test_suite_data["entry-file"])
-                ET.SubElement(ex, "arg", value="-gstimulus_main_entry_label=" + test_suite_data["entry-label"])
-                if "index" in test_suite_data:
-                    ET.SubElement(ex, "arg", value="-gstimulus_test_suite_index=" + test_suite_data["index"])
-                    ET.SubElement(ex, "arg", value="-gmachine_value_width=" +
-                                  str((2 ** (int(test_suite_data["index"]) % 4)) * 32))
-
-            echo = ET.SubElement(
-                t,
-                "echo",
-                file="${basedir}/" +
-                simulation_dir_prefix +
-                "../SimulationResults/testSuitesSimulation.end",
-                append="false")
-            echo.text = "ENDED"
+                ex = ET.SubElement(t, "exec", executable="${python-executable}")
+                ET.SubElement(ex, "arg", value="helper/collect-simulation-results.py")
+                ET.SubElement(ex, "arg", value="--infile")
+                ET.SubElement(ex, "arg", value="setup.py")
+                ET.SubElement(ex, "arg", value="--inoutdir_simulation_results_dir_path")
+                ET.SubElement(ex, "arg", value="simulation/SimulationResults")
 
+                ET.SubElement(
+                    t,
+                    "available",
+                    file="simulation/SimulationResults/testSuitesSimulation.xml",
+                    property="testSuitesSimulation.xml.present")
+                ET.SubElement(t, "antcall", target=target_prefix + "do-remove-junit-artifacts")
+                ET.SubElement(t, "antcall", target=target_prefix + "complain-about-junit-artifacts")
+
+            t = ET.SubElement(root, "target", name=target_prefix + "watch-suites",
+                              description="keep a partial testSuitesSimulation.xml while the suites are running")
             ex = ET.SubElement(t, "exec", executable="${python-executable}")
             ET.SubElement(ex, "arg", value="helper/collect-simulation-results.py")
             ET.SubElement(ex, "arg", value="--infile")
             ET.SubElement(ex, "arg", value="setup.py")
             ET.SubElement(ex, "arg", value="--inoutdir_simulation_results_dir_path")
             ET.SubElement(ex, "arg", value="simulation/SimulationResults")
-
-            ET.SubElement(
-                t,
-                "available",
-                file="simulation/SimulationResults/testSuitesSimulation.xml",
-                property="testSuitesSimulation.xml.present")
-            ET.SubElement(t, "antcall", target=target_prefix + "do-remove-junit-artifacts")
-            ET.SubElement(t, "antcall", target=target_prefix + "complain-about-junit-artifacts")
+            ET.SubElement(ex, "arg", value="--watch")
 
             t = ET.SubElement(root, "target", {"name": target_prefix +
                                                "do-remove-junit-artifacts", "if": "testSuitesSimulation.xml.present"})
@@ -226,6 +229,34 @@ class GenAntBuildXml:
                 "echo",
                 message="testSuitesSimulation.xml couldn't be build from artifacts, keeping artifacts")
 
+        t = ET.SubElement(root, "target", name=target_prefix + "benchmark-stimulus",
+                          description="run the generated stimulus benchmarks",
+                          depends=" ghdl-prepare, ghdl-compile, ghdl-elaborate")
+        ex = ET.SubElement(t, "exec", executable="${python-executable}", failonerror="true")
+        ET.SubElement(ex, "arg", value="helper/run-ghdl-stimulus-benchmarks.py")
+        ET.SubElement(ex, "arg", value="--infile")
+        ET.SubElement(ex, "arg", value="setup.py")
+        ET.SubElement(ex, "arg", value="--indir_simulation_work_dir_path")
+        ET.SubElement(ex, "arg", value=simulation_dir_prefix + "work")
+        ET.SubElement(ex, "arg", value="--outdir_benchmark_dir_path")
+        ET.SubElement(ex, "arg", value="simulation/StimulusBenchmarks")
+        ET.SubElement(ex, "arg", value="--results_file_path")
+        ET.SubElement(ex, "arg", value="simulation/stimulusBenchmarks.json")
+        ET.SubElement(ex, "arg", value="--baseline_file_path")
+        ET.SubElement(ex, "arg", value="${simulation-benchmark-baseline}")
+
+        t = ET.SubElement(root, "target", name=target_prefix + "compare-compiled-stimulus",
+                          description="compare the output of compiled and interpreted stimulus",
+                          depends=" ghdl-prepare, ghdl-compile, ghdl-elaborate")
+        ex = ET.SubElement(t, "exec", executable="${python-executable}", failonerror="true")
+        ET.SubElement(ex, "arg", value="helper/compare-compiled-stimulus.py")
+        ET.SubElement(ex, "arg", value="--infile")
+        ET.SubElement(ex, "arg", value="setup.py")
+        ET.SubElement(ex, "arg", value="--indir_simulation_work_dir_path")
+        ET.SubElement(ex, "arg", value=simulation_dir_prefix + "work")
+        ET.SubElement(ex, "arg", value="--outdir_compare_dir_path")
+        ET.SubElement(ex, "arg", value="simulation/CompiledStimulusCompare")
+
         if "test_labs" in static_setup_data:
             for test_lab, test_lab_data in test_lab_data_dict.items():
 
@@ -280,70 +311,6 @@ class GenAntBuildXml:
                 echo = ET.SubElement(t, "echo", file=simulation_dir_prefix + "work/simulation.ended", append="false")
                 echo.text = "ENDED"
 
-        t = ET.SubElement(root, "target", name=target_prefix + "init-skip-properties")
-        ET.SubElement(t, "mkdir", dir=time_stamps_prefix[:-1])
-        for kohf, shf in ordered_hdl_file_dict.items():
-            ET.SubElement(
-                t,
-                "uptodate",
-                srcfile='${basedir}/' +
-                shf['file'],
-                targetfile='${basedir}/' +
-                time_stamps_prefix +
-                shf['file'].replace(
-                    '/',
-                    '_'),
-                property=target_prefix +
-                shf['file'].replace(
-                    '/',
-                    '_') +
-                '.skip',
-                value="true")
-
-        for kohf, shf in ordered_hdl_file_dict.items():
-            do = '-do_compile_' + target_prefix + shf['file'].replace('/', '_')
-            if shf['file_type'] == 'Verilog':
-                t = ET.SubElement(
-                    root,
-                    "target",
-                    name=do,
-                    depends=target_prefix +
-                    "init-skip-properties",
-                    unless=target_prefix +
-                    shf['file'].replace(
-                        '/',
-                        '_') +
-                    '.skip')
-                ET.SubElement(t, "fail", message="Verilog is not supported by ghdl")
-            else:
-                t = ET.SubElement(
-                    root,
-                    "target",
-                    name=do,
-                    depends=target_prefix +
-                    "init-skip-properties",
-                    unless=target_prefix +
-                    shf['file'].replace(
-                        '/',
-                        '_') +
-                    '.skip')
-                ex = ET.SubElement(
-                    t,
-                    "exec",
-                    executable="${ghdl-executable}",
-                    dir=simulation_dir_prefix +
-                    "work",
-                    failonerror="true")
-                ET.SubElement(ex, "arg", value="-a")
-                ET.SubElement(ex, "arg", value="-v")
-                if '2008' in shf['file_type']:
-                    ET.SubElement(ex, "arg", value="--std=08")
-                if 'ghdl_options' in shf:
-                    for o in shf['ghdl_options']:
-                        ET.SubElement(ex, "arg", value=o)
-                ET.SubElement(ex, "arg", value='${basedir}/' + shf['file'])
-            ET.SubElement(t, "touch", file='${basedir}/' + time_stamps_prefix + shf['file'].replace('/', '_'))
-
         t = ET.SubElement(root, "target", name=target_prefix + "exit-on-junit-errors-or-failures")
         ET.SubElement(
             t,
@@ -0,0 +1,85 @@
+import re
+
+
+class HdlDependencies:
+
+    package_pattern = re.compile(r'^\s*package\s+(\w+)\s+is\b', re.IGNORECASE)
+    package_body_pattern = re.compile(r'^\s*package\s+body\s+(\w+)\s+is\b', re.IGNORECASE)
+    entity_pattern = re.compile(r'^\s*entity\s+(\w+)\s+is\b', re.IGNORECASE)
+    architecture_pattern = re.compile(r'^\s*architecture\s+\w+\s+of\s+(\w+)\s+is\b', re.IGNORECASE)
+    use_pattern = re.compile(r'\buse\s+work\s*\.\s*(\w+)', re.IGNORECASE)
+    instance_pattern = re.compile(r':\s*entity\s+work\s*\.\s*(\w+)', re.IGNORECASE)
+
+    def ordered_hdl_files(self, static_setup_data):
+        simulation_hdl_file_list = []
+        for data_files in ["src_data_files", "tb_data_files"]:
+            for data_file_per_dest in static_setup_data[data_files]:
+                simulation_hdl_file_list += data_file_per_dest[1]
+
+        ordered_hdl_file_dict = {}
+        for shf in simulation_hdl_file_list:
+            if 'IP-XACT' not in shf['file_type']:
+                ordered_hdl_file_dict[shf['hdl_order']] = shf
+
+        return [shf for kohf, shf in sorted(ordered_hdl_file_dict.items())]
+
+    def scan(self, file_path):
+        # design units a file provides and the units of library work it needs to be analyzed
+        provides = set()
+        requires = set()
+        with open(file_path, "r") as f:
+            for l in f:
+                l = l.split('--')[0]
+                m = self.package_body_pattern.match(l)
+                if m:
+                    requires.add(("package", m.group(1).lower()))
+                    continue
+                m = self.package_pattern.match(l)
+                if m:
+                    provides.add(("package", m.group(1).lower()))
+                    continue
+                m = self.entity_pattern.match(l)
+                if m:
+                    provides.add(("entity", m.group(1).lower()))
+                    continue
+                m = self.architecture_pattern.match(l)
+                if m:
+                    requires.add(("entity", m.group(1).lower()))
+                for m in self.use_pattern.finditer(l):
+                    requires.add(("package", m.group(1).lower()))
+                for m in self.instance_pattern.finditer(l):
+                    requires.add(("entity", m.group(1).lower()))
+        return provides, requires - provides
+
+    def dependencies(self, base_dir_path, hdl_files):
+        providers = {}
+        required = {}
+        for shf in hdl_files:
+            provides, requires = self.scan(base_dir_path + '/' + shf['file'])
+            for unit in provides:
+                providers[unit] = shf['file']
+            required[shf['file']] = requires
+        deps = {}
+        for shf in hdl_files:
+            deps[shf['file']] = sorted(set(providers[unit] for unit in required[shf['file']] if unit in providers))
+        return deps
+
+    def waves(self, deps, hdl_files):
+        # every file of a wave only depends on files of earlier waves
+        levels = {}
+        for shf in hdl_files:
+            pending = [shf['file']]
+            while pending:
+                f = pending[-1]
+                unresolved = [d for d in deps[f] if d not in levels]
+                if unresolved:
+                    pending += unresolved
+                    continue
+                pending.pop()
+                levels[f] = 1 + max([levels[d] for d in deps[f]], default=-1)
+        waves = []
+        for shf in hdl_files:
+            while len(waves) <= levels[shf['file']]:
+                waves.append([])
+            waves[levels[shf['file']]].append(shf)
+        return waves
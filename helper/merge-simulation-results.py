@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+import os
+from xml.dom import minidom
+import xml.etree.cElementTree as ET
+
+import click
+
+
+class mergeTestSuites:
+
+    def merge(self, indir_shards_dir_path='test/SimulationShards',
+              outdir_simulation_results_dir_path='test/SimulationResults'):
+        tsuites_counts = {"tests": 0, "skipped": 0, "errors": 0, "failures": 0, "assertions": 0}
+        tsuites_start = None
+        tsuites_end = None
+        tsuites = ET.Element("testsuites", name="testSuitesSimulation")
+
+        for d in sorted(os.listdir(indir_shards_dir_path)):
+            p = indir_shards_dir_path + '/' + d + "/testSuitesSimulation.xml"
+            if not os.path.isfile(p):
+                continue
+            print("reading {}".format(p))
+            shard_tsuites = ET.parse(p).getroot()
+            for k in tsuites_counts:
+                tsuites_counts[k] += int(shard_tsuites.attrib.get(k, "0"))
+            if "timestamp" in shard_tsuites.attrib:
+                shard_start = datetime.fromisoformat(shard_tsuites.attrib["timestamp"])
+                shard_end = shard_start + timedelta(seconds=float(shard_tsuites.attrib.get("time", "0")))
+                if tsuites_start is None or shard_start < tsuites_start:
+                    tsuites_start = shard_start
+                if tsuites_end is None or shard_end > tsuites_end:
+                    tsuites_end = shard_end
+            for tsuite in shard_tsuites.findall("testsuite"):
+                # drop the indentation of the shard file, it is pretty printed again below
+                for e in tsuite.iter():
+                    if e.tail is not None and not e.tail.strip():
+                        e.tail = None
+                    if len(e) and e.text is not None and not e.text.strip():
+                        e.text = None
+                tsuites.append(tsuite)
+
+        for k, v in tsuites_counts.items():
+            tsuites.set(k, str(v))
+        if tsuites_start is not None:
+            tsuites.set("timestamp", str(tsuites_start.isoformat()))
+            tsuites.set("time", str((tsuites_end - tsuites_start).total_seconds()))
+
+        os.makedirs(outdir_simulation_results_dir_path, exist_ok=True)
+        ts_str = minidom.parseString(ET.tostring(tsuites)).toprettyxml(indent="   ")
+        tsp = outdir_simulation_results_dir_path + "/testSuitesSimulation.xml"
+        print("writing {}".format(tsp))
+        with open(tsp, "w") as f:
+            f.write(ts_str)
+
+
+@click.command()
+@click.option('--indir_shards_dir_path',
+              default='simulation/SimulationShards',
+              help='input directory with one results subdirectory per shard')
+@click.option('--outdir_simulation_results_dir_path',
+              default='simulation/SimulationResults',
+              help='output directory for the merged testSuitesSimulation.xml')
+def merge(indir_shards_dir_path, outdir_simulation_results_dir_path):
+    obj = mergeTestSuites()
+    obj. merge(indir_shards_dir_path=indir_shards_dir_path,
+               outdir_simulation_results_dir_path=outdir_simulation_results_dir_path
+               )
+
+
+if __name__ == '__main__':
+    merge()
@@ -0,0 +1,111 @@
+import click
+
+
+class ReportStimulusProfile:
+
+    # the profile is recognized by this first line as written by profile_write in tb_interpreter_pkg_body.vhd
+    header = "-- simstm profile 1"
+
+    time_units = {"fs": 1e-3, "ps": 1.0, "ns": 1e3, "us": 1e6, "ms": 1e9, "sec": 1e12}
+
+    def read(self, infile_path):
+        opcodes = {}
+        nodes = {}
+        with open(infile_path, "r", encoding="latin-1") as f:
+            lines = f.read().split("\n")
+        if not lines or lines[0].rstrip() != self.header:
+            raise click.ClickException("{} is not a simstm profile".format(infile_path))
+        for l in lines[1:]:
+            fields = l.split(" ", 8)
+            if fields[0] == "opcode":
+                opcodes[fields[1].upper()] = int(fields[2])
+            elif fields[0] == "node":
+                node_id = int(fields[1])
+                nodes[node_id] = {"parent": int(fields[2]),
+                                  "calls": int(fields[3]),
+                                  "instructions": int(fields[4]),
+                                  "self_time": int(fields[5]) * self.time_units[fields[6]],
+                                  "label": fields[7].lstrip("$"),
+                                  "file": fields[8] if len(fields) > 8 else "",
+                                  "children": []}
+        # parents are written before their children
+        for node_id, node in nodes.items():
+            if node["parent"] in nodes:
+                nodes[node["parent"]]["children"].append(node_id)
+        for node_id in reversed(list(nodes)):
+            node = nodes[node_id]
+            node["time"] = node["self_time"] + sum(nodes[c]["time"] for c in node["children"])
+        return opcodes, nodes
+
+    def stack(self, nodes, node_id):
+        labels = []
+        while node_id in nodes:
+            labels.append(nodes[node_id]["label"])
+            node_id = nodes[node_id]["parent"]
+        return labels[::-1]
+
+    def hot_spots(self, nodes):
+        # a proc calling itself is counted once in its inclusive time
+        procs = {}
+        for node_id, node in nodes.items():
+            proc = procs.setdefault(node["label"], {"calls": 0, "instructions": 0, "self_time": 0.0, "time": 0.0,
+                                                    "file": node["file"]})
+            proc["calls"] += node["calls"]
+            proc["instructions"] += node["instructions"]
+            proc["self_time"] += node["self_time"]
+            if node["label"] not in self.stack(nodes, node["parent"]):
+                proc["time"] += node["time"]
+        return sorted(procs.items(), key=lambda p: (-p[1]["self_time"], -p[1]["time"], p[0]))
+
+    def write_report(self, outfile_path, opcodes, nodes):
+        total_time = sum(node["self_time"] for node in nodes.values()) or 1.0
+        total_instructions = sum(opcodes.values()) or 1
+        print("writing {}".format(outfile_path))
+        with open(outfile_path, "w") as f:
+            f.write("{:>14} {:>7} {:>14} {:>7} {:>10} {:>12}  {}\n".format(
+                "self ns", "self %", "total ns", "total %", "calls", "instructions", "proc"))
+            for label, proc in self.hot_spots(nodes):
+                f.write("{:14.3f} {:7.2f} {:14.3f} {:7.2f} {:10d} {:12d}  {} {}\n".format(
+                    proc["self_time"] / 1e3, 100.0 * proc["self_time"] / total_time, proc["time"] / 1e3,
+                    100.0 * proc["time"] / total_time, proc["calls"], proc["instructions"], label, proc["file"]))
+            f.write("\n{:>12} {:>7}  {}\n".format("executed", "%", "opcode"))
+            for opcode, count in sorted(opcodes.items(), key=lambda o: (-o[1], o[0])):
+                f.write("{:12d} {:7.2f}  {}\n".format(count, 100.0 * count / total_instructions, opcode))
+
+    def write_folded(self, outfile_path, nodes, weight):
+        # one line per call chain as read by flamegraph.pl and speedscope
+        print("writing {}".format(outfile_path))
+        with open(outfile_path, "w") as f:
+            for node_id, node in nodes.items():
+                value = int(round(node["self_time"])) if weight == "time" else node["instructions"]
+                if value > 0:
+                    f.write("{} {:d}\n".format(";".join(self.stack(nodes, node_id)), value))
+
+    def report(self, infile_path, outfile_report_path=None, outfile_folded_path=None, folded_weight="time"):
+        opcodes, nodes = self.read(infile_path)
+        if outfile_report_path:
+            self.write_report(outfile_report_path, opcodes, nodes)
+        if outfile_folded_path:
+            self.write_folded(outfile_folded_path, nodes, folded_weight)
+
+
+@click.command()
+@click.option('--infile', default='simulation/stimulus.profile',
+              help='profile written by tb_simstm given the generic stimulus_profile_file')
+@click.option('--outfile_report', default='simulation/stimulus-profile.txt',
+              help='hot spot report, an empty value writes no report')
+@click.option('--outfile_folded', default='simulation/stimulus-profile.folded',
+              help='folded stacks for flame graphs, an empty value writes no folded stacks')
+@click.option('--folded_weight', default='time', type=click.Choice(['time', 'instructions']),
+              help='value of a folded stack, the simulated ps or the executed instructions of its proc')
+def report(infile, outfile_report, outfile_folded, folded_weight):
+    obj = ReportStimulusProfile()
+    obj. report(infile_path=infile,
+                outfile_report_path=outfile_report,
+                outfile_folded_path=outfile_folded,
+                folded_weight=folded_weight
+                )
+
+
+if __name__ == '__main__':
+    report()
@@ -0,0 +1,297 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from json import dump
+import os
+import signal
+import subprocess
+import threading
+import time
+
+import click
+from simulation_cache import SimulationCache
+from simulation_suites import SimulationSuites
+from stimulus_compiler import StimulusCompiler
+
+
+class RunSimulationSuites:
+
+    # ghdl reports of severity failure, severity error is used by suites expecting failures
+    err_failure_markers = [b"(assertion failure)", b"(report failure)"]
+    xml_failure_markers = [b"<failure", b"<error"]
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.processes = {}
+        self.cancelled = {}
+
+    def run_suite(self, test_suite, args, executable, work_dir_path, results_dir_path):
+        sop = results_dir_path + '/' + test_suite + ".out"
+        soe = results_dir_path + '/' + test_suite + ".err"
+        sou = results_dir_path + '/' + test_suite + ".usage"
+        start = time.monotonic()
+        start_date = time.time()
+        with open(sop, "w") as fo, open(soe, "w") as fe:
+            with self.lock:
+                if test_suite in self.cancelled:
+                    fe.write("{}\n".format(self.cancelled[test_suite]))
+                    return None
+                proc = subprocess.Popen([executable] + args, cwd=work_dir_path, stdout=fo, stderr=fe)
+                self.processes[test_suite] = proc
+            usage = SimulationSuites().wait_process(proc, self.lock)
+            with self.lock:
+                del self.processes[test_suite]
+                if test_suite in self.cancelled:
+                    fe.seek(0, os.SEEK_END)
+                    fe.write("{}\n".format(self.cancelled[test_suite]))
+                    return None
+        # the collector takes the suite time and the resource usage properties from this file
+        usage["wall_time"] = time.monotonic() - start
+        usage["start"] = start_date
+        with open(sou, "w") as f:
+            dump(usage, f, indent=4)
+        return usage
+
+    def cancel(self, test_suites, reason):
+        with self.lock:
+            for test_suite in test_suites:
+                if test_suite not in self.cancelled:
+                    self.cancelled[test_suite] = reason
+                    # Popen.kill would poll and reap the child the worker waits for
+                    if test_suite in self.processes and self.processes[test_suite].returncode is None:
+                        os.kill(self.processes[test_suite].pid, signal.SIGKILL)
+
+    def find_failures(self, running_test_suites, results_dir_path, scanned):
+        # .err output is read incrementally, test case files once per size
+        failed = []
+        files = os.listdir(results_dir_path)
+        for test_suite in running_test_suites:
+            soe = results_dir_path + '/' + test_suite + ".err"
+            if os.path.isfile(soe):
+                with open(soe, "rb") as f:
+                    f.seek(max(0, scanned.get(soe, 0) - 64))
+                    chunk = f.read()
+                    scanned[soe] = f.tell()
+                if any(m in chunk for m in self.err_failure_markers):
+                    failed.append(test_suite)
+                    continue
+            for fx in files:
+                if fx.startswith(test_suite + '_') and fx.endswith('.xml'):
+                    p = results_dir_path + '/' + fx
+                    size = os.path.getsize(p)
+                    if scanned.get(p) == size:
+                        continue
+                    scanned[p] = size
+                    with open(p, "rb") as f:
+                        chunk = f.read()
+                    if any(m in chunk for m in self.xml_failure_markers):
+                        failed.append(test_suite)
+                        break
+        return failed
+
+    def run(self, setup_py_file_path='test/setup.py',
+            indir_simulation_work_dir_path='simulation/ghdl/work',
+            indir_stimulus_path='tb/simstm',
+            outdir_simulation_results_dir_path='simulation/SimulationResults',
+            history_file_path='simulation/testSuitesSimulationHistory.json',
+            shard='1/1',
+            cache_dir_path='simulation/SimulationCache',
+            rerun_failed=False,
+            fail_fast='none',
+            compiled_stimulus_dir_path='simulation/CompiledStimulus',
+            ghdl_executable='ghdl',
+            jobs=0):
+        suites = SimulationSuites()
+        shard_index, shard_count = suites.parse_shard(shard)
+        static_setup_data = suites.read(setup_py_file_path)
+        test_suite_data_dict = suites.expand(static_setup_data)
+
+        work_dir_path = os.path.abspath(indir_simulation_work_dir_path)
+        results_dir_path = os.path.abspath(outdir_simulation_results_dir_path)
+        stimulus_path = os.path.abspath(indir_stimulus_path) + '/'
+        executable = work_dir_path + '/' + static_setup_data["tb_top_entity"].lower()
+        os.makedirs(results_dir_path, exist_ok=True)
+
+        # the markers of an earlier run must not end the watching collector of this run
+        rnp = results_dir_path + "/testSuitesSimulation.running"
+        for p in [rnp, results_dir_path + "/testSuitesSimulation.end"]:
+            if os.path.isfile(p):
+                os.remove(p)
+
+        if jobs <= 0:
+            jobs = os.cpu_count() or 1
+
+        # longest processing time first, based on the wall times of previous runs
+        history = suites.read_history(history_file_path)
+        predicted_durations = suites.predicted_durations(test_suite_data_dict, history)
+
+        # a shard list left by an earlier run would restrict the collector of this run to its suites
+        shp = results_dir_path + "/testSuitesSimulation.shard"
+        if os.path.isfile(shp):
+            os.remove(shp)
+        if shard_count > 1:
+            shard_test_suites = suites.shard(predicted_durations, shard_index, shard_count)
+            predicted_durations = {test_suite: predicted_durations[test_suite] for test_suite in shard_test_suites}
+            print("writing {}".format(shp))
+            with open(shp, "w") as f:
+                dump({"shard": shard, "test_suites": sorted(shard_test_suites)}, f, indent=4)
+
+        # a rerun list left by an earlier run would make the collector patch only its suites
+        rrp = results_dir_path + "/testSuitesSimulation.rerun"
+        if os.path.isfile(rrp):
+            os.remove(rrp)
+        if rerun_failed:
+            tsp = results_dir_path + "/testSuitesSimulation.xml"
+            rerun_test_suites = suites.failed_suites(tsp, predicted_durations)
+            predicted_durations = {test_suite: predicted_durations[test_suite] for test_suite in rerun_test_suites}
+            for test_suite in rerun_test_suites:
+                for f in suites.suite_files(test_suite, results_dir_path):
+                    os.remove(results_dir_path + '/' + f)
+            print("writing {}".format(rrp))
+            with open(rrp, "w") as f:
+                dump({"test_suites": sorted(rerun_test_suites)}, f, indent=4)
+
+        exit_codes = {}
+        durations = {}
+        args_dict = {}
+        for test_suite in predicted_durations:
+            args_dict[test_suite] = suites.arguments(test_suite_data_dict[test_suite], stimulus_path)
+
+        # suites whose binary, include closure and generics are unchanged reuse their stored results
+        cache_keys = {}
+        if cache_dir_path:
+            cache = SimulationCache(os.path.abspath(cache_dir_path), executable, stimulus_path, ghdl_executable)
+            for test_suite in list(predicted_durations):
+                cache_keys[test_suite] = cache.key(test_suite, test_suite_data_dict[test_suite], args_dict[test_suite])
+                if not rerun_failed and cache.restore(cache_keys[test_suite], test_suite, results_dir_path):
+                    print("cached {}".format(test_suite))
+                    exit_codes[test_suite] = 0
+                    del predicted_durations[test_suite]
+
+        # each entry file is tokenized and its includes are resolved once instead of in every suite process,
+        # a file the compiler rejects is passed as is so the interpreter reports the error of the suite
+        if compiled_stimulus_dir_path:
+            compiled_stimulus_path = os.path.abspath(compiled_stimulus_dir_path) + '/'
+            compiler = StimulusCompiler()
+            compiled = {}
+            for test_suite in predicted_durations:
+                entry_file = test_suite_data_dict[test_suite]["entry-file"]
+                if entry_file not in compiled:
+                    csp = compiled_stimulus_path + suites.compiled_stimulus_file(entry_file)
+                    os.makedirs(os.path.dirname(csp), exist_ok=True)
+                    try:
+                        compiler.compile(stimulus_path, entry_file, csp)
+                        compiled[entry_file] = True
+                    except click.ClickException as e:
+                        print("not compiling {}: {}".format(entry_file, e.message))
+                        compiled[entry_file] = False
+                if compiled[entry_file]:
+                    args_dict[test_suite] = suites.arguments(test_suite_data_dict[test_suite], stimulus_path,
+                                                             compiled_stimulus_path)
+
+        print("running {:d} of {:d} suites with {:d} jobs".format(len(predicted_durations), len(test_suite_data_dict),
+                                                                 jobs))
+        ordered_test_suites = suites.lpt_order(predicted_durations)
+        predicted_makespan = suites.makespan(ordered_test_suites, predicted_durations, jobs)
+
+        # written once the stale results are removed, the watching collector follows the run while it exists
+        with open(rnp, "w") as f:
+            dump({"pid": os.getpid(), "start": time.time()}, f, indent=4)
+        start = time.monotonic()
+        scanned = {}
+        handled_failures = set()
+        try:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                futures = {}
+                for test_suite in ordered_test_suites:
+                    f = executor.submit(self.run_suite, test_suite, args_dict[test_suite], executable, work_dir_path,
+                                        results_dir_path)
+                    futures[f] = test_suite
+                pending = set(futures)
+                while pending:
+                    done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                    for f in done:
+                        test_suite = futures[f]
+                        usage = f.result()
+                        if usage is None:
+                            print("cancelled {}".format(test_suite))
+                            continue
+                        exit_codes[test_suite], durations[test_suite] = usage["exit_code"], usage["wall_time"]
+                        print("finished {} exit code {:d} in {:.2f}s, cpu {:.2f}s, peak rss {:d} kB".format(
+                            test_suite, usage["exit_code"], usage["wall_time"],
+                            usage["user_time"] + usage["system_time"], usage["peak_rss_kb"]))
+                        if test_suite in cache_keys and usage["exit_code"] == 0:
+                            cache.store(cache_keys[test_suite], test_suite, results_dir_path)
+                    if fail_fast != 'none':
+                        # the failing suite itself runs to its end, the suites it makes pointless are cancelled
+                        watched = [futures[f] for f in pending] + [futures[f] for f in done]
+                        for failed in self.find_failures(watched, results_dir_path, scanned):
+                            if failed in handled_failures:
+                                continue
+                            handled_failures.add(failed)
+                            family = test_suite_data_dict[failed]["testsuite-name"]
+                            if fail_fast == 'all':
+                                victims = [futures[f] for f in pending if futures[f] != failed]
+                            else:
+                                victims = [futures[f] for f in pending if futures[f] != failed and
+                                           test_suite_data_dict[futures[f]]["testsuite-name"] == family]
+                            if victims:
+                                print("failure in {}, cancelling {:d} suites".format(failed, len(victims)))
+                                self.cancel(victims, "cancelled by fail fast policy {} after a failure in {}".format(
+                                    fail_fast, failed))
+        finally:
+            os.remove(rnp)
+        actual_makespan = time.monotonic() - start
+
+        if history:
+            print("predicted makespan {:.2f}s, actual makespan {:.2f}s".format(predicted_makespan, actual_makespan))
+        else:
+            print("no history found, actual makespan {:.2f}s".format(actual_makespan))
+
+        if history_file_path is not None:
+            history.update(durations)
+            suites.write_history(history_file_path, history)
+
+        return exit_codes
+
+
+@click.command()
+@click.option('--infile', default='setup.py', help='setup_py_file_path')
+@click.option('--indir_simulation_work_dir_path', default='simulation/ghdl/work',
+              help='work directory containing the elaborated simulation binary')
+@click.option('--indir_stimulus_path', default='tb/simstm', help='directory containing the stimulus files')
+@click.option('--outdir_simulation_results_dir_path', default='simulation/SimulationResults',
+              help='output directory for the .out and .err files of each suite')
+@click.option('--history_file_path', default='simulation/testSuitesSimulationHistory.json',
+              help='json file keeping the wall times of previous runs used for scheduling')
+@click.option('--shard', default='1/1',
+              help='run only shard i of N, all nodes must use the same setup.py and history file')
+@click.option('--cache_dir_path', default='simulation/SimulationCache',
+              help='directory of the result cache, an empty value disables the cache')
+@click.option('--rerun_failed', is_flag=True,
+              help='rerun only the suites with failures, errors or missing results in testSuitesSimulation.xml')
+@click.option('--fail_fast', default='none', type=click.Choice(['none', 'family', 'all']),
+              help='cancel all or the indexed siblings of a suite once it reports a failure')
+@click.option('--compiled_stimulus_dir_path', default='simulation/CompiledStimulus',
+              help='directory of the pre-compiled entry files, an empty value loads the stimulus files as is')
+@click.option('--ghdl_executable', default='ghdl', help='ghdl executable, its version is part of the cache key')
+@click.option('--jobs', default=0, help='number of suites run in parallel, 0 uses all cpus')
+def run(infile, indir_simulation_work_dir_path, indir_stimulus_path, outdir_simulation_results_dir_path,
+        history_file_path, shard, cache_dir_path, rerun_failed, fail_fast, compiled_stimulus_dir_path,
+        ghdl_executable, jobs):
+    obj = RunSimulationSuites()
+    obj. run(setup_py_file_path=infile,
+             indir_simulation_work_dir_path=indir_simulation_work_dir_path,
+             indir_stimulus_path=indir_stimulus_path,
+             outdir_simulation_results_dir_path=outdir_simulation_results_dir_path,
+             history_file_path=history_file_path,
+             shard=shard,
+             cache_dir_path=cache_dir_path,
+             rerun_failed=rerun_failed,
+             fail_fast=fail_fast,
+             compiled_stimulus_dir_path=compiled_stimulus_dir_path,
+             ghdl_executable=ghdl_executable,
+             jobs=jobs
+             )
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,164 @@
+from json import dump, load
+import os
+import subprocess
+import time
+
+import click
+from simulation_suites import SimulationSuites
+from stimulus_benchmark import StimulusBenchmark
+from stimulus_compiler import StimulusCompiler
+
+
+class RunStimulusBenchmarks:
+
+    def run_simulation(self, executable, args, work_dir_path, log_file_path):
+        start = time.monotonic()
+        with open(log_file_path, "w") as fo:
+            proc = subprocess.Popen([executable] + args, cwd=work_dir_path, stdout=fo, stderr=subprocess.STDOUT)
+            usage = SimulationSuites().wait_process(proc)
+        usage["wall_time"] = time.monotonic() - start
+        return usage
+
+    def executed_instructions(self, profile_file_path):
+        # the opcode counts of the profile written by tb_simstm sum up to the executed instructions
+        instructions = 0
+        if os.path.isfile(profile_file_path):
+            with open(profile_file_path, "r", encoding="latin-1") as f:
+                for l in f:
+                    fields = l.split()
+                    if fields and fields[0] == "opcode":
+                        instructions += int(fields[2])
+        return instructions
+
+    def run_benchmark(self, name, params, executable, work_dir_path, benchmark_dir_path, compile_stimulus,
+                      machine_value_width):
+        benchmark = StimulusBenchmark()
+        stimulus_file = benchmark.generate(benchmark_dir_path, name, params)
+        if compile_stimulus:
+            StimulusCompiler().compile(benchmark_dir_path + '/', stimulus_file,
+                                       benchmark_dir_path + '/' + stimulus_file + 'c')
+            stimulus_file += 'c'
+        args = ["--stop-time=1000ms",
+                "-gstimulus_path=" + benchmark_dir_path + '/',
+                "-gstimulus_file=" + stimulus_file,
+                "-gmachine_value_width=" + str(machine_value_width)]
+        profile_file_path = benchmark_dir_path + '/' + name + ".profile"
+        if os.path.isfile(profile_file_path):
+            os.remove(profile_file_path)
+
+        load_usage = self.run_simulation(executable, args + ["-gstimulus_main_entry_label=" +
+                                                             benchmark.load_entry_label],
+                                         work_dir_path, benchmark_dir_path + '/' + name + "_load.out")
+        main_usage = self.run_simulation(executable, args + ["-gstimulus_main_entry_label=" +
+                                                             benchmark.main_entry_label],
+                                         work_dir_path, benchmark_dir_path + '/' + name + ".out")
+        # the instructions are counted by an untimed profiled run, profiling would slow down the timed one
+        profile_usage = self.run_simulation(executable, args + ["-gstimulus_main_entry_label=" +
+                                                                benchmark.main_entry_label,
+                                                                "-gstimulus_profile_file=" + profile_file_path],
+                                            work_dir_path, benchmark_dir_path + '/' + name + "_profile.out")
+        instructions = self.executed_instructions(profile_file_path)
+        # both runs load the same stimulus, the difference is spent executing it
+        execution_time = max(main_usage["wall_time"] - load_usage["wall_time"], 1e-3)
+        return {"params": params,
+                "exit_code": main_usage["exit_code"] or load_usage["exit_code"] or profile_usage["exit_code"],
+                "load_time": load_usage["wall_time"],
+                "wall_time": main_usage["wall_time"],
+                "user_time": main_usage["user_time"],
+                "system_time": main_usage["system_time"],
+                "peak_rss_kb": main_usage["peak_rss_kb"],
+                "load_peak_rss_kb": load_usage["peak_rss_kb"],
+                "instructions": instructions,
+                "instructions_per_second": instructions / execution_time}
+
+    def compare(self, results, baseline, tolerance):
+        # a benchmark regressed if it loads or executes slower than the baseline by more than the tolerance
+        regressions = []
+        for name, result in sorted(results.items()):
+            if name not in baseline or baseline[name]["params"] != result["params"]:
+                continue
+            base = baseline[name]
+            load_ratio = result["load_time"] / max(base["load_time"], 1e-6)
+            ips_ratio = base["instructions_per_second"] / max(result["instructions_per_second"], 1e-6)
+            rss_ratio = result["peak_rss_kb"] / max(base["peak_rss_kb"], 1)
+            print("{} load time x{:.2f}, instructions per second x{:.2f}, peak rss x{:.2f}".format(
+                name, load_ratio, 1.0 / ips_ratio, rss_ratio))
+            if max(load_ratio, ips_ratio, rss_ratio) > 1.0 + tolerance:
+                regressions.append(name)
+        return regressions
+
+    def run(self, setup_py_file_path='setup.py',
+            indir_simulation_work_dir_path='simulation/ghdl/work',
+            outdir_benchmark_dir_path='simulation/StimulusBenchmarks',
+            results_file_path='simulation/stimulusBenchmarks.json',
+            baseline_file_path=None,
+            axes=None,
+            compile_stimulus=False,
+            machine_value_width=64,
+            tolerance=0.2):
+        static_setup_data = SimulationSuites().read(setup_py_file_path)
+        work_dir_path = os.path.abspath(indir_simulation_work_dir_path)
+        benchmark_dir_path = os.path.abspath(outdir_benchmark_dir_path)
+        executable = work_dir_path + '/' + static_setup_data["tb_top_entity"].lower()
+        os.makedirs(benchmark_dir_path, exist_ok=True)
+
+        # the benchmarks run one after the other so they do not compete for cpu and memory bandwidth
+        results = {}
+        for name, params in StimulusBenchmark().matrix(axes).items():
+            result = self.run_benchmark(name, params, executable, work_dir_path, benchmark_dir_path,
+                                        compile_stimulus, machine_value_width)
+            results[name] = result
+            print("{} exit code {:d} load {:.3f}s run {:.3f}s {:d} instructions {:.0f}/s peak rss {:d} kB".format(
+                name, result["exit_code"], result["load_time"], result["wall_time"], result["instructions"],
+                result["instructions_per_second"], result["peak_rss_kb"]))
+
+        print("writing {}".format(results_file_path))
+        with open(results_file_path, "w") as f:
+            dump(results, f, indent=4)
+
+        if baseline_file_path:
+            with open(baseline_file_path, "r") as f:
+                baseline = load(f)
+            regressions = self.compare(results, baseline, tolerance)
+            if regressions:
+                raise click.ClickException("{:d} benchmarks regressed by more than {:.0f}%: {}".format(
+                    len(regressions), 100 * tolerance, ", ".join(regressions)))
+
+        failed = [name for name, result in sorted(results.items()) if result["exit_code"] != 0]
+        if failed:
+            raise click.ClickException("benchmarks with a non zero exit code: {}".format(", ".join(failed)))
+        return results
+
+
+@click.command()
+@click.option('--infile', default='setup.py', help='setup_py_file_path')
+@click.option('--indir_simulation_work_dir_path', default='simulation/ghdl/work',
+              help='work directory containing the elaborated simulation binary')
+@click.option('--outdir_benchmark_dir_path', default='simulation/StimulusBenchmarks',
+              help='output directory for the generated stimulus files, profiles and simulation outputs')
+@click.option('--results_file_path', default='simulation/stimulusBenchmarks.json',
+              help='json file the measurements are written to')
+@click.option('--baseline_file_path', default='',
+              help='results file of a previous run to compare against, an empty value compares nothing')
+@click.option('--axis', 'axes', multiple=True, type=click.Choice(sorted(StimulusBenchmark.axes)),
+              help='axis the benchmark programs are scaled along, may be repeated, all axes if omitted')
+@click.option('--compile_stimulus', is_flag=True, help='load the pre-compiled benchmark programs')
+@click.option('--machine_value_width', default=64, help='machine_value_width generic of the simulation')
+@click.option('--tolerance', default=0.2, help='slow down against the baseline reported as regression')
+def run(infile, indir_simulation_work_dir_path, outdir_benchmark_dir_path, results_file_path, baseline_file_path,
+        axes, compile_stimulus, machine_value_width, tolerance):
+    obj = RunStimulusBenchmarks()
+    obj. run(setup_py_file_path=infile,
+             indir_simulation_work_dir_path=indir_simulation_work_dir_path,
+             outdir_benchmark_dir_path=outdir_benchmark_dir_path,
+             results_file_path=results_file_path,
+             baseline_file_path=baseline_file_path,
+             axes=list(axes),
+             compile_stimulus=compile_stimulus,
+             machine_value_width=machine_value_width,
+             tolerance=tolerance
+             )
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,95 @@
+import hashlib
+import os
+import shutil
+import subprocess
+
+import click
+from simulation_suites import SimulationSuites
+from stimulus_compiler import StimulusCompiler
+
+
+class SimulationCache:
+
+    def __init__(self, cache_dir_path, executable, stimulus_path, ghdl_executable='ghdl'):
+        self.cache_dir_path = cache_dir_path
+        self.stimulus_path = stimulus_path
+        self.executable_hash = self.file_hash(executable)
+        self.toolchain_hash = hashlib.sha256(self.toolchain_version(ghdl_executable)).hexdigest()
+        self.closure_hashes = {}
+
+    def toolchain_version(self, ghdl_executable):
+        # the version and backend lines, results of another ghdl build are not reused
+        try:
+            return subprocess.run([ghdl_executable, "--version"], capture_output=True, check=True).stdout
+        except (OSError, subprocess.CalledProcessError):
+            return b"unknown"
+
+    def file_hash(self, file_path):
+        h = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        return h.hexdigest()
+
+    def include_closure(self, entry_file):
+        # includes are tokenized and resolved relative to the stimulus path like the compiler and the interpreter do
+        compiler = StimulusCompiler()
+        closure = []
+        pending = [entry_file]
+        while pending:
+            name = pending.pop()
+            if name in closure:
+                continue
+            closure.append(name)
+            p = self.stimulus_path + '/' + name
+            if not os.path.isfile(p):
+                continue
+            for l_num, l in enumerate(compiler.read_lines(p), 1):
+                tokens, quote, txt = compiler.tokenize(l.rstrip("\r"))
+                if tokens and tokens[0] == "include":
+                    try:
+                        pending.append(compiler.include_name(tokens, quote, txt, l_num, p))
+                    except click.ClickException:
+                        # the interpreter reports the include without a file name
+                        pass
+        return sorted(closure)
+
+    def closure_hash(self, entry_file):
+        if entry_file not in self.closure_hashes:
+            h = hashlib.sha256()
+            for name in self.include_closure(entry_file):
+                p = self.stimulus_path + '/' + name
+                h.update(name.encode())
+                h.update(self.file_hash(p).encode() if os.path.isfile(p) else b"missing")
+            self.closure_hashes[entry_file] = h.hexdigest()
+        return self.closure_hashes[entry_file]
+
+    def key(self, test_suite, test_suite_data, args):
+        h = hashlib.sha256()
+        h.update(test_suite.encode())
+        h.update(self.executable_hash.encode())
+        h.update(self.toolchain_hash.encode())
+        h.update(self.closure_hash(test_suite_data["entry-file"]).encode())
+        for a in args:
+            # the absolute stimulus path differs between checkouts and is covered by the closure
+            if not a.startswith("-gstimulus_path="):
+                h.update(a.encode())
+        return h.hexdigest()
+
+    def restore(self, key, test_suite, results_dir_path):
+        entry_dir_path = self.cache_dir_path + '/' + key
+        if not os.path.isdir(entry_dir_path):
+            return False
+        for f in SimulationSuites().suite_files(test_suite, entry_dir_path):
+            shutil.copy2(entry_dir_path + '/' + f, results_dir_path + '/' + f)
+        return True
+
+    def store(self, key, test_suite, results_dir_path):
+        entry_dir_path = self.cache_dir_path + '/' + key
+        tmp_dir_path = entry_dir_path + ".tmp"
+        shutil.rmtree(tmp_dir_path, ignore_errors=True)
+        os.makedirs(tmp_dir_path)
+        for f in SimulationSuites().suite_files(test_suite, results_dir_path):
+            shutil.copy2(results_dir_path + '/' + f, tmp_dir_path + '/' + f)
+        shutil.rmtree(entry_dir_path, ignore_errors=True)
+        os.rename(tmp_dir_path, entry_dir_path)
@@ -0,0 +1,136 @@
+from contextlib import nullcontext
+import heapq
+from json import dump, load, loads
+import os
+import xml.etree.cElementTree as ET
+
+import click
+from setup_data_to_json import SetupToJson
+
+
+class SimulationSuites:
+
+    def read(self, setup_py_file_path='test/setup.py'):
+        # --------------------------
+        # extract data from setup.py
+        # --------------------------
+        extractor = SetupToJson()
+        print("reading {}".format(setup_py_file_path))
+        json_string = extractor.extract(setup_py_file_path)
+        return loads(json_string)
+
+    def expand(self, static_setup_data):
+        test_suite_data_dict = {}
+        if "test_suites" in static_setup_data:
+            for test_suite in static_setup_data["test_suites"]:
+                if "testsuite-indexes" in test_suite:
+                    for i in range(int(test_suite["testsuite-indexes"])):
+                        test_suite_data_dict["{}_{:d}".format(test_suite["testsuite-name"],
+                                                              i)] = {"testsuite-name": test_suite["testsuite-name"],
+                                                                     "file": test_suite["file"],
+                                                                     "entry-file": test_suite["entry-file"],
+                                                                     "entry-label": test_suite["entry-label"],
+                                                                     "index": str(i)}
+                else:
+                    test_suite_data_dict[test_suite["testsuite-name"]] = {"testsuite-name": test_suite["testsuite-name"],
+                                                                          "file": test_suite["file"],
+                                                                          "entry-file": test_suite["entry-file"],
+                                                                          "entry-label": test_suite["entry-label"]}
+        return test_suite_data_dict
+
+    def arguments(self, test_suite_data, stimulus_path='${basedir}/tb/simstm/', compiled_stimulus_path=None):
+        stimulus_file = test_suite_data["entry-file"]
+        if compiled_stimulus_path is not None:
+            stimulus_path = compiled_stimulus_path
+            stimulus_file = self.compiled_stimulus_file(stimulus_file)
+        args = ["--stop-time=100ms",
+                "-gstimulus_path=" + stimulus_path,
+                "-gstimulus_file=" + stimulus_file,
+                "-gstimulus_main_entry_label=" + test_suite_data["entry-label"]]
+        if "index" in test_suite_data:
+            args.append("-gstimulus_test_suite_index=" + test_suite_data["index"])
+            args.append("-gmachine_value_width=" + str((2 ** (int(test_suite_data["index"]) % 4)) * 32))
+        return args
+
+    def compiled_stimulus_file(self, entry_file):
+        return entry_file + 'c'
+
+    def suite_files(self, test_suite, dir_path):
+        files = [f for f in [test_suite + ".out", test_suite + ".err", test_suite + ".usage"]
+                 if os.path.isfile(dir_path + '/' + f)]
+        for f in os.listdir(dir_path):
+            if f.startswith(test_suite + '_') and os.path.splitext(f)[1] in ('.xml', '.start'):
+                files.append(f)
+        return files
+
+    def read_history(self, history_file_path):
+        if history_file_path is None or not os.path.isfile(history_file_path):
+            return {}
+        with open(history_file_path, "r") as f:
+            return load(f)
+
+    def write_history(self, history_file_path, history):
+        print("writing {}".format(history_file_path))
+        with open(history_file_path, "w") as f:
+            dump(dict(sorted(history.items())), f, indent=4)
+
+    def predicted_durations(self, test_suites, history):
+        # suites without history are assumed to be as long as the longest known one
+        default_duration = max(history.values()) if history else 1.0
+        return {test_suite: history.get(test_suite, default_duration) for test_suite in test_suites}
+
+    def lpt_order(self, durations):
+        return sorted(durations, key=lambda test_suite: (-durations[test_suite], test_suite))
+
+    def makespan(self, ordered_test_suites, durations, jobs):
+        workers = [0.0] * max(1, min(jobs, len(ordered_test_suites)))
+        for test_suite in ordered_test_suites:
+            heapq.heapreplace(workers, workers[0] + durations[test_suite])
+        return max(workers)
+
+    def parse_shard(self, shard):
+        try:
+            shard_index, shard_count = (int(v) for v in shard.split('/'))
+        except ValueError:
+            shard_index, shard_count = 0, 0
+        if shard_count < 1 or shard_index < 1 or shard_index > shard_count:
+            raise click.BadParameter("{} is not of the form i/N with 1 <= i <= N".format(shard),
+                                     param_hint="'--shard'")
+        return shard_index, shard_count
+
+    def shard(self, durations, shard_index, shard_count):
+        # greedy longest processing time first partition, ties are broken by name so
+        # every node computes the same shards from the same setup.py and history
+        shards = [(0.0, i, []) for i in range(shard_count)]
+        for test_suite in self.lpt_order(durations):
+            load, i, test_suites = heapq.heappop(shards)
+            test_suites.append(test_suite)
+            heapq.heappush(shards, (load + durations[test_suite], i, test_suites))
+        return sorted(shards, key=lambda s: s[1])[shard_index - 1][2]
+
+    def failed_suites(self, report_file_path, test_suites):
+        # suites with failures or errors in the report or without any report at all
+        reported = {}
+        if os.path.isfile(report_file_path):
+            for tsuite in ET.parse(report_file_path).getroot().findall("testsuite"):
+                reported[tsuite.attrib["name"]] = tsuite
+        failed = []
+        for test_suite in test_suites:
+            tsuite = reported.get(test_suite)
+            if tsuite is None or int(tsuite.attrib.get("tests", "0")) == 0 or \
+                    int(tsuite.attrib.get("failures", "0")) > 0 or int(tsuite.attrib.get("errors", "0")) > 0:
+                failed.append(test_suite)
+        return failed
+
+    def wait_process(self, proc, lock=None):
+        # the resource usage of this process alone, getrusage of the children would sum up all finished ones.
+        # the child is only reaped here, waitid leaves it a zombie until wait4 reaps it under the lock a
+        # concurrent kill is sent under, so neither Popen nor a kill of a reused pid gets in between
+        os.waitid(os.P_PID, proc.pid, os.WEXITED | os.WNOWAIT)
+        with lock or nullcontext():
+            pid, status, usage = os.wait4(proc.pid, 0)
+            proc.returncode = os.waitstatus_to_exitcode(status)
+        return {"exit_code": proc.returncode,
+                "user_time": usage.ru_utime,
+                "system_time": usage.ru_stime,
+                "peak_rss_kb": usage.ru_maxrss}
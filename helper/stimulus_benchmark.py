@@ -0,0 +1,99 @@
+import os
+
+
+class StimulusBenchmark:
+
+    # the program of the base is scaled along one axis at a time
+    base = {"consts": 100, "vars": 100, "length": 100, "include_depth": 1, "loops": 100, "lines_size": 100,
+            "array_size": 100}
+
+    axes = {"consts": [10, 100, 1000, 10000],
+            "vars": [10, 100, 1000, 10000],
+            "length": [10, 100, 1000, 10000],
+            "include_depth": [0, 1, 4, 16],
+            "loops": [1, 10, 100, 1000],
+            "lines_size": [0, 100, 1000, 10000],
+            "array_size": [1, 100, 1000, 10000]}
+
+    # the load entry finishes at once, so its run only reads, tests and resolves the stimulus
+    load_entry_label = "$benchmarkLoad"
+    main_entry_label = "$benchmarkMain"
+
+    def matrix(self, axes=None):
+        benchmarks = {}
+        for axis in axes or sorted(self.axes):
+            for value in self.axes[axis]:
+                params = dict(self.base)
+                params[axis] = value
+                benchmarks["benchmark_{}_{:d}".format(axis, value)] = params
+        return benchmarks
+
+    def body(self, params):
+        # straight line instructions touching the declared variables, the array and the lines in turn
+        lines = []
+        for i in range(params["length"]):
+            kind = i % 6
+            if kind == 0 and params["vars"] and params["consts"]:
+                lines.append("add benchmark_var_{:d} $benchmark_const_{:d}".format(
+                    i % params["vars"], i % params["consts"]))
+            elif kind == 1 and params["vars"]:
+                lines.append("equ benchmark_value $benchmark_var_{:d}".format((i * 7) % params["vars"]))
+            elif kind == 2 and params["array_size"]:
+                lines.append("array set benchmark_array {:d} $benchmark_value".format(
+                    (i * 13) % params["array_size"]))
+            elif kind == 3 and params["array_size"]:
+                lines.append("array get benchmark_array {:d} benchmark_value".format(
+                    (i * 17) % params["array_size"]))
+            elif kind == 4 and params["lines_size"]:
+                lines.append('lines set message benchmark_lines {:d} "benchmark line {{}}" $benchmark_value'.format(
+                    (i * 19) % params["lines_size"]))
+            else:
+                lines.append("xor benchmark_value 1")
+        return lines
+
+    def generate(self, outdir_path, name, params):
+        # the declarations are spread over the entry file and a chain of include_depth included files
+        files = [name + ".stm"]
+        files += ["{}_include_{:d}.stm".format(name, d) for d in range(1, params["include_depth"] + 1)]
+        contents = [[] for f in files]
+        for d, f in enumerate(files[1:]):
+            contents[d].append('include "{}"'.format(f))
+        for i in range(params["consts"]):
+            contents[i % len(files)].append("const benchmark_const_{:d} {:d}".format(i, i + 1))
+        for i in range(params["vars"]):
+            contents[i % len(files)].append("var benchmark_var_{:d} 0".format(i))
+
+        main = contents[0]
+        main.append("const benchmark_loops {:d}".format(params["loops"]))
+        main.append("const benchmark_lines_size {:d}".format(params["lines_size"]))
+        main.append("var benchmark_index 0")
+        main.append("var benchmark_value 0")
+        main.append("array benchmark_array {:d}".format(params["array_size"]))
+        main.append("lines benchmark_lines")
+        main.append("")
+        main.append(self.load_entry_label[1:] + ":")
+        main.append("proc")
+        main.append("    finish")
+        main.append("end proc")
+        main.append("")
+        main.append(self.main_entry_label[1:] + ":")
+        main.append("proc")
+        if params["lines_size"]:
+            main.append("    loop $benchmark_lines_size")
+            main.append('        lines append message benchmark_lines "benchmark line {}" $benchmark_index')
+            main.append("        add benchmark_index 1")
+            main.append("    end loop")
+        if params["loops"]:
+            main.append("    loop $benchmark_loops")
+            main += ["        " + l for l in self.body(params)]
+            main.append("    end loop")
+        main.append("    finish")
+        main.append("end proc")
+
+        os.makedirs(outdir_path, exist_ok=True)
+        for f, content in zip(files, contents):
+            with open(outdir_path + '/' + f, "w", newline="\n") as fo:
+                fo.write("-- generated by helper/stimulus_benchmark.py, {}\n".format(
+                    ", ".join("{} {:d}".format(k, params[k]) for k in sorted(params))))
+                fo.write("\n".join(content) + "\n")
+        return files[0]
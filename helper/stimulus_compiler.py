@@ -0,0 +1,214 @@
+import os
+import re
+
+import click
+
+
+class StimulusCompiler:
+
+    # the compiled form is recognized by the interpreter by this first line
+    header = "-- simstm compiled 1"
+
+    max_field_len = 128
+    max_str_len = 512
+    stm_text_len = 500
+
+    # instruction and number of parameters are taken from define_instructions in tb_instructions_pkg.vhd
+    instructions_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "vhdl",
+                                          "tb_instructions_pkg.vhd")
+    instruction_constant_pattern = re.compile(r'^\s*constant\s+(INSTR_\w+)\s*:\s*string\s*:=\s*"([^"]*)"\s*;')
+    define_instruction_pattern = re.compile(r'^\s*define_instruction\(inst_list,\s*(INSTR_\w+),\s*(\d+)\);')
+    instructions = {}
+
+    # instructions declaring an object instead of being executed, see add_instruction
+    declarations = ["var", "const", "array", "lines", "file", "bus", "signal"]
+
+    # word merging as done by token_merge_words, the second and third words are prefix matched
+    merged_words = {
+        "end": [("if", []), ("loop", []), ("proc", []), ("interrupt", [])],
+        "log": [("message", []), ("lines", [])],
+        "file": [("readable", []), ("writeable", []), ("appendable", []), ("write", []), ("append", []),
+                 ("read", ["end", "all", "array"]), ("pointer", ["copy"])],
+        "lines": [("get", ["array"]), ("set", ["array", "message"]), ("delete", ["all"]),
+                  ("insert", ["array", "message"]), ("append", ["array", "message"]), ("size", []),
+                  ("pointer", ["copy"])],
+        "array": [("set", []), ("get", []), ("size", []), ("verify", []), ("pointer", ["copy"])],
+        "else": [("if", [])],
+        "var": [("verify", [])],
+        "signal": [("verify", []), ("read", []), ("write", []), ("pointer", ["copy", "set", "get"])],
+        "bus": [("verify", ["array"]), ("read", ["array"]), ("write", ["array"]), ("timeout", ["set", "get"]),
+                ("outstanding", ["set", "get"]), ("pointer", ["copy", "set", "get"])]}
+
+    comparators = ("=", ">=", "<=", ">", "<", "!=")
+
+    def tokenize(self, l):
+        # like tokenize_line, a comment ends the line even inside a text and
+        # everything behind the first quote is the text of the instruction
+        l = l[:self.max_str_len - 1].split("--")[0]
+        quote = None
+        txt = ""
+        for i, c in enumerate(l):
+            if c in ('"', "'"):
+                quote = c
+                txt = l[i + 1:]
+                l = l[:i]
+                break
+        if len(txt) > self.stm_text_len:
+            print("tokenize_line: truncated txt line, it was larger than c_stm_text_len")
+            txt = txt[:self.stm_text_len]
+        return self.merge(l.split()[:9]), quote, txt
+
+    def merge(self, tokens):
+        if len(tokens) < 2:
+            return tokens
+        for first, seconds in self.merged_words.items():
+            if not tokens[0].startswith(first):
+                continue
+            for second, thirds in seconds:
+                if not tokens[1].startswith(second):
+                    continue
+                words = [first, second]
+                if len(tokens) > 2:
+                    words += [third for third in thirds if tokens[2].startswith(third)][:1]
+                merged = "_".join(words)
+                return [merged + tokens[0][len(merged):]] + tokens[len(words):]
+            break
+        return tokens
+
+    def read_instructions(self, instructions_file_path):
+        constants = {}
+        instructions = {}
+        with open(instructions_file_path, "r", encoding="latin-1") as f:
+            for l in f:
+                m = self.instruction_constant_pattern.match(l)
+                if m:
+                    constants[m.group(1)] = m.group(2)
+                m = self.define_instruction_pattern.match(l)
+                if m:
+                    instructions[constants[m.group(1)]] = int(m.group(2))
+        if not instructions:
+            raise click.ClickException("no instructions defined in {}".format(instructions_file_path))
+        return instructions
+
+    def read_lines(self, p):
+        with open(p, "r", encoding="latin-1") as f:
+            lines = f.read().split("\n")
+        if lines and lines[-1] == "":
+            lines.pop()
+        return lines
+
+    def include_name(self, tokens, quote, txt, l_num, p):
+        if len(tokens) == 2:
+            return tokens[1]
+        elif quote is not None:
+            return txt.split(quote)[0]
+        raise click.ClickException("include instruction is missing the included file name on line "
+                                   "{:d} in file {}".format(l_num, p))
+
+    def present(self, files, first, iname):
+        # check_presence_instruction_file_name compares the include name with the nul padded file names of the
+        # records from first on but the last, a name shorter than a text_line never equals one of them
+        return iname in [name[:self.max_str_len].ljust(self.max_str_len, "\0") for name in files[first:-1]]
+
+    def read(self, stimulus_path, name, files, records):
+        # the entry file like read_instruction_file, its includes are loaded without a presence check
+        # and one that cannot be opened terminates the test
+        p = stimulus_path + name
+        try:
+            lines = self.read_lines(p)
+        except OSError:
+            raise click.ClickException("unable to open stimulus file {}".format(p))
+        for l_num, l in enumerate(lines, 1):
+            tokens, quote, txt = self.tokenize(l.rstrip("\r"))
+            if not tokens:
+                continue
+            if tokens[0] == "include":
+                iname = self.include_name(tokens, quote, txt, l_num, p)
+                if not self.read_include(stimulus_path, iname, 0, files, records):
+                    raise click.ClickException("include file specified on line {:d} in file {} was not found".format(
+                        l_num, p))
+                continue
+            records.append((1, l_num, tokens, quote, txt))
+
+    def read_include(self, stimulus_path, name, first, files, records):
+        # an included file like read_include_file, its own includes are checked for presence from the record
+        # of the file including it on, an include that cannot be opened ends reading the file
+        p = stimulus_path + name
+        try:
+            lines = self.read_lines(p)
+        except OSError:
+            print("error: unable to open include file  {}".format(p))
+            return False
+        files.append(name)
+        file_idx = len(files)
+        for l_num, l in enumerate(lines, 1):
+            tokens, quote, txt = self.tokenize(l.rstrip("\r"))
+            if not tokens:
+                continue
+            if tokens[0] == "include":
+                iname = self.include_name(tokens, quote, txt, l_num, p)
+                if self.present(files, first, iname):
+                    print("nested include found: not loading file since already present {}".format(iname))
+                elif not self.read_include(stimulus_path, iname, file_idx - 1, files, records):
+                    break
+                continue
+            records.append((file_idx, l_num, tokens, quote, txt))
+        return True
+
+    def check(self, files, records):
+        defined = set()
+        labels = []
+        for file_idx, l_num, tokens, quote, txt in records:
+            inst = tokens[0]
+            where = "line {:d} in file {}".format(l_num, files[file_idx - 1])
+            if len(inst) > self.max_field_len or any(len(t) > self.max_field_len for t in tokens):
+                raise click.ClickException("token longer than {:d} characters on {}".format(self.max_field_len,
+                                                                                          where))
+            if inst.endswith(':'):
+                labels.append(inst[:-1])
+                continue
+            elif inst not in self.instructions:
+                raise click.ClickException("undefined instruction {} on {}".format(inst, where))
+            elif self.instructions[inst] != len(tokens) - 1:
+                raise click.ClickException("incorrect number of fields for {} on {}".format(inst, where))
+            elif inst in self.declarations:
+                if tokens[1] in defined:
+                    raise click.ClickException("duplicate variable definition {} on {}".format(tokens[1], where))
+                defined.add(tokens[1])
+        # labels are looked up like variables but the interpreter does not reject duplicates of them
+        defined.update(labels)
+        for file_idx, l_num, tokens, quote, txt in records:
+            if tokens[0].endswith(':') or tokens[0] in self.declarations:
+                continue
+            for t in tokens[1:7]:
+                if t[0].isdigit() or t.startswith(self.comparators):
+                    continue
+                if (t[1:] if t.startswith('$') else t) not in defined:
+                    raise click.ClickException("variable {} is not defined on line {:d} in file {}".format(
+                        t, l_num, files[file_idx - 1]))
+
+    def field(self, s):
+        return "{:d} {}".format(len(s), s)
+
+    def compile(self, stimulus_path, stimulus_file, outfile_path):
+        self.instructions = self.read_instructions(self.instructions_file_path)
+        files = [stimulus_path + stimulus_file]
+        records = []
+        self.read(stimulus_path, stimulus_file, files, records)
+        self.check(files, records)
+        print("writing {}".format(outfile_path))
+        with open(outfile_path, "w", encoding="latin-1", newline="\n") as f:
+            f.write(self.header + "\n")
+            f.write("{:d} {:d}\n".format(len(files), len(records)))
+            for name in files:
+                f.write(self.field(name[:self.max_str_len]) + "\n")
+            # declarations and labels take the sequence number of the next instruction like in add_instruction
+            sequ_num = 1
+            for file_idx, l_num, tokens, quote, txt in records:
+                fields = [str(sequ_num), str(file_idx), str(l_num), str(min(len(tokens), 7))]
+                fields += [self.field(t) for t in tokens[:7]]
+                fields.append(self.field(quote + txt) if txt else "0")
+                f.write(" ".join(fields) + "\n")
+                if not tokens[0].endswith(':') and tokens[0] not in self.declarations:
+                    sequ_num += 1
+        return len(records)
@@ -52,7 +52,8 @@ static_setup_data = {
                   {"testlab-name": "testLabConstantAdd", "file": "TestLabs/TestLabConstantAdd.stm", "entry-file": "testMainLabConstantAdd.stm", "entry-label": "$testMainLabConstantAdd"},
                   {"testlab-name": "testLabBasicAbort", "file": "TestLabs/TestLabBasicAbort.stm", "entry-file": "testMainLabBasicAbort.stm", "entry-label": "$testMainLabBasicAbort"},
                   {"testlab-name": "testLabBasicDoubleConst", "file": "TestLabs/TestLabBasicDoubleConst.stm", "entry-file": "testMainLabBasicDoubleConst.stm", "entry-label": "$testMainLabBasicDoubleConst"},
-                  {"testlab-name": "testLabBasicFinish", "file": "TestLabs/TestLabBasicFinish.stm", "entry-file": "testMainLabBasicFinish.stm", "entry-label": "$testMainLabBasicFinish"}
+                  {"testlab-name": "testLabBasicFinish", "file": "TestLabs/TestLabBasicFinish.stm", "entry-file": "testMainLabBasicFinish.stm", "entry-label": "$testMainLabBasicFinish"},
+                  {"testlab-name": "testLabBenchmarkDispatch", "file": "TestLabs/TestLabBenchmarkDispatch.stm", "entry-file": "testMainLabBenchmarkDispatch.stm", "entry-label": "$testMainLabBenchmarkDispatch"}
                   ],
     "other_data_files": [("simstm", [{"file": "README.md"}])],
     "src_data_files": [("simstm/src_to_customize", [{"file": "src_to_customize/tb_bus_pkg.vhd", "file_type": "VHDL 2008", "hdl_order": "00150"},
@@ -70,6 +71,7 @@ static_setup_data = {
                                             {"file": "src/vhdl/tb_base_pkg_body.vhd", "file_type": "VHDL 2008", "hdl_order": "00051"},
                                             {"file": "src/vhdl/tb_bus_wishbone_64_pkg.vhd", "file_type": "VHDL 2008", "hdl_order": "00070"},
                                             {"file": "src/vhdl/tb_bus_wishbone_32_pkg.vhd", "file_type": "VHDL 2008", "hdl_order": "00080"},
+                                            {"file": "src/vhdl/tb_bus_lanes_32_pkg.vhd", "file_type": "VHDL 2008", "hdl_order": "00065"},
                                             {"file": "src/vhdl/tb_instructions_pkg.vhd", "file_type": "VHDL 2008", "hdl_order": "00160"},
                                             {"file": "src/vhdl/tb_simstm.vhd", "file_type": "VHDL 2008", "hdl_order": "00180"}
                                             ])
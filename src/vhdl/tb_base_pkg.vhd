@@ -70,23 +70,80 @@ package tb_base_pkg is
     subtype text_field is string(1 to max_field_len);
     subtype text_line is string(1 to max_str_len);
     subtype stm_text is string(1 to c_stm_text_len);
-    type stm_text_ptr is access stm_text;
+    -- texts are allocated with their exact length, stm_text is the fixed scratch buffer
+    type stm_text_ptr is access string;
 
     type stack_text_field_array is array (31 downto 0) of text_field;
     type stack_text_line_array is array (31 downto 0) of text_line;
     type stack_numbers_array is array (31 downto 0) of integer;
 
+    -- define the file handle record
+    type file_def;
+    type file_def_ptr is access file_def;
+    type file_def is record
+        rec_idx : integer;
+        file_name : text_line;
+        next_rec : file_def_ptr;
+    end record;
+
+    type t_stm_array is array (natural range <>) of unsigned;
+    type t_stm_array_ptr is access t_stm_array;
+
+    -- the variables field and pointer, the record is defined below
+    type var_field;
+    type var_field_ptr is access var_field; -- pointer to var_field
+    type var_field_ptr_array is array (natural range <>) of var_field_ptr;
+    type var_field_ptr_array_ptr is access var_field_ptr_array;
+
+    -- texts of the stimulus lines, equal texts of all lines are stored once
+    type string_pool_entry;
+    type string_pool_entry_ptr is access string_pool_entry;
+    type string_pool is array (natural range <>) of string_pool_entry_ptr;
+    type string_pool_ptr is access string_pool;
+    type string_pool_entry is record
+        value : line; -- an instruction or operand token
+        txt : stm_text_ptr; -- or a text string
+        next_rec : string_pool_entry_ptr;
+    end record;
+
+    -- instruction opcodes, one per INSTR_* constant of tb_instructions_pkg, dispatched on by the interpreter
+    type t_stm_opcode is (OP_NONE,
+                          OP_ABORT, OP_CONST, OP_ELSE, OP_ELSIF, OP_END_IF, OP_END_LOOP, OP_FINISH, OP_IF,
+                          OP_INCLUDE, OP_LOOP, OP_VAR,
+                          OP_ADD, OP_AND, OP_DIV, OP_REM, OP_EQU, OP_MUL, OP_SHL, OP_SHR, OP_INV, OP_OR, OP_SUB,
+                          OP_XOR, OP_LD, OP_VAR_VERIFY,
+                          OP_SIGNAL, OP_SIGNAL_READ, OP_SIGNAL_VERIFY, OP_SIGNAL_WRITE, OP_SIGNAL_POINTER_COPY,
+                          OP_SIGNAL_POINTER_SET, OP_SIGNAL_POINTER_GET,
+                          OP_BUS, OP_BUS_READ, OP_BUS_VERIFY, OP_BUS_WRITE, OP_BUS_READ_ARRAY,
+                          OP_BUS_VERIFY_ARRAY, OP_BUS_WRITE_ARRAY, OP_BUS_TIMEOUT_SET, OP_BUS_TIMEOUT_GET,
+                          OP_BUS_OUTSTANDING_SET, OP_BUS_OUTSTANDING_GET, OP_BUS_POINTER_COPY,
+                          OP_BUS_POINTER_SET, OP_BUS_POINTER_GET,
+                          OP_FILE, OP_FILE_READABLE, OP_FILE_WRITEABLE, OP_FILE_APPENDABLE, OP_FILE_READ,
+                          OP_FILE_READ_END, OP_FILE_READ_ALL, OP_FILE_READ_ARRAY, OP_FILE_WRITE, OP_FILE_APPEND,
+                          OP_FILE_POINTER_COPY,
+                          OP_LINES, OP_LINES_GET_ARRAY, OP_LINES_SET_ARRAY, OP_LINES_SET_MESSAGE, OP_LINES_DELETE,
+                          OP_LINES_DELETE_ALL, OP_LINES_INSERT_ARRAY, OP_LINES_INSERT_MESSAGE,
+                          OP_LINES_APPEND_ARRAY, OP_LINES_APPEND_MESSAGE, OP_LINES_SIZE, OP_LINES_POINTER_COPY,
+                          OP_ARRAY, OP_ARRAY_GET, OP_ARRAY_SET, OP_ARRAY_SIZE, OP_ARRAY_POINTER_COPY,
+                          OP_ARRAY_VERIFY,
+                          OP_PROC, OP_CALL, OP_INTERRUPT, OP_END_PROC, OP_END_INTERRUPT, OP_RANDOM,
+                          OP_LOG_MESSAGE, OP_LOG_LINES, OP_RETURN, OP_RESUME, OP_MARKER, OP_VERBOSITY, OP_SEED,
+                          OP_TRACE, OP_WAIT);
+
     -- define the stimulus line record and access
     type stim_line;
     type stim_line_ptr is access stim_line; -- pointer to stim_line record
+    type stim_line_ptr_array is array (natural range <>) of stim_line_ptr;
+    type stim_line_ptr_array_ptr is access stim_line_ptr_array;
     type stim_line is record
-        instruction : text_field;
-        inst_field_1 : text_field;
-        inst_field_2 : text_field;
-        inst_field_3 : text_field;
-        inst_field_4 : text_field;
-        inst_field_5 : text_field;
-        inst_field_6 : text_field;
+        instruction : line; -- the texts are shared through the string pool
+        opcode : t_stm_opcode; -- opcode of instruction, resolved after loading
+        inst_field_1 : line; -- null if the field is not given
+        inst_field_2 : line;
+        inst_field_3 : line;
+        inst_field_4 : line;
+        inst_field_5 : line;
+        inst_field_6 : line;
         txt : stm_text_ptr;
         txt_enclosing_quote : character;
         line_number : integer; -- sequence line
@@ -94,6 +151,12 @@ package tb_base_pkg is
         file_line : integer; -- file line number
         file_idx : integer;
         next_rec : stim_line_ptr;
+        file_ref : file_def_ptr; -- file this line came from, resolved after loading
+        operand_values : t_stm_array_ptr; -- values of the fields, resolved after loading
+        operand_vars : var_field_ptr_array_ptr; -- variables of the $ fields, their value is read when executed
+        last_rec : stim_line_ptr; -- tail of the list, kept in the first record
+        line_index : stim_line_ptr_array_ptr; -- records by sequence number, kept in the first record
+        pool : string_pool_ptr; -- string pool of all records, kept in the first record
     end record;
 
     -- define the instruction structure
@@ -106,18 +169,6 @@ package tb_base_pkg is
         next_rec : inst_def_ptr;
     end record;
 
-    -- define the file handle record
-    type file_def;
-    type file_def_ptr is access file_def;
-    type file_def is record
-        rec_idx : integer;
-        file_name : text_line;
-        next_rec : file_def_ptr;
-    end record;
-
-    type t_stm_array is array (natural range <>) of unsigned;
-    type t_stm_array_ptr is access t_stm_array;
-
     type t_stm_line_type is (STM_LINE_TEXT_TYPE,
                              STM_LINE_ARRAY_TYPE
                             );
@@ -125,21 +176,39 @@ package tb_base_pkg is
     type t_stm_line;
     type t_stm_line_ptr is access t_stm_line;
     type t_stm_line is record
-        line_number : integer;
         line_content : line;
         line_type : t_stm_line_type;
         array_size : integer;
-        next_stm_line : t_stm_line_ptr;
     end record;
+    type t_stm_line_ptr_array is array (natural range <>) of t_stm_line_ptr;
+    type t_stm_line_ptr_array_ptr is access t_stm_line_ptr_array;
 
+    -- the lines are indexed by their position, the array grows by doubling
+    -- and holds size lines in stm_line_list(0 to size - 1)
     type t_stm_lines;
     type t_stm_lines_ptr is access t_stm_lines;
     type t_stm_lines is record
-        stm_line_list : t_stm_line_ptr;
+        stm_line_list : t_stm_line_ptr_array_ptr;
         size : integer;
         next_stm_lines : t_stm_lines_ptr;
     end record;
 
+    -- the profile keeps one node per chain of called labels, the time of a node is the
+    -- simulated time spent executing its own instructions without the ones of its children
+    type t_stm_profile_opcode_counts is array (t_stm_opcode) of integer;
+    type t_stm_profile_node;
+    type t_stm_profile_node_ptr is access t_stm_profile_node;
+    type t_stm_profile_node is record
+        called_label : text_field;
+        called_file : text_line; -- file the first call came from
+        calls : integer;
+        instructions : integer;
+        self_time : time;
+        parent : t_stm_profile_node_ptr;
+        first_child : t_stm_profile_node_ptr;
+        next_sibling : t_stm_profile_node_ptr;
+    end record;
+
     type t_stm_var_type is (STM_VALUE_TYPE,
                             STM_CONST_VALUE_TYPE,
                             STM_TEXT_TYPE,
@@ -152,8 +221,6 @@ package tb_base_pkg is
                            );
 
     -- define the variables field and pointer
-    type var_field;
-    type var_field_ptr is access var_field; -- pointer to var_field
     type var_field is record
         var_name : text_field;
         var_index : integer;
@@ -164,6 +231,10 @@ package tb_base_pkg is
         var_stm_array : t_stm_array_ptr;
         var_stm_lines : t_stm_lines_ptr;
         next_rec : var_field_ptr;
+        hash_next : var_field_ptr; -- next variable in the same name hash bucket
+        last_rec : var_field_ptr; -- tail of the list, kept in the first record
+        var_buckets : var_field_ptr_array_ptr; -- name hash buckets, kept in the first record
+        var_indexes : var_field_ptr_array_ptr; -- variables by var_index, kept in the first record
     end record;
 
     -- bin2integer    convert bin stimulus field to integer
@@ -235,6 +306,10 @@ package tb_base_pkg is
     procedure get_line_from_str(s : in string;
                                 std_line : inout line);
 
+    -- procedure to get a text_field from a line, a null line gives an empty field
+    procedure line_to_text_field(variable l : in line;
+                                 variable tf : out text_field);
+
     -- procedure to get stm_text pointer from a line
     procedure get_stm_text_ptr_from_line(std_line : inout line;
                                          var_stm_text_ptr : inout stm_text_ptr);
@@ -319,6 +394,22 @@ package tb_base_pkg is
                                 variable file_path : in stm_text_ptr;
                                 variable valid : out integer);
 
+    -- stm_file_read_array
+    --   fills the array with the hex numbers read from the open file, the numbers
+    --   of the last line which did not fit into the array are kept in pending for
+    --   the next call. number_found is less than the array size at the end of the file.
+    procedure stm_file_read_array(file user_file : text;
+                                  variable pending : inout line;
+                                  variable stm_array : in t_stm_array_ptr;
+                                  variable number_found : out integer;
+                                  constant stm_value_width : in integer);
+
+    --  procedure to append up to number lines read from the open file to stm_lines
+    procedure stm_file_read_lines(file user_file : text;
+                                  variable stm_lines : inout t_stm_lines_ptr;
+                                  constant number : in integer;
+                                  variable valid : out integer);
+
     procedure stm_file_readable(variable file_path : in stm_text_ptr;
                                 variable status : out integer);
 
@@ -348,6 +439,9 @@ package tb_base_pkg is
                                variable position : in integer;
                                variable valid : out integer);
 
+    procedure stm_lines_delete_all(variable stm_lines : inout t_stm_lines_ptr;
+                                   variable valid : out integer);
+
     procedure stm_lines_get(variable stm_lines : in t_stm_lines_ptr;
                             variable position : in integer;
                             variable std_line : out line;
@@ -385,7 +479,11 @@ package tb_base_pkg is
                             variable valid : out integer;
                             constant stm_value_width : in integer);
 
-    --  procedure copy stm_text into an existing pointer
+    --  procedure to allocate a text of exactly the length of s
+    procedure new_stm_text_ptr(constant s : in string;
+                               variable ptr : out stm_text_ptr);
+
+    --  procedure copy the non 'nul' chars of stm_text into a new pointer
     procedure stm_text_copy_to_ptr(variable ptr : inout stm_text_ptr;
                                    variable txt_str : in stm_text);
 
@@ -442,24 +442,24 @@ package body tb_base_pkg is
         end loop;
     end procedure;
 
+    procedure line_to_text_field(variable l : in line;
+                                 variable tf : out text_field) is
+    begin
+        for i in 1 to tf'length loop
+            tf(i) := nul;
+        end loop;
+        if l /= null then
+            assert tf'length > l'length;
+            for i in 1 to l'length loop
+                tf(i) := l.all(i);
+            end loop;
+        end if;
+    end procedure;
+
     procedure get_stm_text_ptr_from_line(std_line : inout line;
                                          var_stm_text_ptr : inout stm_text_ptr) is
-        variable var_stm_text : stm_text;
-        variable chr : character;
-        variable good : boolean;
-        variable tmp_std_line : line;
     begin
-        tmp_std_line := new string'(std_line.all);
-        for i in 1 to var_stm_text'length loop
-            read(tmp_std_line, chr, good);
-            if good then
-                var_stm_text(i) := chr;
-            else
-                var_stm_text(i) := nul;
-                exit;
-            end if;
-        end loop;
-        stm_text_copy_to_ptr(var_stm_text_ptr, var_stm_text);
+        new_stm_text_ptr(std_line.all, var_stm_text_ptr);
     end procedure;
 
     procedure random(variable seed1 : inout positive;
@@ -690,10 +690,20 @@ package body tb_base_pkg is
 
     procedure print(s : in string) is
         variable l : line;
+        variable n : integer := 0;
     begin
-        for i in 1 to s'length loop
+        -- the line is allocated once with the number of non 'nul' chars
+        for i in s'range loop
             if s(i) /= nul then
-                write(l, s(i));
+                n := n + 1;
+            end if;
+        end loop;
+        l := new string(1 to n);
+        n := 0;
+        for i in s'range loop
+            if s(i) /= nul then
+                n := n + 1;
+                l(n) := s(i);
             end if;
         end loop;
         writeline(output, l);
@@ -800,30 +810,65 @@ package body tb_base_pkg is
         return stmvalue;
     end function;
 
+    -- write the first chunk_len - 1 chars of chunk, writeline adds the last line end
+    procedure stm_file_write_chunk(file user_file : text;
+                                   variable chunk : in line;
+                                   variable chunk_len : inout integer) is
+        variable std_line : line;
+    begin
+        if chunk_len > 0 then
+            std_line := new string'(chunk(1 to chunk_len - 1));
+            writeline(user_file, std_line);
+            deallocate(std_line);
+            chunk_len := 0;
+        end if;
+    end procedure;
+
+    -- the lines are joined with line ends into chunks, each chunk is written at once
+    procedure stm_file_write_lines(file user_file : text;
+                                   variable stm_lines : in t_stm_lines_ptr) is
+        constant c_chunk_len : integer := 65536;
+        variable chunk : line;
+        variable chunk_len : integer := 0;
+        variable content : line;
+        variable content_len : integer;
+    begin
+        chunk := new string(1 to c_chunk_len);
+        for i in 0 to stm_lines.size - 1 loop
+            content := stm_lines.stm_line_list(i).line_content;
+            content_len := 0;
+            if content /= null then
+                content_len := content'length;
+            end if;
+            if chunk_len + content_len + 1 > chunk'length then
+                stm_file_write_chunk(user_file, chunk, chunk_len);
+                if content_len + 1 > chunk'length then
+                    deallocate(chunk);
+                    chunk := new string(1 to content_len + 1);
+                end if;
+            end if;
+            if content_len > 0 then
+                chunk(chunk_len + 1 to chunk_len + content_len) := content.all;
+            end if;
+            chunk_len := chunk_len + content_len + 1;
+            chunk(chunk_len) := LF;
+        end loop;
+        stm_file_write_chunk(user_file, chunk, chunk_len);
+        deallocate(chunk);
+    end procedure;
+
     procedure stm_file_append(variable stm_lines : in t_stm_lines_ptr;
                               variable file_path : in stm_text_ptr;
                               variable valid : out integer) is
         variable v_stat : file_open_status;
         file user_file : text;
-        variable std_line : line;
-        variable stm_lines_get_valid : integer := 0;
-        variable position : integer;
-        variable file_path_string : stm_text;
     begin
         valid := 0;
-        txt_to_string(file_path, file_path_string);
-        file_open(v_stat, user_file, stm_text_crop(file_path_string), append_mode);
+        file_open(v_stat, user_file, file_path.all, append_mode);
         if v_stat /= open_ok then
             return;
         end if;
-        for i in 0 to stm_lines.size - 1 loop
-            position := i;
-            stm_lines_get(stm_lines, position, std_line, stm_lines_get_valid);
-            writeline(user_file, std_line);
-            if stm_lines_get_valid = 0 then
-                return;
-            end if;
-        end loop;
+        stm_file_write_lines(user_file, stm_lines);
         valid := 1;
         file_close(user_file);
     end procedure;
@@ -832,10 +877,8 @@ package body tb_base_pkg is
                                   variable status : out integer) is
         variable v_stat : file_open_status;
         file user_file : text;
-        variable file_path_string : stm_text;
     begin
-        txt_to_string(file_path, file_path_string);
-        file_open(v_stat, user_file, stm_text_crop(file_path_string), read_mode);
+        file_open(v_stat, user_file, file_path.all, read_mode);
         if v_stat = open_ok then
             file_close(user_file);
         end if;
@@ -847,37 +890,78 @@ package body tb_base_pkg is
                                 variable valid : out integer) is
         variable v_stat : file_open_status;
         file user_file : text;
-        variable std_line : line;
-        variable tmp_std_line : line;
-        variable stm_lines_append_valid : integer := 0;
-        variable file_path_string : stm_text;
     begin
         valid := 0;
-        txt_to_string(file_path, file_path_string);
-        file_open(v_stat, user_file, stm_text_crop(file_path_string), read_mode);
+        file_open(v_stat, user_file, file_path.all, read_mode);
         if v_stat /= open_ok then
             return;
         end if;
-        while not endfile(user_file) loop
-            readline(user_file, std_line);
-            tmp_std_line := new string'(std_line.all);
-            stm_lines_append(stm_lines, tmp_std_line, stm_lines_append_valid);
-            if stm_lines_append_valid = 0 then
-                return;
+        stm_file_read_lines(user_file, stm_lines, integer'high, valid);
+        file_close(user_file);
+    end procedure;
+
+    procedure stm_file_read_array(file user_file : text;
+                                  variable pending : inout line;
+                                  variable stm_array : in t_stm_array_ptr;
+                                  variable number_found : out integer;
+                                  constant stm_value_width : in integer) is
+        variable value_std_logic_vector : std_logic_vector(stm_value_width - 1 downto 0);
+        variable success : boolean;
+        variable array_index : integer := 0;
+        variable c : character;
+    begin
+        while array_index < stm_array'length loop
+            -- the values left in the last line read are used first
+            if pending = null then
+                if endfile(user_file) then
+                    exit;
+                end if;
+                readline(user_file, pending);
+            end if;
+            while pending'length > 0 and (pending(pending'left) = ' ' or pending(pending'left) = HT) loop
+                read(pending, c);
+            end loop;
+            if pending'length = 0 then
+                deallocate(pending);
+            else
+                hread(pending, value_std_logic_vector, success);
+                if success then
+                    stm_array(array_index) := unsigned(value_std_logic_vector);
+                    array_index := array_index + 1;
+                else
+                    assert false
+                    report lf & "error: stm_file_read_array found a non hex number before " & pending.all
+                    severity failure;
+                    deallocate(pending);
+                end if;
             end if;
         end loop;
+        number_found := array_index;
+    end procedure;
+
+    procedure stm_file_read_lines(file user_file : text;
+                                  variable stm_lines : inout t_stm_lines_ptr;
+                                  constant number : in integer;
+                                  variable valid : out integer) is
+        variable std_line : line;
+        variable n : integer := 0;
+    begin
         valid := 1;
-        file_close(user_file);
+        while n < number and not endfile(user_file) loop
+            readline(user_file, std_line);
+            -- the line read is handed over, readline allocates the next one
+            stm_lines_append(stm_lines, std_line, valid);
+            std_line := null;
+            n := n + 1;
+        end loop;
     end procedure;
 
     procedure stm_file_readable(variable file_path : in stm_text_ptr;
                                 variable status : out integer) is
         variable v_stat : file_open_status;
         file user_file : text;
-        variable file_path_string : stm_text;
     begin
-        txt_to_string(file_path, file_path_string);
-        file_open(v_stat, user_file, stm_text_crop(file_path_string), read_mode);
+        file_open(v_stat, user_file, file_path.all, read_mode);
         if v_stat = open_ok then
             file_close(user_file);
         end if;
@@ -904,25 +988,13 @@ package body tb_base_pkg is
                              variable valid : out integer) is
         variable v_stat : file_open_status;
         file user_file : text;
-        variable std_line : line;
-        variable stm_lines_get_valid : integer := 0;
-        variable position : integer;
-        variable file_path_string : stm_text;
     begin
         valid := 0;
-        txt_to_string(file_path, file_path_string);
-        file_open(v_stat, user_file, stm_text_crop(file_path_string), write_mode);
+        file_open(v_stat, user_file, file_path.all, write_mode);
         if v_stat /= open_ok then
             return;
         end if;
-        for i in 0 to stm_lines.size - 1 loop
-            position := i;
-            stm_lines_get(stm_lines, position, std_line, stm_lines_get_valid);
-            writeline(user_file, std_line);
-            if stm_lines_get_valid = 0 then
-                return;
-            end if;
-        end loop;
+        stm_file_write_lines(user_file, stm_lines);
         valid := 1;
         file_close(user_file);
     end procedure;
@@ -931,47 +1003,62 @@ package body tb_base_pkg is
                                  variable status : out integer) is
         variable v_stat : file_open_status;
         file user_file : text;
-        variable file_path_string : stm_text;
     begin
-        txt_to_string(file_path, file_path_string);
-        file_open(v_stat, user_file, stm_text_crop(file_path_string), write_mode);
+        file_open(v_stat, user_file, file_path.all, write_mode);
         if v_stat = open_ok then
             file_close(user_file);
         end if;
         status := stm_file_status(v_stat);
     end procedure;
 
+    -- make room for size lines, the array is doubled so appending is amortized constant
+    procedure stm_lines_reserve(variable stm_lines : inout t_stm_lines_ptr;
+                                constant size : in integer) is
+        variable grown : t_stm_line_ptr_array_ptr;
+        variable capacity : integer := 16;
+    begin
+        if stm_lines.stm_line_list /= null then
+            if stm_lines.stm_line_list'length >= size then
+                return;
+            end if;
+            capacity := stm_lines.stm_line_list'length;
+        end if;
+        while capacity < size loop
+            capacity := capacity * 2;
+        end loop;
+        grown := new t_stm_line_ptr_array(0 to capacity - 1);
+        for i in 0 to stm_lines.size - 1 loop
+            grown(i) := stm_lines.stm_line_list(i);
+        end loop;
+        deallocate(stm_lines.stm_line_list);
+        stm_lines.stm_line_list := grown;
+    end procedure;
+
+    -- place a new line at position, the lines from position on move up by one
+    procedure stm_lines_place(variable stm_lines : inout t_stm_lines_ptr;
+                              constant position : in integer;
+                              variable std_line : in line;
+                              constant line_type : in t_stm_line_type;
+                              constant array_size : in integer) is
+        variable stm_line_ptr : t_stm_line_ptr;
+    begin
+        stm_lines_reserve(stm_lines, stm_lines.size + 1);
+        for i in stm_lines.size downto position + 1 loop
+            stm_lines.stm_line_list(i) := stm_lines.stm_line_list(i - 1);
+        end loop;
+        stm_line_ptr := new t_stm_line;
+        stm_line_ptr.line_content := std_line;
+        stm_line_ptr.line_type := line_type;
+        stm_line_ptr.array_size := array_size;
+        stm_lines.stm_line_list(position) := stm_line_ptr;
+        stm_lines.size := stm_lines.size + 1;
+    end procedure;
+
     procedure stm_lines_append(variable stm_lines : inout t_stm_lines_ptr;
                                variable std_line : in line;
                                variable valid : out integer) is
-        variable stm_line_ptr : t_stm_line_ptr;
-        variable stm_next_line_ptr : t_stm_line_ptr;
     begin
-        valid := 0;
-        if stm_lines.size = 0 then
-            stm_line_ptr := new t_stm_line;
-            stm_line_ptr.line_number := 0;
-            stm_line_ptr.line_content := std_line;
-            stm_line_ptr.line_type := STM_LINE_TEXT_TYPE;
-            stm_line_ptr.array_size := 0;
-            stm_line_ptr.next_stm_line := null;
-            stm_lines.stm_line_list := stm_line_ptr;
-            stm_lines.size := 1;
-        else
-            stm_line_ptr := stm_lines.stm_line_list;
-            while stm_line_ptr.next_stm_line /= null loop
-                stm_line_ptr := stm_line_ptr.next_stm_line;
-            end loop;
-            stm_next_line_ptr := new t_stm_line;
-            stm_next_line_ptr.line_number := stm_line_ptr.line_number + 1;
-            stm_next_line_ptr.line_content := std_line;
-            stm_next_line_ptr.line_type := STM_LINE_TEXT_TYPE;
-            stm_next_line_ptr.array_size := 0;
-            stm_next_line_ptr.next_stm_line := null;
-            stm_line_ptr.next_stm_line := stm_next_line_ptr;
-            stm_lines.size := stm_lines.size + 1;
-            valid := 1;
-        end if;
+        stm_lines_place(stm_lines, stm_lines.size, std_line, STM_LINE_TEXT_TYPE, 0);
         valid := 1;
     end procedure;
 
@@ -979,131 +1066,65 @@ package body tb_base_pkg is
                                variable stm_array : in t_stm_array_ptr;
                                variable valid : out integer;
                                constant stm_value_width : in integer) is
-        variable stm_line_ptr : t_stm_line_ptr;
         variable std_line : line;
-        variable stm_next_line_ptr : t_stm_line_ptr;
         variable value_std_logic_vector : std_logic_vector(stm_value_width - 1 downto 0);
     begin
-        valid := 0;
         for j in 0 to stm_array'length - 1 loop
             value_std_logic_vector := std_logic_vector(stm_array(j));
             hwrite(std_line, value_std_logic_vector, left, stm_value_width / 4 + 1);
         end loop;
-        if stm_lines.size = 0 then
-            stm_line_ptr := new t_stm_line;
-            stm_line_ptr.line_number := 0;
-            stm_line_ptr.line_content := std_line;
-            stm_line_ptr.line_type := STM_LINE_ARRAY_TYPE;
-            stm_line_ptr.array_size := stm_array'length;
-            stm_line_ptr.next_stm_line := null;
-            stm_lines.stm_line_list := stm_line_ptr;
-            stm_lines.size := 1;
-        else
-            stm_line_ptr := stm_lines.stm_line_list;
-            while stm_line_ptr.next_stm_line /= null loop
-                stm_line_ptr := stm_line_ptr.next_stm_line;
-            end loop;
-            stm_next_line_ptr := new t_stm_line;
-            stm_next_line_ptr.line_number := stm_line_ptr.line_number + 1;
-            stm_next_line_ptr.line_content := std_line;
-            stm_next_line_ptr.line_type := STM_LINE_ARRAY_TYPE;
-            stm_next_line_ptr.array_size := stm_array'length;
-            stm_next_line_ptr.next_stm_line := null;
-            stm_line_ptr.next_stm_line := stm_next_line_ptr;
-            stm_lines.size := stm_lines.size + 1;
-            valid := 1;
-        end if;
+        stm_lines_place(stm_lines, stm_lines.size, std_line, STM_LINE_ARRAY_TYPE, stm_array'length);
         valid := 1;
     end procedure;
 
     procedure stm_lines_append(variable stm_lines : inout t_stm_lines_ptr;
                                variable var_stm_text : in stm_text_ptr;
                                variable valid : out integer) is
-        variable stm_line_ptr : t_stm_line_ptr;
-        variable stm_next_line_ptr : t_stm_line_ptr;
         variable std_line : line;
     begin
-        valid := 0;
         stm_text_ptr_to_line(var_stm_text, std_line);
-        if stm_lines.size = 0 then
-            stm_line_ptr := new t_stm_line;
-            stm_line_ptr.line_number := 0;
-            stm_line_ptr.line_content := std_line;
-            stm_line_ptr.line_type := STM_LINE_TEXT_TYPE;
-            stm_line_ptr.array_size := 0;
-            stm_line_ptr.next_stm_line := null;
-            stm_lines.stm_line_list := stm_line_ptr;
-            stm_lines.size := 1;
-        else
-            stm_line_ptr := stm_lines.stm_line_list;
-            while stm_line_ptr.next_stm_line /= null loop
-                stm_line_ptr := stm_line_ptr.next_stm_line;
-            end loop;
-            stm_next_line_ptr := new t_stm_line;
-            stm_next_line_ptr.line_number := stm_line_ptr.line_number + 1;
-            stm_next_line_ptr.line_content := std_line;
-            stm_next_line_ptr.line_type := STM_LINE_TEXT_TYPE;
-            stm_next_line_ptr.array_size := 0;
-            stm_next_line_ptr.next_stm_line := null;
-            stm_line_ptr.next_stm_line := stm_next_line_ptr;
-            stm_lines.size := stm_lines.size + 1;
-            valid := 1;
-        end if;
+        stm_lines_place(stm_lines, stm_lines.size, std_line, STM_LINE_TEXT_TYPE, 0);
         valid := 1;
     end procedure;
 
     procedure stm_lines_delete(variable stm_lines : inout t_stm_lines_ptr;
                                variable position : in integer;
                                variable valid : out integer) is
-        variable stm_line_ptr : t_stm_line_ptr;
-        variable stm_line_before : t_stm_line_ptr := null;
-        variable stm_line_after : t_stm_line_ptr := null;
     begin
         valid := 0;
-        stm_line_ptr := stm_lines.stm_line_list;
-        for i in 0 to stm_lines.size - 1 loop
-            if i = position then
-                stm_line_after := stm_line_ptr.next_stm_line;
-                if stm_line_before /= null and stm_line_after /= null then
-                    stm_line_before.next_stm_line := stm_line_after;
-                elsif stm_line_before = null and stm_line_after /= null then
-                    stm_lines.stm_line_list := stm_line_after;
-                elsif stm_line_before /= null and stm_line_after = null then
-                    stm_line_before.next_stm_line := null;
-                else
-                    stm_lines.stm_line_list := null;
-                end if;
-                deallocate(stm_line_ptr);
-                stm_lines.size := stm_lines.size - 1;
-                valid := 1;
-                exit;
-            end if;
-            stm_line_before := stm_line_ptr;
-            stm_line_ptr := stm_line_ptr.next_stm_line;
-        end loop;
-        stm_line_ptr := stm_lines.stm_line_list;
+        if position >= 0 and position < stm_lines.size then
+            deallocate(stm_lines.stm_line_list(position).line_content);
+            deallocate(stm_lines.stm_line_list(position));
+            for i in position to stm_lines.size - 2 loop
+                stm_lines.stm_line_list(i) := stm_lines.stm_line_list(i + 1);
+            end loop;
+            stm_lines.stm_line_list(stm_lines.size - 1) := null;
+            stm_lines.size := stm_lines.size - 1;
+            valid := 1;
+        end if;
+    end procedure;
+
+    procedure stm_lines_delete_all(variable stm_lines : inout t_stm_lines_ptr;
+                                   variable valid : out integer) is
+    begin
         for i in 0 to stm_lines.size - 1 loop
-            stm_line_ptr.line_number := i;
-            stm_line_ptr := stm_line_ptr.next_stm_line;
+            deallocate(stm_lines.stm_line_list(i).line_content);
+            deallocate(stm_lines.stm_line_list(i));
         end loop;
+        stm_lines.size := 0;
+        valid := 1;
     end procedure;
 
     procedure stm_lines_get(variable stm_lines : in t_stm_lines_ptr;
                             variable position : in integer;
                             variable std_line : out line;
                             variable valid : out integer) is
-        variable stm_line_ptr : t_stm_line_ptr;
     begin
         valid := 0;
-        stm_line_ptr := stm_lines.stm_line_list;
-        for i in 0 to stm_lines.size - 1 loop
-            if i = position then
-                std_line := new string'(stm_line_ptr.line_content.all);
-                valid := 1;
-                return;
-            end if;
-            stm_line_ptr := stm_line_ptr.next_stm_line;
-        end loop;
+        if position >= 0 and position < stm_lines.size then
+            std_line := new string'(stm_lines.stm_line_list(position).line_content.all);
+            valid := 1;
+        end if;
     end procedure;
 
     procedure stm_lines_get(variable stm_lines : in t_stm_lines_ptr;
@@ -1112,72 +1133,38 @@ package body tb_base_pkg is
                             variable number_found : out integer;
                             variable valid : out integer;
                             constant stm_value_width : in integer) is
-        variable stm_line_ptr : t_stm_line_ptr;
         variable value_std_logic_vector : std_logic_vector(stm_value_width - 1 downto 0);
         variable success : boolean := true;
         variable array_index : integer := 0;
         variable tmp_std_line : line;
     begin
         valid := 0;
-        stm_line_ptr := stm_lines.stm_line_list;
-        for i in 0 to stm_lines.size - 1 loop
-            if i = position then
-                tmp_std_line := new string'(stm_line_ptr.line_content.all);
-                while success loop
-                    hread(tmp_std_line, value_std_logic_vector, success);
-                    if success then
-                        stm_array(array_index) := unsigned(value_std_logic_vector);
-                        array_index := array_index + 1;
-                    end if;
-                end loop;
-                number_found := array_index;
-                valid := 1;
-                return;
-            end if;
-            stm_line_ptr := stm_line_ptr.next_stm_line;
-        end loop;
+        if position >= 0 and position < stm_lines.size then
+            tmp_std_line := new string'(stm_lines.stm_line_list(position).line_content.all);
+            while success loop
+                hread(tmp_std_line, value_std_logic_vector, success);
+                if success then
+                    stm_array(array_index) := unsigned(value_std_logic_vector);
+                    array_index := array_index + 1;
+                end if;
+            end loop;
+            number_found := array_index;
+            valid := 1;
+        end if;
     end procedure;
 
     procedure stm_lines_insert(variable stm_lines : inout t_stm_lines_ptr;
                                variable position : in integer;
                                variable var_stm_text : in stm_text_ptr;
                                variable valid : out integer) is
-        variable stm_line_ptr : t_stm_line_ptr;
         variable tmp_std_line : line;
-        variable stm_line_new : t_stm_line_ptr := new t_stm_line;
     begin
         valid := 0;
-        stm_line_ptr := stm_lines.stm_line_list;
-        for i in 0 to stm_lines.size - 1 loop
-            if i = position then
-                for j in 1 to var_stm_text'length loop
-                    if var_stm_text(j) /= nul then
-                        write(tmp_std_line, var_stm_text(j), left, 1);
-                    else
-                        exit;
-                    end if;
-                end loop;
-                -- copy current stm_line to new stmline object
-                stm_line_new.line_content := stm_line_ptr.line_content;
-                stm_line_new.line_type := stm_line_ptr.line_type;
-                stm_line_new.array_size := stm_line_ptr.array_size;
-                stm_line_new.next_stm_line := stm_line_ptr.next_stm_line;
-                -- set current stm_line to new content
-                stm_line_ptr.line_content := tmp_std_line;
-                stm_line_ptr.line_type := STM_LINE_TEXT_TYPE;
-                stm_line_ptr.array_size := 0;
-                stm_line_ptr.next_stm_line := stm_line_new;
-                stm_lines.size := stm_lines.size + 1;
-                valid := 1;
-                exit;
-            end if;
-            stm_line_ptr := stm_line_ptr.next_stm_line;
-        end loop;
-        stm_line_ptr := stm_lines.stm_line_list;
-        for i in 0 to stm_lines.size - 1 loop
-            stm_line_ptr.line_number := i;
-            stm_line_ptr := stm_line_ptr.next_stm_line;
-        end loop;
+        if position >= 0 and position < stm_lines.size then
+            stm_text_ptr_to_line(var_stm_text, tmp_std_line);
+            stm_lines_place(stm_lines, position, tmp_std_line, STM_LINE_TEXT_TYPE, 0);
+            valid := 1;
+        end if;
     end procedure;
 
     procedure stm_lines_insert(variable stm_lines : inout t_stm_lines_ptr;
@@ -1185,64 +1172,38 @@ package body tb_base_pkg is
                                variable stm_array : in t_stm_array_ptr;
                                variable valid : out integer;
                                constant stm_value_width : in integer) is
-        variable stm_line_ptr : t_stm_line_ptr;
         variable tmp_std_line : line;
-        variable stm_line_new : t_stm_line_ptr := new t_stm_line;
         variable value_std_logic_vector : std_logic_vector(stm_value_width - 1 downto 0);
     begin
         valid := 0;
-        stm_line_ptr := stm_lines.stm_line_list;
-        for i in 0 to stm_lines.size - 1 loop
-            if i = position then
-                for j in 0 to stm_array'length - 1 loop
-                    value_std_logic_vector := std_logic_vector(stm_array(j));
-                    hwrite(tmp_std_line, value_std_logic_vector, left, stm_value_width / 4 + 1);
-                end loop;
-                -- copy current stm_line to new stmline object
-                stm_line_new.line_content := stm_line_ptr.line_content;
-                stm_line_new.line_type := stm_line_ptr.line_type;
-                stm_line_new.array_size := stm_line_ptr.array_size;
-                stm_line_new.next_stm_line := stm_line_ptr.next_stm_line;
-                -- set current stm_line to new content
-                stm_line_ptr.line_content := tmp_std_line;
-                stm_line_ptr.line_type := STM_LINE_ARRAY_TYPE;
-                stm_line_ptr.array_size := stm_array'length;
-                stm_line_ptr.next_stm_line := stm_line_new;
-                stm_lines.size := stm_lines.size + 1;
-                valid := 1;
-                exit;
-            end if;
-            stm_line_ptr := stm_line_ptr.next_stm_line;
-        end loop;
-        stm_line_ptr := stm_lines.stm_line_list;
-        for i in 0 to stm_lines.size - 1 loop
-            stm_line_ptr.line_number := i;
-            stm_line_ptr := stm_line_ptr.next_stm_line;
-        end loop;
+        if position >= 0 and position < stm_lines.size then
+            for j in 0 to stm_array'length - 1 loop
+                value_std_logic_vector := std_logic_vector(stm_array(j));
+                hwrite(tmp_std_line, value_std_logic_vector, left, stm_value_width / 4 + 1);
+            end loop;
+            stm_lines_place(stm_lines, position, tmp_std_line, STM_LINE_ARRAY_TYPE, stm_array'length);
+            valid := 1;
+        end if;
     end procedure;
 
     procedure stm_lines_print(variable stm_lines : in t_stm_lines_ptr;
                               variable valid : out integer) is
-        variable std_line : line;
-        variable tmp_str_ptr : stm_text_ptr;
         variable stm_line_ptr : t_stm_line_ptr;
         variable tmp_std_line_print : line;
     begin
         valid := 0;
-        stm_line_ptr := stm_lines.stm_line_list;
-        while stm_line_ptr /= null loop
+        for i in 0 to stm_lines.size - 1 loop
+            stm_line_ptr := stm_lines.stm_line_list(i);
             if stm_line_ptr.line_type = STM_LINE_TEXT_TYPE then
-                std_line := stm_line_ptr.line_content;
-                tmp_str_ptr := new stm_text;
-                get_stm_text_ptr_from_line(std_line, tmp_str_ptr);
-                stm_text_ptr_to_line(tmp_str_ptr, std_line);
-                stm_line_ptr.line_content := std_line;
-                txt_print(tmp_str_ptr);
+                if stm_line_ptr.line_content /= null then
+                    print(stm_line_ptr.line_content.all);
+                else
+                    print("");
+                end if;
             elsif stm_line_ptr.line_type = STM_LINE_ARRAY_TYPE then
                 tmp_std_line_print := new string'(stm_line_ptr.line_content.all);
                 writeline(output, tmp_std_line_print);
             end if;
-            stm_line_ptr := stm_line_ptr.next_stm_line;
         end loop;
         valid := 1;
     end procedure;
@@ -1255,24 +1216,15 @@ package body tb_base_pkg is
         variable std_line : line;
     begin
         valid := 0;
-        stm_line_ptr := stm_lines.stm_line_list;
-        for i in 0 to stm_lines.size - 1 loop
-            if i = position then
-                for j in 1 to var_stm_text'length loop
-                    if var_stm_text(j) /= nul then
-                        write(std_line, var_stm_text(j), left, 1);
-                    else
-                        exit;
-                    end if;
-                end loop;
-                stm_line_ptr.line_content := std_line;
-                stm_line_ptr.line_type := STM_LINE_TEXT_TYPE;
-                stm_line_ptr.array_size := 0;
-                valid := 1;
-                return;
-            end if;
-            stm_line_ptr := stm_line_ptr.next_stm_line;
-        end loop;
+        if position >= 0 and position < stm_lines.size then
+            stm_line_ptr := stm_lines.stm_line_list(position);
+            stm_text_ptr_to_line(var_stm_text, std_line);
+            deallocate(stm_line_ptr.line_content);
+            stm_line_ptr.line_content := std_line;
+            stm_line_ptr.line_type := STM_LINE_TEXT_TYPE;
+            stm_line_ptr.array_size := 0;
+            valid := 1;
+        end if;
     end procedure;
 
     procedure stm_lines_set(variable stm_lines : inout t_stm_lines_ptr;
@@ -1285,32 +1237,31 @@ package body tb_base_pkg is
         variable value_std_logic_vector : std_logic_vector(stm_value_width - 1 downto 0);
     begin
         valid := 0;
-        stm_line_ptr := stm_lines.stm_line_list;
-        for i in 0 to stm_lines.size - 1 loop
-            if i = position then
-                for j in 0 to stm_array'length - 1 loop
-                    value_std_logic_vector := std_logic_vector(stm_array(j));
-                    hwrite(std_line, value_std_logic_vector, left, stm_value_width / 4 + 1);
-                end loop;
-                stm_line_ptr.line_content := std_line;
-                valid := 1;
-                return;
-            end if;
-            stm_line_ptr := stm_line_ptr.next_stm_line;
-        end loop;
+        if position >= 0 and position < stm_lines.size then
+            stm_line_ptr := stm_lines.stm_line_list(position);
+            for j in 0 to stm_array'length - 1 loop
+                value_std_logic_vector := std_logic_vector(stm_array(j));
+                hwrite(std_line, value_std_logic_vector, left, stm_value_width / 4 + 1);
+            end loop;
+            deallocate(stm_line_ptr.line_content);
+            stm_line_ptr.line_content := std_line;
+            valid := 1;
+        end if;
+    end procedure;
+
+    procedure new_stm_text_ptr(constant s : in string;
+                               variable ptr : out stm_text_ptr) is
+        variable tmp_ptr : stm_text_ptr;
+    begin
+        tmp_ptr := new string(1 to s'length);
+        tmp_ptr.all := s;
+        ptr := tmp_ptr;
     end procedure;
 
     procedure stm_text_copy_to_ptr(variable ptr : inout stm_text_ptr;
                                    variable txt_str : in stm_text) is
     begin
-        if ptr /= null then
-            for i in 1 to c_stm_text_len loop
-                if txt_str(i) = nul then
-                    exit;
-                end if;
-                ptr(i) := txt_str(i);
-            end loop;
-        end if;
+        new_stm_text_ptr(stm_text_crop(txt_str), ptr);
     end procedure;
 
     function stm_text_crop(txt : in stm_text) return string is
@@ -1331,16 +1282,12 @@ package body tb_base_pkg is
 
     procedure stm_text_ptr_to_line(variable var_stm_text : in stm_text_ptr;
                                    variable line_out : out line) is
-        variable std_line : line;
     begin
-        for j in 1 to var_stm_text'length loop
-            if var_stm_text(j) /= nul then
-                write(std_line, var_stm_text(j), left, 1);
-            else
-                exit;
-            end if;
-        end loop;
-        line_out := std_line;
+        if var_stm_text /= null then
+            line_out := new string'(var_stm_text.all);
+        else
+            line_out := new string'("");
+        end if;
     end procedure;
 
     procedure stm_text_ptr_truncate_trailing_quote(variable si : stm_text_ptr;
@@ -1348,8 +1295,11 @@ package body tb_base_pkg is
         variable i : integer := 1;
         variable o : integer := 1;
     begin
-        while si(i) /= nul and i /= max_str_len loop
-            if i + 1 /= max_str_len then
+        while i <= si'length and i /= max_str_len loop
+            if si(i) = nul then
+                exit;
+            end if;
+            if i + 1 <= si'length and i + 1 /= max_str_len then
                 if si(i + 1) /= nul then
                     if si(i) = '\' and si(i + 1) = '"' then -- "
                         -- skip '/' before '"'    "
@@ -1426,17 +1376,9 @@ package body tb_base_pkg is
     end function;
 
     procedure txt_print(variable ptr : in stm_text_ptr) is
-        variable txt_str : stm_text;
     begin
         if ptr /= null then
-            txt_str := (others => nul);
-            for i in 1 to c_stm_text_len loop
-                if (ptr(i) = nul) then
-                    exit;
-                end if;
-                txt_str(i) := ptr(i);
-            end loop;
-            print(txt_str);
+            print(ptr.all);
         end if;
     end procedure;
 
@@ -1447,12 +1389,7 @@ package body tb_base_pkg is
     begin
         ptr_temp := ptr;
         if ptr_temp /= null then
-            for i in 1 to c_stm_text_len loop
-                if txt_str(i) = nul then
-                    exit;
-                end if;
-                ptr_temp(i) := txt_str(i);
-            end loop;
+            new_stm_text_ptr(stm_text_crop(txt_str), ptr_temp);
         end if;
         ptr_o := ptr_temp;
     end procedure;
@@ -1463,8 +1400,8 @@ package body tb_base_pkg is
     begin
         txt_str := (others => nul);
         if ptr /= null then
-            for i in 1 to c_stm_text_len loop
-                if (ptr(i) = nul) then
+            for i in 1 to ptr'length loop
+                if (ptr(i) = nul) or (i > c_stm_text_len) then
                     exit;
                 end if;
                 txt_str(i) := ptr(i);
@@ -2,6 +2,7 @@ library ieee;
 use ieee.std_logic_1164.all;
 use ieee.numeric_std.all;
 use work.tb_base_pkg.all;
+use work.tb_bus_lanes_32_pkg.all;
 
 package tb_bus_avalon_32_pkg is
     type t_avalonmm_down_32 is record
@@ -43,6 +44,22 @@ package tb_bus_avalon_32_pkg is
                                variable access_width : in integer;
                                variable successfull : out boolean;
                                variable timeout : in time);
+
+    procedure write_avalonmm_32_array(signal avalonmm_down : out t_avalonmm_down_32;
+                                      signal avalonmm_up : in t_avalonmm_up_32;
+                                      variable address : in unsigned;
+                                      variable data : in t_stm_array_ptr;
+                                      variable access_width : in integer;
+                                      variable successfull : out boolean;
+                                      variable timeout : in time);
+
+    procedure read_avalonmm_32_array(signal avalonmm_down : out t_avalonmm_down_32;
+                                     signal avalonmm_up : in t_avalonmm_up_32;
+                                     variable address : in unsigned;
+                                     variable data : in t_stm_array_ptr;
+                                     variable access_width : in integer;
+                                     variable successfull : out boolean;
+                                     variable timeout : in time);
 end;
 
 package body tb_bus_avalon_32_pkg is
@@ -224,4 +241,101 @@ package body tb_bus_avalon_32_pkg is
         successfull := true;
     end procedure;
 
+    -- write stays asserted, the next element is driven at each clock edge that accepted the previous one
+    -- because waitrequest was deasserted
+    procedure write_avalonmm_32_array(signal avalonmm_down : out t_avalonmm_down_32;
+                                      signal avalonmm_up : in t_avalonmm_up_32;
+                                      variable address : in unsigned;
+                                      variable data : in t_stm_array_ptr;
+                                      variable access_width : in integer;
+                                      variable successfull : out boolean;
+                                      variable timeout : in time) is
+
+        variable element_address : unsigned(31 downto 0) := address(31 downto 0);
+        variable start_time : time := now;
+    begin
+        successfull := false;
+        wait until rising_edge(avalonmm_up.clk) or (now > start_time + timeout);
+        if now > start_time + timeout then
+            avalonmm_down <= avalonmm_down_32_init;
+            return;
+        end if;
+
+        for i in 0 to data'length - 1 loop
+            start_time := now;
+            avalonmm_down.address <= std_logic_vector(element_address);
+            avalonmm_down.byteenable <= bus_32_byte_enable(element_address, access_width);
+            avalonmm_down.writedata <= bus_32_write_data(element_address, data(i), access_width);
+            avalonmm_down.read <= '0';
+            avalonmm_down.write <= '1';
+
+            loop
+                wait until rising_edge(avalonmm_up.clk) or (now > start_time + timeout);
+                if now > start_time + timeout then
+                    avalonmm_down <= avalonmm_down_32_init;
+                    return;
+                end if;
+                if avalonmm_up.waitrequest = '0' then
+                    exit;
+                end if;
+            end loop;
+            element_address := element_address + access_width / 8;
+        end loop;
+
+        avalonmm_down <= avalonmm_down_32_init;
+        successfull := true;
+    end procedure;
+
+    -- read stays asserted, the readdata of an element is taken like in read_avalonmm_32 and the next
+    -- element is driven right after it
+    procedure read_avalonmm_32_array(signal avalonmm_down : out t_avalonmm_down_32;
+                                     signal avalonmm_up : in t_avalonmm_up_32;
+                                     variable address : in unsigned;
+                                     variable data : in t_stm_array_ptr;
+                                     variable access_width : in integer;
+                                     variable successfull : out boolean;
+                                     variable timeout : in time) is
+
+        variable element_address : unsigned(31 downto 0) := address(31 downto 0);
+        variable start_time : time := now;
+    begin
+        successfull := false;
+        wait until rising_edge(avalonmm_up.clk) or (now > start_time + timeout);
+        if now > start_time + timeout then
+            avalonmm_down <= avalonmm_down_32_init;
+            return;
+        end if;
+
+        for i in 0 to data'length - 1 loop
+            start_time := now;
+            avalonmm_down.address <= std_logic_vector(element_address);
+            avalonmm_down.byteenable <= bus_32_byte_enable(element_address, access_width);
+            avalonmm_down.writedata <= (others => '0');
+            avalonmm_down.read <= '1';
+            avalonmm_down.write <= '0';
+            wait until rising_edge(avalonmm_up.clk) or (now > start_time + timeout);
+            if now > start_time + timeout then
+                avalonmm_down <= avalonmm_down_32_init;
+                return;
+            end if;
+
+            loop
+                wait until rising_edge(avalonmm_up.clk) or (now > start_time + timeout);
+                if now > start_time + timeout then
+                    avalonmm_down <= avalonmm_down_32_init;
+                    return;
+                end if;
+                if avalonmm_up.waitrequest = '0' then
+                    exit;
+                end if;
+            end loop;
+            data(i) := to_unsigned(0, data(i)'length);
+            data(i)(31 downto 0) := bus_32_read_data(element_address, avalonmm_up.readdata, access_width);
+            element_address := element_address + access_width / 8;
+        end loop;
+
+        avalonmm_down <= avalonmm_down_32_init;
+        successfull := true;
+    end procedure;
+
 end package body;
@@ -2,6 +2,7 @@ library ieee;
 use ieee.std_logic_1164.all;
 use ieee.numeric_std.all;
 use work.tb_base_pkg.all;
+use work.tb_bus_lanes_32_pkg.all;
 
 package tb_bus_axi4lite_32_pkg is
     type t_axi4lite_down_32 is record
@@ -65,6 +66,24 @@ package tb_bus_axi4lite_32_pkg is
                                variable access_width : in integer;
                                variable successfull : out boolean;
                                variable timeout : in time);
+
+    procedure write_axi4lite_32_array(signal axi4lite_down : out t_axi4lite_down_32;
+                                      signal axi4lite_up : in t_axi4lite_up_32;
+                                      variable address : in unsigned;
+                                      variable data : in t_stm_array_ptr;
+                                      variable access_width : in integer;
+                                      variable outstanding : in integer;
+                                      variable successfull : out boolean;
+                                      variable timeout : in time);
+
+    procedure read_axi4lite_32_array(signal axi4lite_down : out t_axi4lite_down_32;
+                                     signal axi4lite_up : in t_axi4lite_up_32;
+                                     variable address : in unsigned;
+                                     variable data : in t_stm_array_ptr;
+                                     variable access_width : in integer;
+                                     variable outstanding : in integer;
+                                     variable successfull : out boolean;
+                                     variable timeout : in time);
 end;
 
 package body tb_bus_axi4lite_32_pkg is
@@ -261,4 +280,123 @@ package body tb_bus_axi4lite_32_pkg is
         successfull := true;
     end procedure;
 
+    -- the address and data channels of the next element are driven as soon as both channels of the
+    -- previous one were accepted, while up to outstanding write responses are pending
+    procedure write_axi4lite_32_array(signal axi4lite_down : out t_axi4lite_down_32;
+                                      signal axi4lite_up : in t_axi4lite_up_32;
+                                      variable address : in unsigned;
+                                      variable data : in t_stm_array_ptr;
+                                      variable access_width : in integer;
+                                      variable outstanding : in integer;
+                                      variable successfull : out boolean;
+                                      variable timeout : in time) is
+
+        variable element_address : unsigned(31 downto 0) := address(31 downto 0);
+        variable awvalid : boolean := false;
+        variable wvalid : boolean := false;
+        variable issued : integer := 0;
+        variable completed : integer := 0;
+        variable start_time : time := now;
+    begin
+        successfull := false;
+        wait until rising_edge(axi4lite_up.clk) or (now > start_time + timeout);
+        if now > start_time + timeout then
+            axi4lite_down <= axi4lite_down_32_init;
+            return;
+        end if;
+        axi4lite_down <= axi4lite_down_32_init;
+        axi4lite_down.bready <= '1';
+
+        while completed < data'length loop
+            if not awvalid and not wvalid and issued < data'length and issued - completed < outstanding then
+                axi4lite_down.awaddr <= std_logic_vector(element_address);
+                axi4lite_down.wstrb <= bus_32_byte_enable(element_address, access_width);
+                axi4lite_down.wdata <= bus_32_write_data(element_address, data(issued), access_width);
+                axi4lite_down.awvalid <= '1';
+                axi4lite_down.wvalid <= '1';
+                awvalid := true;
+                wvalid := true;
+                issued := issued + 1;
+                element_address := element_address + access_width / 8;
+            end if;
+            wait until rising_edge(axi4lite_up.clk) or (now > start_time + timeout);
+            if now > start_time + timeout then
+                axi4lite_down <= axi4lite_down_32_init;
+                return;
+            end if;
+            if awvalid and axi4lite_up.awready = '1' then
+                axi4lite_down.awvalid <= '0';
+                awvalid := false;
+            end if;
+            if wvalid and axi4lite_up.wready = '1' then
+                axi4lite_down.wvalid <= '0';
+                wvalid := false;
+            end if;
+            if completed < issued and axi4lite_up.bvalid = '1' then
+                completed := completed + 1;
+                start_time := now;
+            end if;
+        end loop;
+
+        axi4lite_down <= axi4lite_down_32_init;
+        successfull := true;
+    end procedure;
+
+    -- the read address of the next element is driven as soon as the previous one was accepted,
+    -- while up to outstanding read responses are pending
+    procedure read_axi4lite_32_array(signal axi4lite_down : out t_axi4lite_down_32;
+                                     signal axi4lite_up : in t_axi4lite_up_32;
+                                     variable address : in unsigned;
+                                     variable data : in t_stm_array_ptr;
+                                     variable access_width : in integer;
+                                     variable outstanding : in integer;
+                                     variable successfull : out boolean;
+                                     variable timeout : in time) is
+
+        variable element_address : unsigned(31 downto 0) := address(31 downto 0);
+        variable response_address : unsigned(31 downto 0) := address(31 downto 0);
+        variable arvalid : boolean := false;
+        variable issued : integer := 0;
+        variable completed : integer := 0;
+        variable start_time : time := now;
+    begin
+        successfull := false;
+        wait until rising_edge(axi4lite_up.clk) or (now > start_time + timeout);
+        if now > start_time + timeout then
+            axi4lite_down <= axi4lite_down_32_init;
+            return;
+        end if;
+        axi4lite_down <= axi4lite_down_32_init;
+        axi4lite_down.rready <= '1';
+
+        while completed < data'length loop
+            if not arvalid and issued < data'length and issued - completed < outstanding then
+                axi4lite_down.araddr <= std_logic_vector(element_address);
+                axi4lite_down.arvalid <= '1';
+                arvalid := true;
+                issued := issued + 1;
+                element_address := element_address + access_width / 8;
+            end if;
+            wait until rising_edge(axi4lite_up.clk) or (now > start_time + timeout);
+            if now > start_time + timeout then
+                axi4lite_down <= axi4lite_down_32_init;
+                return;
+            end if;
+            if arvalid and axi4lite_up.arready = '1' then
+                axi4lite_down.arvalid <= '0';
+                arvalid := false;
+            end if;
+            if completed < issued and axi4lite_up.rvalid = '1' then
+                data(completed) := to_unsigned(0, data(completed)'length);
+                data(completed)(31 downto 0) := bus_32_read_data(response_address, axi4lite_up.rdata, access_width);
+                completed := completed + 1;
+                response_address := response_address + access_width / 8;
+                start_time := now;
+            end if;
+        end loop;
+
+        axi4lite_down <= axi4lite_down_32_init;
+        successfull := true;
+    end procedure;
+
 end package body;
@@ -0,0 +1,64 @@
+library ieee;
+use ieee.std_logic_1164.all;
+use ieee.numeric_std.all;
+
+package tb_bus_lanes_32_pkg is
+
+    -- byte lanes of a 32 bit data bus addressed by the two low address bits,
+    -- shared by the 32 bit bus packages
+    function bus_32_byte_enable(address : unsigned; access_width : integer) return std_logic_vector;
+    function bus_32_write_data(address : unsigned; data : unsigned; access_width : integer) return std_logic_vector;
+    function bus_32_read_data(address : unsigned; read_data : std_logic_vector; access_width : integer) return unsigned;
+end;
+
+package body tb_bus_lanes_32_pkg is
+
+    function bus_32_byte_enable(address : unsigned; access_width : integer) return std_logic_vector is
+        variable byte_enable : std_logic_vector(3 downto 0);
+    begin
+        case access_width is
+            when 8 => byte_enable := "0001";
+            when 16 => byte_enable := "0011";
+            when others => byte_enable := "1111";
+        end case;
+        case address(1 downto 0) is
+            when "01" => return byte_enable(2 downto 0) & '0';
+            when "10" => return byte_enable(1 downto 0) & "00";
+            when "11" => return byte_enable(0) & "000";
+            when others => return byte_enable;
+        end case;
+    end;
+
+    function bus_32_write_data(address : unsigned; data : unsigned; access_width : integer) return std_logic_vector is
+        variable data_temp : std_logic_vector(31 downto 0);
+    begin
+        case access_width is
+            when 8 => data_temp := std_logic_vector(data(31 downto 0)) and x"000000FF";
+            when 16 => data_temp := std_logic_vector(data(31 downto 0)) and x"0000FFFF";
+            when others => data_temp := std_logic_vector(data(31 downto 0));
+        end case;
+        case address(1 downto 0) is
+            when "01" => return data_temp(23 downto 0) & x"00";
+            when "10" => return data_temp(15 downto 0) & x"0000";
+            when "11" => return data_temp(7 downto 0) & x"000000";
+            when others => return data_temp;
+        end case;
+    end;
+
+    function bus_32_read_data(address : unsigned; read_data : std_logic_vector; access_width : integer) return unsigned is
+        variable data_temp : std_logic_vector(31 downto 0);
+    begin
+        case address(1 downto 0) is
+            when "01" => data_temp := x"00" & read_data(31 downto 8);
+            when "10" => data_temp := x"0000" & read_data(31 downto 16);
+            when "11" => data_temp := x"000000" & read_data(31 downto 24);
+            when others => data_temp := read_data;
+        end case;
+        case access_width is
+            when 8 => return unsigned(data_temp and x"000000FF");
+            when 16 => return unsigned(data_temp and x"0000FFFF");
+            when others => return unsigned(data_temp);
+        end case;
+    end;
+
+end package body;
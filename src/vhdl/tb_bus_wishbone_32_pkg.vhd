@@ -2,6 +2,7 @@ library ieee;
 use ieee.std_logic_1164.all;
 use ieee.numeric_std.all;
 use work.tb_base_pkg.all;
+use work.tb_bus_lanes_32_pkg.all;
 
 package tb_bus_wishbone_32_pkg is
 
@@ -45,6 +46,22 @@ package tb_bus_wishbone_32_pkg is
                                variable access_width : in integer;
                                variable successfull : out boolean;
                                variable timeout : in time);
+
+    procedure write_wishbone_32_array(signal wishbone_down : out t_wishbone_down_32;
+                                      signal wishbone_up : in t_wishbone_up_32;
+                                      variable address : in unsigned;
+                                      variable data : in t_stm_array_ptr;
+                                      variable access_width : in integer;
+                                      variable successfull : out boolean;
+                                      variable timeout : in time);
+
+    procedure read_wishbone_32_array(signal wishbone_down : out t_wishbone_down_32;
+                                     signal wishbone_up : in t_wishbone_up_32;
+                                     variable address : in unsigned;
+                                     variable data : in t_stm_array_ptr;
+                                     variable access_width : in integer;
+                                     variable successfull : out boolean;
+                                     variable timeout : in time);
 end;
 
 package body tb_bus_wishbone_32_pkg is
@@ -223,4 +240,106 @@ package body tb_bus_wishbone_32_pkg is
         successfull := true;
     end procedure;
 
+    -- one block cycle, cyc stays asserted and the next element is driven right after the ack of the
+    -- previous one
+    procedure write_wishbone_32_array(signal wishbone_down : out t_wishbone_down_32;
+                                      signal wishbone_up : in t_wishbone_up_32;
+                                      variable address : in unsigned;
+                                      variable data : in t_stm_array_ptr;
+                                      variable access_width : in integer;
+                                      variable successfull : out boolean;
+                                      variable timeout : in time) is
+
+        variable element_address : unsigned(31 downto 0) := address(31 downto 0);
+        variable start_time : time := now;
+    begin
+        successfull := false;
+        wait until rising_edge(wishbone_up.clk) or (now > start_time + timeout);
+        if now > start_time + timeout then
+            wishbone_down <= wishbone_down_32_init;
+            return;
+        end if;
+
+        for i in 0 to data'length - 1 loop
+            start_time := now;
+            wishbone_down.adr <= std_logic_vector(element_address);
+            wishbone_down.sel <= bus_32_byte_enable(element_address, access_width);
+            wishbone_down.data <= bus_32_write_data(element_address, data(i), access_width);
+            wishbone_down.we <= '1';
+            wishbone_down.stb <= '1';
+            wishbone_down.cyc <= '1';
+            wait until rising_edge(wishbone_up.clk) or (now > start_time + timeout);
+            if now > start_time + timeout then
+                wishbone_down <= wishbone_down_32_init;
+                return;
+            end if;
+
+            loop
+                wait until rising_edge(wishbone_up.clk) or (now > start_time + timeout);
+                if now > start_time + timeout then
+                    wishbone_down <= wishbone_down_32_init;
+                    return;
+                end if;
+                if wishbone_up.ack then
+                    exit;
+                end if;
+            end loop;
+            element_address := element_address + access_width / 8;
+        end loop;
+
+        wishbone_down <= wishbone_down_32_init;
+        successfull := true;
+    end procedure;
+
+    procedure read_wishbone_32_array(signal wishbone_down : out t_wishbone_down_32;
+                                     signal wishbone_up : in t_wishbone_up_32;
+                                     variable address : in unsigned;
+                                     variable data : in t_stm_array_ptr;
+                                     variable access_width : in integer;
+                                     variable successfull : out boolean;
+                                     variable timeout : in time) is
+
+        variable element_address : unsigned(31 downto 0) := address(31 downto 0);
+        variable start_time : time := now;
+    begin
+        successfull := false;
+        wait until rising_edge(wishbone_up.clk) or (now > start_time + timeout);
+        if now > start_time + timeout then
+            wishbone_down <= wishbone_down_32_init;
+            return;
+        end if;
+
+        for i in 0 to data'length - 1 loop
+            start_time := now;
+            wishbone_down.adr <= std_logic_vector(element_address);
+            wishbone_down.sel <= bus_32_byte_enable(element_address, access_width);
+            wishbone_down.data <= (others => '0');
+            wishbone_down.we <= '0';
+            wishbone_down.stb <= '1';
+            wishbone_down.cyc <= '1';
+            wait until rising_edge(wishbone_up.clk) or (now > start_time + timeout);
+            if now > start_time + timeout then
+                wishbone_down <= wishbone_down_32_init;
+                return;
+            end if;
+
+            loop
+                wait until rising_edge(wishbone_up.clk) or (now > start_time + timeout);
+                if now > start_time + timeout then
+                    wishbone_down <= wishbone_down_32_init;
+                    return;
+                end if;
+                if wishbone_up.ack then
+                    exit;
+                end if;
+            end loop;
+            data(i) := to_unsigned(0, data(i)'length);
+            data(i)(31 downto 0) := bus_32_read_data(element_address, wishbone_up.data, access_width);
+            element_address := element_address + access_width / 8;
+        end loop;
+
+        wishbone_down <= wishbone_down_32_init;
+        successfull := true;
+    end procedure;
+
 end package body;
@@ -94,8 +94,13 @@ package tb_instructions_pkg is
     constant INSTR_BUS_READ : string := "bus_read";
     constant INSTR_BUS_VERIFY : string := "bus_verify";
     constant INSTR_BUS_WRITE : string := "bus_write";
+    constant INSTR_BUS_READ_ARRAY : string := "bus_read_array";
+    constant INSTR_BUS_VERIFY_ARRAY : string := "bus_verify_array";
+    constant INSTR_BUS_WRITE_ARRAY : string := "bus_write_array";
     constant INSTR_BUS_TIMEOUT_SET : string := "bus_timeout_set";
     constant INSTR_BUS_TIMEOUT_GET : string := "bus_timeout_get";
+    constant INSTR_BUS_OUTSTANDING_SET : string := "bus_outstanding_set";
+    constant INSTR_BUS_OUTSTANDING_GET : string := "bus_outstanding_get";
     constant INSTR_BUS_POINTER_COPY : string := "bus_pointer_copy";
     constant INSTR_BUS_POINTER_SET : string := "bus_pointer_set";
     constant INSTR_BUS_POINTER_GET : string := "bus_pointer_get";
@@ -108,6 +113,7 @@ package tb_instructions_pkg is
     constant INSTR_FILE_READ : string := "file_read";
     constant INSTR_FILE_READ_END : string := "file_read_end";
     constant INSTR_FILE_READ_ALL : string := "file_read_all";
+    constant INSTR_FILE_READ_ARRAY : string := "file_read_array";
     constant INSTR_FILE_WRITE : string := "file_write";
     constant INSTR_FILE_APPEND : string := "file_append";
     constant INSTR_FILE_POINTER_COPY : string := "file_pointer_copy";
@@ -188,6 +194,9 @@ package tb_instructions_pkg is
                                variable line_num : in integer;
                                variable name : in text_line);
 
+    --  opcode of an instruction, the text compare is done once when the stimulus is loaded
+    function instruction_opcode(inst : in text_field) return t_stm_opcode;
+
 end package;
 
 package body tb_instructions_pkg is
@@ -234,8 +243,13 @@ package body tb_instructions_pkg is
         define_instruction(inst_list, INSTR_BUS_READ, 4);
         define_instruction(inst_list, INSTR_BUS_VERIFY, 6);
         define_instruction(inst_list, INSTR_BUS_WRITE, 4);
+        define_instruction(inst_list, INSTR_BUS_READ_ARRAY, 4);
+        define_instruction(inst_list, INSTR_BUS_VERIFY_ARRAY, 6);
+        define_instruction(inst_list, INSTR_BUS_WRITE_ARRAY, 4);
         define_instruction(inst_list, INSTR_BUS_TIMEOUT_SET, 2);
         define_instruction(inst_list, INSTR_BUS_TIMEOUT_GET, 2);
+        define_instruction(inst_list, INSTR_BUS_OUTSTANDING_SET, 2);
+        define_instruction(inst_list, INSTR_BUS_OUTSTANDING_GET, 2);
         define_instruction(inst_list, INSTR_BUS_POINTER_COPY, 2);
         define_instruction(inst_list, INSTR_BUS_POINTER_SET, 2);
         define_instruction(inst_list, INSTR_BUS_POINTER_GET, 2);
@@ -247,6 +261,7 @@ package body tb_instructions_pkg is
         define_instruction(inst_list, INSTR_FILE_READ, 3);
         define_instruction(inst_list, INSTR_FILE_READ_END, 1);
         define_instruction(inst_list, INSTR_FILE_READ_ALL, 2);
+        define_instruction(inst_list, INSTR_FILE_READ_ARRAY, 3);
         define_instruction(inst_list, INSTR_FILE_WRITE, 2);
         define_instruction(inst_list, INSTR_FILE_APPEND, 2);
         define_instruction(inst_list, INSTR_FILE_POINTER_COPY, 2);
@@ -363,6 +378,9 @@ package body tb_instructions_pkg is
                     elsif token3(1 to 3) = "all" then
                         token3_len := 3;
                         token_merge := 3;
+                    elsif token3(1 to 5) = "array" then
+                        token3_len := 5;
+                        token_merge := 3;
                     end if;
                 elsif token2(1 to 7) = "pointer" then
                     token2_len := 7;
@@ -493,12 +511,24 @@ package body tb_instructions_pkg is
                 if token2(1 to 6) = "verify" then
                     token2_len := 6;
                     token_merge := 2;
+                    if token3(1 to 5) = "array" then
+                        token3_len := 5;
+                        token_merge := 3;
+                    end if;
                 elsif token2(1 to 4) = "read" then
                     token2_len := 4;
                     token_merge := 2;
+                    if token3(1 to 5) = "array" then
+                        token3_len := 5;
+                        token_merge := 3;
+                    end if;
                 elsif token2(1 to 5) = "write" then
                     token2_len := 5;
                     token_merge := 2;
+                    if token3(1 to 5) = "array" then
+                        token3_len := 5;
+                        token_merge := 3;
+                    end if;
                 elsif token2(1 to 7) = "timeout" then
                     token2_len := 7;
                     token_merge := 2;
@@ -509,6 +539,16 @@ package body tb_instructions_pkg is
                         token3_len := 3;
                         token_merge := 3;
                     end if;
+                elsif token2(1 to 11) = "outstanding" then
+                    token2_len := 11;
+                    token_merge := 2;
+                    if token3(1 to 3) = "set" then
+                        token3_len := 3;
+                        token_merge := 3;
+                    elsif token3(1 to 3) = "get" then
+                        token3_len := 3;
+                        token_merge := 3;
+                    end if;
                 elsif token2(1 to 7) = "pointer" then
                     token2_len := 7;
                     token_merge := 2;
@@ -673,4 +713,191 @@ package body tb_instructions_pkg is
         severity failure;
     end procedure;
 
+    function instruction_opcode(inst : in text_field) return t_stm_opcode is
+        constant l : integer := fld_len(inst);
+    begin
+        if inst(1 to l) = INSTR_ABORT then
+            return OP_ABORT;
+        elsif inst(1 to l) = INSTR_CONST then
+            return OP_CONST;
+        elsif inst(1 to l) = INSTR_ELSE then
+            return OP_ELSE;
+        elsif inst(1 to l) = INSTR_ELSIF then
+            return OP_ELSIF;
+        elsif inst(1 to l) = INSTR_END_IF then
+            return OP_END_IF;
+        elsif inst(1 to l) = INSTR_END_LOOP then
+            return OP_END_LOOP;
+        elsif inst(1 to l) = INSTR_FINISH then
+            return OP_FINISH;
+        elsif inst(1 to l) = INSTR_IF then
+            return OP_IF;
+        elsif inst(1 to l) = INSTR_INCLUDE then
+            return OP_INCLUDE;
+        elsif inst(1 to l) = INSTR_LOOP then
+            return OP_LOOP;
+        elsif inst(1 to l) = INSTR_VAR then
+            return OP_VAR;
+        elsif inst(1 to l) = INSTR_ADD then
+            return OP_ADD;
+        elsif inst(1 to l) = INSTR_AND then
+            return OP_AND;
+        elsif inst(1 to l) = INSTR_DIV then
+            return OP_DIV;
+        elsif inst(1 to l) = INSTR_REM then
+            return OP_REM;
+        elsif inst(1 to l) = INSTR_EQU then
+            return OP_EQU;
+        elsif inst(1 to l) = INSTR_MUL then
+            return OP_MUL;
+        elsif inst(1 to l) = INSTR_SHL then
+            return OP_SHL;
+        elsif inst(1 to l) = INSTR_SHR then
+            return OP_SHR;
+        elsif inst(1 to l) = INSTR_INV then
+            return OP_INV;
+        elsif inst(1 to l) = INSTR_OR then
+            return OP_OR;
+        elsif inst(1 to l) = INSTR_SUB then
+            return OP_SUB;
+        elsif inst(1 to l) = INSTR_XOR then
+            return OP_XOR;
+        elsif inst(1 to l) = INSTR_LD then
+            return OP_LD;
+        elsif inst(1 to l) = INSTR_VAR_VERIFY then
+            return OP_VAR_VERIFY;
+        elsif inst(1 to l) = INSTR_SIGNAL then
+            return OP_SIGNAL;
+        elsif inst(1 to l) = INSTR_SIGNAL_READ then
+            return OP_SIGNAL_READ;
+        elsif inst(1 to l) = INSTR_SIGNAL_VERIFY then
+            return OP_SIGNAL_VERIFY;
+        elsif inst(1 to l) = INSTR_SIGNAL_WRITE then
+            return OP_SIGNAL_WRITE;
+        elsif inst(1 to l) = INSTR_SIGNAL_POINTER_COPY then
+            return OP_SIGNAL_POINTER_COPY;
+        elsif inst(1 to l) = INSTR_SIGNAL_POINTER_SET then
+            return OP_SIGNAL_POINTER_SET;
+        elsif inst(1 to l) = INSTR_SIGNAL_POINTER_GET then
+            return OP_SIGNAL_POINTER_GET;
+        elsif inst(1 to l) = INSTR_BUS then
+            return OP_BUS;
+        elsif inst(1 to l) = INSTR_BUS_READ then
+            return OP_BUS_READ;
+        elsif inst(1 to l) = INSTR_BUS_VERIFY then
+            return OP_BUS_VERIFY;
+        elsif inst(1 to l) = INSTR_BUS_WRITE then
+            return OP_BUS_WRITE;
+        elsif inst(1 to l) = INSTR_BUS_READ_ARRAY then
+            return OP_BUS_READ_ARRAY;
+        elsif inst(1 to l) = INSTR_BUS_VERIFY_ARRAY then
+            return OP_BUS_VERIFY_ARRAY;
+        elsif inst(1 to l) = INSTR_BUS_WRITE_ARRAY then
+            return OP_BUS_WRITE_ARRAY;
+        elsif inst(1 to l) = INSTR_BUS_TIMEOUT_SET then
+            return OP_BUS_TIMEOUT_SET;
+        elsif inst(1 to l) = INSTR_BUS_TIMEOUT_GET then
+            return OP_BUS_TIMEOUT_GET;
+        elsif inst(1 to l) = INSTR_BUS_OUTSTANDING_SET then
+            return OP_BUS_OUTSTANDING_SET;
+        elsif inst(1 to l) = INSTR_BUS_OUTSTANDING_GET then
+            return OP_BUS_OUTSTANDING_GET;
+        elsif inst(1 to l) = INSTR_BUS_POINTER_COPY then
+            return OP_BUS_POINTER_COPY;
+        elsif inst(1 to l) = INSTR_BUS_POINTER_SET then
+            return OP_BUS_POINTER_SET;
+        elsif inst(1 to l) = INSTR_BUS_POINTER_GET then
+            return OP_BUS_POINTER_GET;
+        elsif inst(1 to l) = INSTR_FILE then
+            return OP_FILE;
+        elsif inst(1 to l) = INSTR_FILE_READABLE then
+            return OP_FILE_READABLE;
+        elsif inst(1 to l) = INSTR_FILE_WRITEABLE then
+            return OP_FILE_WRITEABLE;
+        elsif inst(1 to l) = INSTR_FILE_APPENDABLE then
+            return OP_FILE_APPENDABLE;
+        elsif inst(1 to l) = INSTR_FILE_READ then
+            return OP_FILE_READ;
+        elsif inst(1 to l) = INSTR_FILE_READ_END then
+            return OP_FILE_READ_END;
+        elsif inst(1 to l) = INSTR_FILE_READ_ALL then
+            return OP_FILE_READ_ALL;
+        elsif inst(1 to l) = INSTR_FILE_READ_ARRAY then
+            return OP_FILE_READ_ARRAY;
+        elsif inst(1 to l) = INSTR_FILE_WRITE then
+            return OP_FILE_WRITE;
+        elsif inst(1 to l) = INSTR_FILE_APPEND then
+            return OP_FILE_APPEND;
+        elsif inst(1 to l) = INSTR_FILE_POINTER_COPY then
+            return OP_FILE_POINTER_COPY;
+        elsif inst(1 to l) = INSTR_LINES then
+            return OP_LINES;
+        elsif inst(1 to l) = INSTR_LINES_GET_ARRAY then
+            return OP_LINES_GET_ARRAY;
+        elsif inst(1 to l) = INSTR_LINES_SET_ARRAY then
+            return OP_LINES_SET_ARRAY;
+        elsif inst(1 to l) = INSTR_LINES_SET_MESSAGE then
+            return OP_LINES_SET_MESSAGE;
+        elsif inst(1 to l) = INSTR_LINES_DELETE then
+            return OP_LINES_DELETE;
+        elsif inst(1 to l) = INSTR_LINES_DELETE_ALL then
+            return OP_LINES_DELETE_ALL;
+        elsif inst(1 to l) = INSTR_LINES_INSERT_ARRAY then
+            return OP_LINES_INSERT_ARRAY;
+        elsif inst(1 to l) = INSTR_LINES_INSERT_MESSAGE then
+            return OP_LINES_INSERT_MESSAGE;
+        elsif inst(1 to l) = INSTR_LINES_APPEND_ARRAY then
+            return OP_LINES_APPEND_ARRAY;
+        elsif inst(1 to l) = INSTR_LINES_APPEND_MESSAGE then
+            return OP_LINES_APPEND_MESSAGE;
+        elsif inst(1 to l) = INSTR_LINES_SIZE then
+            return OP_LINES_SIZE;
+        elsif inst(1 to l) = INSTR_LINES_POINTER_COPY then
+            return OP_LINES_POINTER_COPY;
+        elsif inst(1 to l) = INSTR_ARRAY then
+            return OP_ARRAY;
+        elsif inst(1 to l) = INSTR_ARRAY_GET then
+            return OP_ARRAY_GET;
+        elsif inst(1 to l) = INSTR_ARRAY_SET then
+            return OP_ARRAY_SET;
+        elsif inst(1 to l) = INSTR_ARRAY_SIZE then
+            return OP_ARRAY_SIZE;
+        elsif inst(1 to l) = INSTR_ARRAY_POINTER_COPY then
+            return OP_ARRAY_POINTER_COPY;
+        elsif inst(1 to l) = INSTR_ARRAY_VERIFY then
+            return OP_ARRAY_VERIFY;
+        elsif inst(1 to l) = INSTR_PROC then
+            return OP_PROC;
+        elsif inst(1 to l) = INSTR_CALL then
+            return OP_CALL;
+        elsif inst(1 to l) = INSTR_INTERRUPT then
+            return OP_INTERRUPT;
+        elsif inst(1 to l) = INSTR_END_PROC then
+            return OP_END_PROC;
+        elsif inst(1 to l) = INSTR_END_INTERRUPT then
+            return OP_END_INTERRUPT;
+        elsif inst(1 to l) = INSTR_RANDOM then
+            return OP_RANDOM;
+        elsif inst(1 to l) = INSTR_LOG_MESSAGE then
+            return OP_LOG_MESSAGE;
+        elsif inst(1 to l) = INSTR_LOG_LINES then
+            return OP_LOG_LINES;
+        elsif inst(1 to l) = INSTR_RETURN then
+            return OP_RETURN;
+        elsif inst(1 to l) = INSTR_RESUME then
+            return OP_RESUME;
+        elsif inst(1 to l) = INSTR_MARKER then
+            return OP_MARKER;
+        elsif inst(1 to l) = INSTR_VERBOSITY then
+            return OP_VERBOSITY;
+        elsif inst(1 to l) = INSTR_SEED then
+            return OP_SEED;
+        elsif inst(1 to l) = INSTR_TRACE then
+            return OP_TRACE;
+        elsif inst(1 to l) = INSTR_WAIT then
+            return OP_WAIT;
+        end if;
+        return OP_NONE;
+    end function;
+
 end package body;
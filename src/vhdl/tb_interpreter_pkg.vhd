@@ -50,6 +50,15 @@ use work.tb_instructions_pkg.all;
 
 package tb_interpreter_pkg is
 
+    -- first line of a stimulus file pre-compiled by compile-stimulus-file.py
+    constant c_compiled_stimulus_header : string := "-- simstm compiled 1";
+
+    -- number of name hash buckets of the variable list
+    constant c_var_hash_buckets : integer := 1024;
+
+    -- number of hash buckets of the string pool of the instruction sequence
+    constant c_string_pool_buckets : integer := 4096;
+
     --  add_instruction
     --    this is the procedure that adds the instruction to the linked list of
     --    instructions.  also variable addition are called and or handled.
@@ -63,7 +72,7 @@ package tb_interpreter_pkg is
     --               p4                   paramitor one, corrisponds to field four of stimulus
     --               p5                   paramitor one, corrisponds to field three of stimulus
     --               p6                   paramitor one, corrisponds to field four of stimulus
-    --               str_ptr              pointer to string for print instruction
+    --               str_ptr              pointer to string for print instruction, replaced by an equal pooled one
     --               txt_enclosing_quote  enclosing quote of text string of this sequence
     --               token_num            the number of tokens, including instruction
     --               sequ_num             is the stimulus file line referance  ie program line number
@@ -79,7 +88,7 @@ package tb_interpreter_pkg is
                               variable p4 : in text_field;
                               variable p5 : in text_field;
                               variable p6 : in text_field;
-                              variable str_ptr : in stm_text_ptr;
+                              variable str_ptr : inout stm_text_ptr;
                               variable txt_enclosing_quote : in character;
                               variable sequ_num : inout integer;
                               variable line_num : in integer;
@@ -127,7 +136,9 @@ package tb_interpreter_pkg is
     --            file_list  link list of file names
     --            sequ_num   the sequence number to recover
     --
-    --  outputs:  inst                 instruction text
+    --  outputs:  inst_ptr             record of the instruction, its text and file name
+    --                                 are only read where a trace or a report needs them
+    --            opcode               opcode of the instruction
     --            p1                   parameter 1 in unsigned form
     --            p2                   parameter 2 in unsigned form
     --            p3                   parameter 3 in unsigned form
@@ -136,15 +147,14 @@ package tb_interpreter_pkg is
     --            p6                   parameter 6 in unsigned form
     --            txt                  pointer to any text string of this sequence
     --            txt_enclosing_quote  enclosing quote of text string of this sequence
-    --            inst_len             the lenth of inst in characters
-    --            fname                file name this sequence came from
-    --            file_line            the line number in fname this sequence came from
+    --            file_line            the line number in the file this sequence came from
     --
     procedure access_inst_sequ(variable inst_sequ : in stim_line_ptr;
                                variable var_list : in var_field_ptr;
                                variable file_list : in file_def_ptr;
                                variable sequ_num : in integer;
-                               variable inst : out text_field;
+                               variable inst_ptr : out stim_line_ptr;
+                               variable opcode : out t_stm_opcode;
                                variable p1 : out unsigned;
                                variable p2 : out unsigned;
                                variable p3 : out unsigned;
@@ -153,11 +163,7 @@ package tb_interpreter_pkg is
                                variable p6 : out unsigned;
                                variable txt : out stm_text_ptr;
                                variable txt_enclosing_quote : out character;
-                               variable inst_len : out integer;
-                               variable fname : out text_line;
-                               variable file_line : out integer;
-                               variable last_num : inout integer;
-                               variable last_ptr : inout stim_line_ptr);
+                               variable file_line : out integer);
 
     -- dump inst_sequ
     --  this procedure dumps to the simulation window the current instruction
@@ -248,9 +254,50 @@ package tb_interpreter_pkg is
     -- procedure to print instruction records to stdout  *for debug*
     procedure print_inst(variable inst_sequ : in stim_line_ptr; v_line : in integer; file_list : inout file_def_ptr);
 
+    -- procedure to get the record of sequence number sequ_num from the line index of the instruction list
+    procedure get_inst_sequ_line(variable inst_sequ : in stim_line_ptr; sequ_num : in integer; variable inst_ptr : out stim_line_ptr);
+
+    -- index_inst_sequ
+    --  this procedure builds the line index of a loaded instruction list, afterwards
+    --  any instruction is fetched by its sequence number without walking the list.
+    procedure index_inst_sequ(variable inst_sequ : inout stim_line_ptr);
+
+    -- profile_enter
+    --  charges the time since profile_time to profile_node, then makes the node called with
+    --  called_label beneath it the current node and counts the call, the node is created on
+    --  its first call.  a null profile_node gets the root node.
+    procedure profile_enter(variable profile_node : inout t_stm_profile_node_ptr;
+                            variable profile_time : inout time;
+                            variable called_label : in text_field;
+                            variable called_file : in text_line);
+
+    -- profile_leave
+    --  charges the time since profile_time to profile_node and makes its parent the current
+    --  node, the root node stays current.
+    procedure profile_leave(variable profile_node : inout t_stm_profile_node_ptr;
+                            variable profile_time : inout time);
+
+    -- profile_write
+    --  writes the opcode counts and the nodes of the tree profile_node belongs to, the
+    --  nodes are written depth first with the number of their parent node.
+    procedure profile_write(constant file_name : in string;
+                            variable profile_node : in t_stm_profile_node_ptr;
+                            variable opcode_counts : in t_stm_profile_opcode_counts);
+
     -- procedure to get parameter 1 instruction text which is the called label in case of a call instrucution
     procedure get_inst_field_1(variable inst_sequ : in stim_line_ptr; v_line : in integer; inst_field_1 : out text_field);
 
+    -- read_compiled_instruction_file
+    --  this procedure loads a stimulus file pre-compiled by compile-stimulus-file.py.
+    --  includes are already resolved, the lines are tokenized, validated and numbered,
+    --  so every line of the file is one record passed to add_instruction.
+    procedure read_compiled_instruction_file(constant path_name : string;
+                                             constant file_name : string;
+                                             variable var_list : inout var_field_ptr;
+                                             variable inst_sequ : inout stim_line_ptr;
+                                             variable file_list : inout file_def_ptr;
+                                             constant stm_value_width : in integer);
+
     procedure read_include_file(constant path_name : string;
                                 variable name : text_line;
                                 variable sequ_numb : inout integer;
@@ -275,6 +322,15 @@ package tb_interpreter_pkg is
                                     variable file_list : inout file_def_ptr;
                                     constant stm_value_width : in integer);
 
+    -- resolve_inst_sequ
+    --  this procedure binds the operands of all loaded instructions once.  literals,
+    --  comparators and variable indexes become values, $ variables a reference to
+    --  the variable record whose value access_inst_sequ reads when executing.
+    procedure resolve_inst_sequ(variable inst_sequ : in stim_line_ptr;
+                                variable var_list : in var_field_ptr;
+                                variable file_list : in file_def_ptr;
+                                constant stm_value_width : in integer);
+
     procedure stm_text_substitude_wvar(variable var_list : in var_field_ptr;
                                        variable ptr : in stm_text_ptr;
                                        variable txt_enclosing_quote : in character;
@@ -282,14 +338,9 @@ package tb_interpreter_pkg is
                                        variable stack_called_files : stack_text_line_array;
                                        variable stack_called_file_line_numbers : stack_numbers_array;
                                        variable stack_called_labels : stack_text_field_array;
-                                       variable stm_text_substituded : out stm_text;
+                                       variable stm_text_substituded : out stm_text_ptr;
                                        constant stm_value_width : in integer);
 
-    procedure test_inst_sequ(variable inst_sequ : in stim_line_ptr;
-                             variable file_list : in file_def_ptr;
-                             variable var_list : in var_field_ptr;
-                             constant stm_value_width : in integer);
-
     --  tokenize_line
     --    this procedure takes a type text_line in and returns up to 6
     --    tokens and the count in integer valid, as well if text string
@@ -51,6 +51,144 @@ use work.tb_base_pkg.all;
 
 package body tb_interpreter_pkg is
 
+    function var_name_hash(name : in text_field) return integer is
+        variable h : integer := 0;
+    begin
+        for i in 1 to fld_len(name) loop
+            h := (h * 31 + character'pos(name(i))) mod 16777213;
+        end loop;
+        return h mod c_var_hash_buckets;
+    end function;
+
+    -- look up a variable by name in the hash buckets kept in the first record of the list
+    procedure find_variable(variable var_list : in var_field_ptr;
+                            variable name : in text_field;
+                            variable var_ptr : out var_field_ptr) is
+        variable ptr : var_field_ptr;
+    begin
+        ptr := var_list.var_buckets(var_name_hash(name));
+        while ptr /= null loop
+            if fld_equal(name, ptr.var_name) then
+                exit;
+            end if;
+            ptr := ptr.hash_next;
+        end loop;
+        var_ptr := ptr;
+    end procedure;
+
+    -- look up a variable by its index in the index table kept in the first record of the list
+    procedure find_variable(variable var_list : in var_field_ptr;
+                            variable index : in integer;
+                            variable var_ptr : out var_field_ptr) is
+    begin
+        var_ptr := null;
+        if var_list /= null then
+            if index >= 1 and index <= var_list.last_rec.var_index then
+                var_ptr := var_list.var_indexes(index);
+            end if;
+        end if;
+    end procedure;
+
+    -- write a profile node and, behind it, the nodes of its children, id counts the written nodes
+    procedure profile_write_node(file profile_file : text;
+                                 variable node : in t_stm_profile_node_ptr;
+                                 constant parent_id : in integer;
+                                 variable id : inout integer) is
+        variable l : line;
+        variable node_id : integer;
+        variable child : t_stm_profile_node_ptr;
+    begin
+        id := id + 1;
+        node_id := id;
+        write(l, string'("node "));
+        write(l, node_id);
+        write(l, ' ');
+        write(l, parent_id);
+        write(l, ' ');
+        write(l, node.calls);
+        write(l, ' ');
+        write(l, node.instructions);
+        write(l, ' ');
+        write(l, node.self_time, left, 0, ps);
+        write(l, ' ');
+        write(l, node.called_label(1 to fld_len(node.called_label)));
+        write(l, ' ');
+        write(l, text_line_crop(node.called_file));
+        writeline(profile_file, l);
+        child := node.first_child;
+        while child /= null loop
+            profile_write_node(profile_file, child, node_id, id);
+            child := child.next_sibling;
+        end loop;
+    end procedure;
+
+    function string_hash(s : in string) return integer is
+        variable h : integer := 0;
+    begin
+        for i in s'range loop
+            h := (h * 31 + character'pos(s(i))) mod 16777213;
+        end loop;
+        return h mod c_string_pool_buckets;
+    end function;
+
+    -- get the pooled copy of a token, an empty token gives null
+    procedure pool_field(variable pool : in string_pool_ptr;
+                         variable field : in text_field;
+                         variable l : out line) is
+        variable n : integer;
+        variable h : integer;
+        variable entry : string_pool_entry_ptr;
+    begin
+        l := null;
+        n := fld_len(field);
+        if n = 0 then
+            return;
+        end if;
+        h := string_hash(field(1 to n));
+        entry := pool(h);
+        while entry /= null loop
+            if entry.value /= null then
+                if entry.value.all = field(1 to n) then
+                    l := entry.value;
+                    return;
+                end if;
+            end if;
+            entry := entry.next_rec;
+        end loop;
+        entry := new string_pool_entry;
+        entry.value := new string'(field(1 to n));
+        entry.next_rec := pool(h);
+        pool(h) := entry;
+        l := entry.value;
+    end procedure;
+
+    -- replace a text by its pooled copy, the text is freed if an equal one is pooled already
+    procedure pool_txt(variable pool : in string_pool_ptr;
+                       variable txt : inout stm_text_ptr) is
+        variable h : integer;
+        variable entry : string_pool_entry_ptr;
+    begin
+        if txt = null then
+            return;
+        end if;
+        h := string_hash(txt.all);
+        entry := pool(h);
+        while entry /= null loop
+            if entry.txt /= null then
+                if entry.txt.all = txt.all then
+                    deallocate(txt);
+                    txt := entry.txt;
+                    return;
+                end if;
+            end if;
+            entry := entry.next_rec;
+        end loop;
+        entry := new string_pool_entry;
+        entry.txt := txt;
+        entry.next_rec := pool(h);
+        pool(h) := entry;
+    end procedure;
+
     procedure add_instruction(variable inst_list : inout stim_line_ptr;
                               variable var_list : inout var_field_ptr;
                               variable inst : in text_field;
@@ -60,7 +198,7 @@ package body tb_interpreter_pkg is
                               variable p4 : in text_field;
                               variable p5 : in text_field;
                               variable p6 : in text_field;
-                              variable str_ptr : in stm_text_ptr;
+                              variable str_ptr : inout stm_text_ptr;
                               variable txt_enclosing_quote : in character;
                               variable sequ_num : inout integer;
                               variable line_num : in integer;
@@ -68,14 +206,12 @@ package body tb_interpreter_pkg is
                               variable file_idx : in integer;
                               constant stm_value_width : in integer) is
         variable temp_stim_line : stim_line_ptr;
-        variable temp_current : stim_line_ptr;
         variable valid : integer;
         variable l : integer;
         variable stm_var_type : t_stm_var_type := NO_VAR_TYPE;
     begin
         valid := 1;
         l := fld_len(inst);
-        temp_current := inst_list;
         -- take care of special cases
         if inst(1 to l) = INSTR_VAR then
             stm_var_type := STM_VALUE_TYPE;
@@ -107,30 +243,32 @@ package body tb_interpreter_pkg is
         if valid = 1 then
             -- prepare the new record
             temp_stim_line := new stim_line;
-            temp_stim_line.instruction := inst;
-            temp_stim_line.inst_field_1 := p1;
-            temp_stim_line.inst_field_2 := p2;
-            temp_stim_line.inst_field_3 := p3;
-            temp_stim_line.inst_field_4 := p4;
-            temp_stim_line.inst_field_5 := p5;
-            temp_stim_line.inst_field_6 := p6;
-            temp_stim_line.txt := str_ptr;
-            temp_stim_line.txt_enclosing_quote := txt_enclosing_quote;
-            temp_stim_line.line_number := sequ_num;
-            temp_stim_line.file_idx := file_idx;
-            temp_stim_line.file_line := line_num;
-            -- if is not the first instruction
+            -- if is not the first instruction append behind the tail kept in the first record
             if inst_list /= null then
-                while temp_current.next_rec /= null loop
-                    temp_current := temp_current.next_rec;
-                end loop;
-                temp_current.next_rec := temp_stim_line;
+                inst_list.last_rec.next_rec := temp_stim_line;
+                inst_list.last_rec := temp_stim_line;
                 inst_list.num_of_lines := inst_list.num_of_lines + 1;
             -- other wise is first instruction to be added
             else
                 inst_list := temp_stim_line;
+                inst_list.last_rec := temp_stim_line;
                 inst_list.num_of_lines := 1;
+                inst_list.pool := new string_pool(0 to c_string_pool_buckets - 1);
             end if;
+            -- the texts are stored with their length and shared with equal texts of other lines
+            pool_field(inst_list.pool, inst, temp_stim_line.instruction);
+            pool_field(inst_list.pool, p1, temp_stim_line.inst_field_1);
+            pool_field(inst_list.pool, p2, temp_stim_line.inst_field_2);
+            pool_field(inst_list.pool, p3, temp_stim_line.inst_field_3);
+            pool_field(inst_list.pool, p4, temp_stim_line.inst_field_4);
+            pool_field(inst_list.pool, p5, temp_stim_line.inst_field_5);
+            pool_field(inst_list.pool, p6, temp_stim_line.inst_field_6);
+            pool_txt(inst_list.pool, str_ptr);
+            temp_stim_line.txt := str_ptr;
+            temp_stim_line.txt_enclosing_quote := txt_enclosing_quote;
+            temp_stim_line.line_number := sequ_num;
+            temp_stim_line.file_idx := file_idx;
+            temp_stim_line.file_line := line_num;
             sequ_num := sequ_num + 1;
             -- print_inst(temp_stim_line);  -- for debug
         end if;
@@ -149,6 +287,7 @@ package body tb_interpreter_pkg is
                            constant stm_value_width : in integer) is
         variable temp_var : var_field_ptr;
         variable current_ptr : var_field_ptr;
+        variable temp_indexes : var_field_ptr_array_ptr;
         variable index : integer := 1;
 
         procedure init_stm_lines_var is
@@ -226,50 +365,48 @@ package body tb_interpreter_pkg is
     begin
         -- if this is not the first one
         if var_list /= null then
-            current_ptr := var_list;
-            index := index + 1;
-            while current_ptr.next_rec /= null loop
-                -- if we have defined the current before then die
+            -- if we have defined the current before then die
+            current_ptr := var_list.var_buckets(var_name_hash(p1));
+            while current_ptr /= null loop
                 assert current_ptr.var_name /= p1
                 report lf & "error: attemping to add a duplicate variable definition " & " on line " & (integer'image(line_num)) & " of file " & text_line_crop(name)
                 severity failure;
-                current_ptr := current_ptr.next_rec;
-                index := index + 1;
+                current_ptr := current_ptr.hash_next;
             end loop;
-            -- if we have defined the current before then die. this checks the last one
-            assert current_ptr.var_name /= p1
-            report lf & "error: attemping to add a duplicate variable definition " & " on line " & (integer'image(line_num)) & " of file " & text_line_crop(name)
-            severity failure;
-            if var_stm_type = STM_LINES_TYPE then
-                init_stm_lines_var;
-                current_ptr.next_rec := temp_var;
-            elsif var_stm_type = STM_ARRAY_TYPE then
-                init_stm_array_var;
-                current_ptr.next_rec := temp_var;
-            elsif var_stm_type = STM_TEXT_TYPE then
-                init_stm_text_var;
-                current_ptr.next_rec := temp_var;
-            elsif var_stm_type = STM_LABEL_TYPE then
-                init_inline_var;
-                current_ptr.next_rec := temp_var;
-            else
-                init_non_inline_var;
-                current_ptr.next_rec := temp_var;
-            end if;
-        -- this is the first one
+            index := var_list.last_rec.var_index + 1;
+        end if;
+        if var_stm_type = STM_LINES_TYPE then
+            init_stm_lines_var;
+        elsif var_stm_type = STM_ARRAY_TYPE then
+            init_stm_array_var;
+        elsif var_stm_type = STM_TEXT_TYPE then
+            init_stm_text_var;
+        elsif var_stm_type = STM_LABEL_TYPE then
+            init_inline_var;
         else
-            if var_stm_type = STM_LINES_TYPE then
-                init_stm_lines_var;
-            elsif var_stm_type = STM_ARRAY_TYPE then
-                init_stm_array_var;
-            elsif var_stm_type = STM_TEXT_TYPE then
-                init_stm_text_var;
-            elsif var_stm_type = STM_LABEL_TYPE then
-                init_inline_var;
-            else
-                init_non_inline_var;
-            end if;
+            init_non_inline_var;
+        end if;
+        -- this is the first one, it keeps the tail, the hash buckets and the index table
+        if var_list = null then
             var_list := temp_var;
+            var_list.var_buckets := new var_field_ptr_array(0 to c_var_hash_buckets - 1);
+            var_list.var_indexes := new var_field_ptr_array(1 to 64);
+        else
+            var_list.last_rec.next_rec := temp_var;
+        end if;
+        var_list.last_rec := temp_var;
+        if index > var_list.var_indexes'high then
+            temp_indexes := new var_field_ptr_array(1 to 2 * var_list.var_indexes'high);
+            temp_indexes(1 to var_list.var_indexes'high) := var_list.var_indexes.all;
+            deallocate(var_list.var_indexes);
+            var_list.var_indexes := temp_indexes;
+        end if;
+        var_list.var_indexes(index) := temp_var;
+        -- a name defined twice, as possible for labels, resolves to its first definition
+        find_variable(var_list, temp_var.var_name, current_ptr);
+        if current_ptr = null then
+            temp_var.hash_next := var_list.var_buckets(var_name_hash(temp_var.var_name));
+            var_list.var_buckets(var_name_hash(temp_var.var_name)) := temp_var;
         end if;
     end procedure;
 
@@ -327,36 +464,15 @@ package body tb_interpreter_pkg is
             assert var_list /= null
             report lf & "error: no variables are defined." & lf
             severity failure;
-            var_ptr := var_list;
-            while var_ptr.next_rec /= null loop
-                -- if we have a match
-                if fld_equal(temp_field, var_ptr.var_name) then
-                    if ptr = 1 then
-                        value := var_ptr.var_value;
-                        valid := 1;
-                        is_defined := true;
-                    else
-                        value := to_unsigned(var_ptr.var_index, value'length);
-                        valid := 1;
-                        is_defined := true;
-                    end if;
-                    exit;
-                end if;
-                var_ptr := var_ptr.next_rec;
-            end loop;
-            -- if we have a match and was the last record
-            if var_ptr.next_rec = null then
-                if fld_equal(temp_field, var_ptr.var_name) then
-                    if ptr = 1 then
-                        value := var_ptr.var_value;
-                        valid := 1;
-                        is_defined := true;
-                    else
-                        value := to_unsigned(var_ptr.var_index, value'length);
-                        valid := 1;
-                        is_defined := true;
-                    end if;
+            find_variable(var_list, temp_field, var_ptr);
+            if var_ptr /= null then
+                if ptr = 1 then
+                    value := var_ptr.var_value;
+                else
+                    value := to_unsigned(var_ptr.var_index, value'length);
                 end if;
+                valid := 1;
+                is_defined := true;
             end if;
             assert is_defined
             report lf & "error: variable is not defined " & temp_field & lf
@@ -368,7 +484,8 @@ package body tb_interpreter_pkg is
                                variable var_list : in var_field_ptr;
                                variable file_list : in file_def_ptr;
                                variable sequ_num : in integer;
-                               variable inst : out text_field;
+                               variable inst_ptr : out stim_line_ptr;
+                               variable opcode : out t_stm_opcode;
                                variable p1 : out unsigned;
                                variable p2 : out unsigned;
                                variable p3 : out unsigned;
@@ -377,149 +494,69 @@ package body tb_interpreter_pkg is
                                variable p6 : out unsigned;
                                variable txt : out stm_text_ptr;
                                variable txt_enclosing_quote : out character;
-                               variable inst_len : out integer;
-                               variable fname : out text_line;
-                               variable file_line : out integer;
-                               variable last_num : inout integer;
-                               variable last_ptr : inout stim_line_ptr) is
-        variable temp_text_field : text_field;
-        variable inst_ptr : stim_line_ptr;
-        variable valid : integer;
-        variable line : integer; -- value of the file_line
-        variable file_name : text_line;
-        variable tmp_int : integer;
-        variable temp_fn_prt : file_def_ptr;
-    begin
-        -- get to the instruction indicated by sequ_num
-        -- check to see if this sequence is before the last
-        --    so search from start
-        if last_num > sequ_num then
-            inst_ptr := inst_sequ;
-            while inst_ptr.next_rec /= null loop
-                if inst_ptr.line_number = sequ_num then
-                    exit;
-                else
-                    inst_ptr := inst_ptr.next_rec;
-                end if;
-            end loop;
-        -- else is equal or greater, so search forward
-        else
-            inst_ptr := last_ptr;
-            while inst_ptr.next_rec /= null loop
-                if inst_ptr.line_number = sequ_num then
-                    exit;
-                else
-                    inst_ptr := inst_ptr.next_rec;
-                end if;
-            end loop;
-        end if;
-        -- update the last sequence number and record pointer
-        last_num := sequ_num;
-        last_ptr := inst_ptr;
-        -- output the instruction and its length
-        inst := inst_ptr.instruction;
-        inst_len := fld_len(inst_ptr.instruction);
-        file_line := inst_ptr.file_line;
-        line := inst_ptr.file_line;
-        -- recover the file name this line came from
-        temp_fn_prt := file_list;
-        tmp_int := inst_ptr.file_idx;
-        while temp_fn_prt.next_rec /= null loop
-            if temp_fn_prt.rec_idx = tmp_int then
-                exit;
-            end if;
-            temp_fn_prt := temp_fn_prt.next_rec;
-        end loop;
-        for i in 1 to fname'high loop
-            file_name(i) := temp_fn_prt.file_name(i);
-            fname(i) := temp_fn_prt.file_name(i);
-        end loop;
-        txt := inst_ptr.txt;
-        txt_enclosing_quote := inst_ptr.txt_enclosing_quote;
-        temp_text_field := inst_ptr.inst_field_1;
-        if temp_text_field(1) /= nul then
-            if is_digit(temp_text_field(1)) then
-                p1 := stim_to_stm_value(temp_text_field, file_name, line, p1'length);
+                               variable file_line : out integer) is
+        variable sequ_ptr : stim_line_ptr;
+
+        -- the operands are resolved after loading, only the value of a $ variable is read
+        procedure get_operand(constant k : in integer; variable p : out unsigned) is
+        begin
+            if sequ_ptr.operand_vars(k) /= null then
+                p := sequ_ptr.operand_vars(k).var_value;
             else
-                access_variable(var_list, temp_text_field, p1, valid);
-                assert valid = 1
-                report lf & "error: first variable on stimulus line " & (integer'image(line)) & " is not valid!!" & lf & "in file " & file_name
-                severity failure;
+                p := sequ_ptr.operand_values(k);
             end if;
+        end procedure;
+    begin
+        -- get to the instruction indicated by sequ_num
+        get_inst_sequ_line(inst_sequ, sequ_num, sequ_ptr);
+        -- only the record is handed out, the instruction text and file name stay in it
+        inst_ptr := sequ_ptr;
+        opcode := sequ_ptr.opcode;
+        file_line := sequ_ptr.file_line;
+        txt := sequ_ptr.txt;
+        txt_enclosing_quote := sequ_ptr.txt_enclosing_quote;
+        if sequ_ptr.inst_field_1 /= null then
+            get_operand(1, p1);
         end if;
-        temp_text_field := inst_ptr.inst_field_2;
-        if temp_text_field(1) /= nul then
-            if is_digit(temp_text_field(1)) then
-                p2 := stim_to_stm_value(temp_text_field, file_name, line, p2'length);
-            else
-                access_variable(var_list, temp_text_field, p2, valid);
-                assert valid = 1
-                report lf & "error: second variable on stimulus line " & (integer'image(line)) & " is not valid!!" & lf & "in file " & file_name
-                severity failure;
-            end if;
+        if sequ_ptr.inst_field_2 /= null then
+            get_operand(2, p2);
         end if;
-        temp_text_field := inst_ptr.inst_field_3;
-        if temp_text_field(1) /= nul then
-            if is_digit(temp_text_field(1)) then
-                p3 := stim_to_stm_value(temp_text_field, file_name, line, p3'length);
-            else
-                access_variable(var_list, temp_text_field, p3, valid);
-                assert valid = 1
-                report lf & "error: third variable on stimulus line " & (integer'image(line)) & " is not valid!!" & lf & "in file " & file_name
-                severity failure;
-            end if;
+        if sequ_ptr.inst_field_3 /= null then
+            get_operand(3, p3);
         end if;
-        temp_text_field := inst_ptr.inst_field_4;
-        if temp_text_field(1) /= nul then
-            if is_digit(temp_text_field(1)) then
-                p4 := stim_to_stm_value(temp_text_field, file_name, line, p4'length);
-            else
-                access_variable(var_list, temp_text_field, p4, valid);
-                assert valid = 1
-                report lf & "error: forth variable on stimulus line " & (integer'image(line)) & " is not valid!!" & lf & "in file " & file_name
-                severity failure;
-            end if;
+        if sequ_ptr.inst_field_4 /= null then
+            get_operand(4, p4);
         end if;
-        temp_text_field := inst_ptr.inst_field_5;
-        if temp_text_field(1) /= nul then
-            if is_digit(temp_text_field(1)) then
-                p5 := stim_to_stm_value(temp_text_field, file_name, line, p5'length);
-            else
-                access_variable(var_list, temp_text_field, p5, valid);
-                assert (valid = 1)
-                report lf & "error: fifth variable on stimulus line " & (integer'image(line)) & " is not valid!!" & lf & "in file " & file_name
-                severity failure;
-            end if;
+        if sequ_ptr.inst_field_5 /= null then
+            get_operand(5, p5);
         end if;
-        temp_text_field := inst_ptr.inst_field_6;
-        if temp_text_field(1) /= nul then
-            if is_digit(temp_text_field(1)) then
-                p6 := stim_to_stm_value(temp_text_field, file_name, line, p6'length);
-            else
-                access_variable(var_list, temp_text_field, p6, valid);
-                assert valid = 1
-                report lf & "error: sixth variable on stimulus line " & (integer'image(line)) & " is not valid!!" & lf & "in file " & file_name
-                severity failure;
-            end if;
+        if sequ_ptr.inst_field_6 /= null then
+            get_operand(6, p6);
         end if;
     end procedure;
 
     procedure dump_inst_sequ(variable inst_sequ : in stim_line_ptr; file_list : inout file_def_ptr) is
         variable v_sequ : stim_line_ptr;
         variable tmp_txt : stm_text;
+        variable tmp_field : text_field;
         variable fn : text_line;
+        procedure dump_field(constant prefix : in string; variable l : in line) is
+        begin
+            line_to_text_field(l, tmp_field);
+            print(prefix & tmp_field);
+        end procedure;
         procedure dump is
         begin
             print("++++ -----------------------------------------------------------------");
-            print("++++ instruction is " & v_sequ.instruction);
+            dump_field("++++ instruction is ", v_sequ.instruction);
             txt_to_string(v_sequ.txt, tmp_txt);
             print("++++ text: " & tmp_txt);
-            print("++++ par1: " & v_sequ.inst_field_1);
-            print("++++ par2: " & v_sequ.inst_field_2);
-            print("++++ par3: " & v_sequ.inst_field_3);
-            print("++++ par4: " & v_sequ.inst_field_4);
-            print("++++ par5: " & v_sequ.inst_field_5);
-            print("++++ par6: " & v_sequ.inst_field_6);
+            dump_field("++++ par1: ", v_sequ.inst_field_1);
+            dump_field("++++ par2: ", v_sequ.inst_field_2);
+            dump_field("++++ par3: ", v_sequ.inst_field_3);
+            dump_field("++++ par4: ", v_sequ.inst_field_4);
+            dump_field("++++ par5: ", v_sequ.inst_field_5);
+            dump_field("++++ par6: ", v_sequ.inst_field_6);
             print("++++ internal sequence linenumber: " & to_str(v_sequ.line_number));
             print("++++ instruction file linenumber: " & to_str(v_sequ.file_line));
             print("++++ instruction file idx: " & to_str(v_sequ.file_idx));
@@ -571,9 +608,7 @@ package body tb_interpreter_pkg is
 
     procedure dump_var_field(variable ptr : var_field_ptr;
                              constant stm_value_width : in integer) is
-        variable std_line : line;
         variable tmp_str : stm_text;
-        variable tmp_str_ptr : stm_text_ptr;
         variable stm_line_ptr : t_stm_line_ptr;
         variable success : boolean;
         variable array_index : integer;
@@ -611,14 +646,14 @@ package body tb_interpreter_pkg is
             report " error: stm_lines_ptr pointer is null "
             severity failure;
             print("-------- stm_lines.size: " & to_str(ptr.var_stm_lines.size));
-            stm_line_ptr := ptr.var_stm_lines.stm_line_list;
-            while stm_line_ptr /= null loop
-                print("-------- stm_line_ptr.line_number: " & to_str(stm_line_ptr.line_number));
+            for i in 0 to ptr.var_stm_lines.size - 1 loop
+                stm_line_ptr := ptr.var_stm_lines.stm_line_list(i);
+                print("-------- stm_line_ptr.line_number: " & to_str(i));
                 if stm_line_ptr.line_type = STM_LINE_TEXT_TYPE then
                     print("-------- stm_line_ptr.line_type: STM_LINE_TEXT_TYPE");
-                    tmp_str_ptr := new stm_text;
-                    get_stm_text_ptr_from_line(std_line, tmp_str_ptr);
-                    txt_print(tmp_str_ptr);
+                    if stm_line_ptr.line_content /= null then
+                        print(stm_line_ptr.line_content.all);
+                    end if;
                 elsif stm_line_ptr.line_type = STM_LINE_ARRAY_TYPE then
                     print("-------- stm_line_ptr.line_type: STM_LINE_ARRAY_TYPE");
                     success := true;
@@ -635,7 +670,6 @@ package body tb_interpreter_pkg is
                     end loop;
                     print("-------- stm_line_ptr.line_content'length after reading: " & to_str(stm_line_ptr.line_content'length));
                 end if;
-                stm_line_ptr := stm_line_ptr.next_stm_line;
             end loop;
         elsif ptr.var_stm_type = STM_BUS_TYPE then
             print("---- var_stm_type: STM_BUS_TYPE");
@@ -680,17 +714,9 @@ package body tb_interpreter_pkg is
                              variable valid : out integer) is
         variable ptr : var_field_ptr;
     begin
-        ptr := var_list;
+        find_variable(var_list, index, ptr);
         valid := 0;
-        while ptr.next_rec /= null loop
-            if ptr.var_index = index then
-                value := ptr.var_value;
-                valid := 1;
-                exit;
-            end if;
-            ptr := ptr.next_rec;
-        end loop;
-        if ptr.var_index = index then
+        if ptr /= null then
             value := ptr.var_value;
             valid := 1;
         end if;
@@ -714,17 +740,9 @@ package body tb_interpreter_pkg is
                              variable valid : out integer) is
         variable ptr : var_field_ptr;
     begin
-        ptr := var_list;
+        find_variable(var_list, index, ptr);
         valid := 0;
-        while ptr.next_rec /= null loop
-            if ptr.var_index = index then
-                var_stm_text := ptr.var_stm_text;
-                valid := 1;
-                exit;
-            end if;
-            ptr := ptr.next_rec;
-        end loop;
-        if ptr.var_index = index then
+        if ptr /= null then
             var_stm_text := ptr.var_stm_text;
             var_stm_text_enclosing_quote := ptr.var_stm_text_enclosing_quote;
             valid := 1;
@@ -747,17 +765,9 @@ package body tb_interpreter_pkg is
                              variable valid : out integer) is
         variable ptr : var_field_ptr;
     begin
-        ptr := var_list;
+        find_variable(var_list, index, ptr);
         valid := 0;
-        while ptr.next_rec /= null loop
-            if ptr.var_index = index then
-                stm_array := ptr.var_stm_array;
-                valid := 1;
-                exit;
-            end if;
-            ptr := ptr.next_rec;
-        end loop;
-        if ptr.var_index = index then
+        if ptr /= null then
             stm_array := ptr.var_stm_array;
             valid := 1;
         end if;
@@ -779,17 +789,9 @@ package body tb_interpreter_pkg is
                              variable valid : out integer) is
         variable ptr : var_field_ptr;
     begin
-        ptr := var_list;
+        find_variable(var_list, index, ptr);
         valid := 0;
-        while ptr.next_rec /= null loop
-            if ptr.var_index = index then
-                stm_lines := ptr.var_stm_lines;
-                valid := 1;
-                exit;
-            end if;
-            ptr := ptr.next_rec;
-        end loop;
-        if ptr.var_index = index then
+        if ptr /= null then
             stm_lines := ptr.var_stm_lines;
             valid := 1;
         end if;
@@ -815,24 +817,23 @@ package body tb_interpreter_pkg is
     procedure print_inst(variable inst_sequ : in stim_line_ptr; v_line : in integer; file_list : inout file_def_ptr) is
         variable inst_ptr : stim_line_ptr;
         variable tmp_txt : stm_text;
+        variable tmp_field : text_field;
         variable fn : text_line;
+        procedure print_field(constant prefix : in string; variable l : in line) is
+        begin
+            line_to_text_field(l, tmp_field);
+            print(prefix & tmp_field);
+        end procedure;
     begin
-        inst_ptr := inst_sequ;
-        while inst_ptr.next_rec /= null loop
-            if inst_ptr.line_number = v_line then
-                exit;
-            else
-                inst_ptr := inst_ptr.next_rec;
-            end if;
-        end loop;
+        get_inst_sequ_line(inst_sequ, v_line, inst_ptr);
         print(".... -----------------------------------------------------------------");
-        print(".... instruction is " & inst_ptr.instruction);
-        print(".... par1: " & inst_ptr.inst_field_1);
-        print(".... par2: " & inst_ptr.inst_field_2);
-        print(".... par3: " & inst_ptr.inst_field_3);
-        print(".... par4: " & inst_ptr.inst_field_4);
-        print(".... par5: " & inst_ptr.inst_field_5);
-        print(".... par6: " & inst_ptr.inst_field_6);
+        print_field(".... instruction is ", inst_ptr.instruction);
+        print_field(".... par1: ", inst_ptr.inst_field_1);
+        print_field(".... par2: ", inst_ptr.inst_field_2);
+        print_field(".... par3: ", inst_ptr.inst_field_3);
+        print_field(".... par4: ", inst_ptr.inst_field_4);
+        print_field(".... par5: ", inst_ptr.inst_field_5);
+        print_field(".... par6: ", inst_ptr.inst_field_6);
         txt_to_string(inst_ptr.txt, tmp_txt);
         print(".... text: " & tmp_txt);
         print(".... internal sequence linenumber: " & to_str(inst_ptr.line_number));
@@ -842,18 +843,227 @@ package body tb_interpreter_pkg is
         print(".... instruction file name: " & fn);
     end procedure;
 
-    procedure get_inst_field_1(variable inst_sequ : in stim_line_ptr; v_line : in integer; inst_field_1 : out text_field) is
+    procedure get_inst_sequ_line(variable inst_sequ : in stim_line_ptr; sequ_num : in integer; variable inst_ptr : out stim_line_ptr) is
+    begin
+        -- like walking the list, a sequence number beyond the last instruction gets the last one
+        if sequ_num >= 1 and sequ_num <= inst_sequ.num_of_lines then
+            inst_ptr := inst_sequ.line_index(sequ_num);
+        else
+            inst_ptr := inst_sequ.last_rec;
+        end if;
+    end procedure;
+
+    procedure index_inst_sequ(variable inst_sequ : inout stim_line_ptr) is
         variable inst_ptr : stim_line_ptr;
     begin
+        if inst_sequ = null then
+            return;
+        end if;
+        inst_sequ.line_index := new stim_line_ptr_array(1 to inst_sequ.num_of_lines);
         inst_ptr := inst_sequ;
-        while inst_ptr.next_rec /= null loop
-            if inst_ptr.line_number = v_line then
+        for i in 1 to inst_sequ.num_of_lines loop
+            inst_sequ.line_index(i) := inst_ptr;
+            inst_ptr := inst_ptr.next_rec;
+        end loop;
+    end procedure;
+
+    procedure profile_enter(variable profile_node : inout t_stm_profile_node_ptr;
+                            variable profile_time : inout time;
+                            variable called_label : in text_field;
+                            variable called_file : in text_line) is
+        variable child : t_stm_profile_node_ptr;
+    begin
+        if profile_node = null then
+            profile_node := new t_stm_profile_node'(called_label, called_file, 1, 0, 0 ns, null, null, null);
+            profile_time := now;
+            return;
+        end if;
+        profile_node.self_time := profile_node.self_time + (now - profile_time);
+        profile_time := now;
+        child := profile_node.first_child;
+        while child /= null loop
+            if fld_equal(called_label, child.called_label) then
                 exit;
+            end if;
+            child := child.next_sibling;
+        end loop;
+        if child = null then
+            child := new t_stm_profile_node'(called_label, called_file, 0, 0, 0 ns, profile_node, null,
+                                             profile_node.first_child);
+            profile_node.first_child := child;
+        end if;
+        child.calls := child.calls + 1;
+        profile_node := child;
+    end procedure;
+
+    procedure profile_leave(variable profile_node : inout t_stm_profile_node_ptr;
+                            variable profile_time : inout time) is
+    begin
+        profile_node.self_time := profile_node.self_time + (now - profile_time);
+        profile_time := now;
+        if profile_node.parent /= null then
+            profile_node := profile_node.parent;
+        end if;
+    end procedure;
+
+    procedure profile_write(constant file_name : in string;
+                            variable profile_node : in t_stm_profile_node_ptr;
+                            variable opcode_counts : in t_stm_profile_opcode_counts) is
+        variable v_stat : file_open_status;
+        file profile_file : text;
+        variable l : line;
+        variable root : t_stm_profile_node_ptr;
+        variable id : integer := 0;
+    begin
+        file_open(v_stat, profile_file, file_name, write_mode);
+        assert v_stat = open_ok
+        report lf & "error: unable to open stimulus_profile_file " & file_name
+        severity failure;
+        write(l, string'("-- simstm profile 1"));
+        writeline(profile_file, l);
+        for opcode in t_stm_opcode loop
+            if opcode_counts(opcode) > 0 then
+                write(l, string'("opcode "));
+                write(l, t_stm_opcode'image(opcode));
+                write(l, ' ');
+                write(l, opcode_counts(opcode));
+                writeline(profile_file, l);
+            end if;
+        end loop;
+        root := profile_node;
+        while root /= null and root.parent /= null loop
+            root := root.parent;
+        end loop;
+        if root /= null then
+            profile_write_node(profile_file, root, 0, id);
+        end if;
+        file_close(profile_file);
+    end procedure;
+
+    procedure get_inst_field_1(variable inst_sequ : in stim_line_ptr; v_line : in integer; inst_field_1 : out text_field) is
+        variable inst_ptr : stim_line_ptr;
+    begin
+        get_inst_sequ_line(inst_sequ, v_line, inst_ptr);
+        line_to_text_field(inst_ptr.inst_field_1, inst_field_1);
+    end procedure;
+
+    procedure read_compiled_instruction_file(constant path_name : string;
+                                             constant file_name : string;
+                                             variable var_list : inout var_field_ptr;
+                                             variable inst_sequ : inout stim_line_ptr;
+                                             variable file_list : inout file_def_ptr;
+                                             constant stm_value_width : in integer) is
+        variable l : line;
+        variable v_stat : file_open_status;
+        variable v_num_files : integer;
+        variable v_num_records : integer;
+        variable v_sequ_line : integer;
+        variable v_fn_idx : integer;
+        variable v_last_fn_idx : integer := 0;
+        variable l_num : integer;
+        variable valid : integer;
+        variable v_len : integer;
+        variable v_c : character;
+        variable t1 : text_field;
+        variable t2 : text_field;
+        variable t3 : text_field;
+        variable t4 : text_field;
+        variable t5 : text_field;
+        variable t6 : text_field;
+        variable t7 : text_field;
+        variable t_txt : stm_text_ptr;
+        variable txt_enclosing_quote : character;
+        variable v_name : text_line;
+        variable v_tmp_fn : file_def_ptr;
+        variable v_last_fn : file_def_ptr;
+        variable v_sequ_ptr : stim_line_ptr;
+        variable v_var_prt : var_field_ptr;
+
+        -- a field is its length, a blank and its characters
+        procedure read_field(variable field : out text_field) is
+            variable len : integer;
+            variable c : character;
+        begin
+            field := (others => nul);
+            if valid > 0 then
+                read(l, len);
+                read(l, c);
+                for i in 1 to len loop
+                    read(l, c);
+                    field(i) := c;
+                end loop;
+                valid := valid - 1;
+            end if;
+        end procedure;
+    begin
+        file_open(v_stat, stimulus, path_name & file_name, read_mode);
+        assert v_stat = open_ok
+        report lf & "error: unable to open stimulus_file  " & path_name & file_name
+        severity failure;
+        print("loading compiled stimulus file " & path_name & file_name);
+        -- header, number of files and records
+        readline(stimulus, l);
+        readline(stimulus, l);
+        read(l, v_num_files);
+        read(l, v_num_records);
+        -- the file names link list, the first one is the main file
+        for i in 1 to v_num_files loop
+            readline(stimulus, l);
+            read(l, v_len);
+            read(l, v_c);
+            v_tmp_fn := new file_def;
+            v_tmp_fn.rec_idx := i;
+            v_tmp_fn.file_name := (others => nul);
+            for j in 1 to v_len loop
+                read(l, v_c);
+                v_tmp_fn.file_name(j) := v_c;
+            end loop;
+            v_tmp_fn.next_rec := null;
+            if i = 1 then
+                file_list := v_tmp_fn;
             else
-                inst_ptr := inst_ptr.next_rec;
+                v_last_fn.next_rec := v_tmp_fn;
             end if;
+            v_last_fn := v_tmp_fn;
         end loop;
-        inst_field_1 := inst_ptr.inst_field_1;
+        v_var_prt := var_list;
+        v_sequ_ptr := inst_sequ;
+        -- one record per line: sequence number, file index, file line, tokens and text
+        for i in 1 to v_num_records loop
+            readline(stimulus, l);
+            read(l, v_sequ_line);
+            read(l, v_fn_idx);
+            read(l, l_num);
+            read(l, valid);
+            read_field(t1);
+            read_field(t2);
+            read_field(t3);
+            read_field(t4);
+            read_field(t5);
+            read_field(t6);
+            read_field(t7);
+            read(l, v_len);
+            t_txt := null;
+            txt_enclosing_quote := nul;
+            if v_len > 0 then
+                read(l, v_c);
+                read(l, txt_enclosing_quote);
+                t_txt := new string(1 to v_len - 1);
+                for j in 1 to v_len - 1 loop
+                    read(l, v_c);
+                    t_txt(j) := v_c;
+                end loop;
+            end if;
+            if v_fn_idx /= v_last_fn_idx then
+                get_instruction_file_name(file_list, v_fn_idx, v_name);
+                v_last_fn_idx := v_fn_idx;
+            end if;
+            add_instruction(v_sequ_ptr, v_var_prt, t1, t2, t3, t4, t5, t6, t7, t_txt, txt_enclosing_quote,
+                            v_sequ_line, l_num, v_name, v_fn_idx, stm_value_width);
+        end loop;
+        file_close(stimulus);
+        var_list := v_var_prt;
+        inst_sequ := v_sequ_ptr;
     end procedure;
 
     procedure read_include_file(constant path_name : string;
@@ -942,7 +1152,7 @@ package body tb_interpreter_pkg is
                 -- elsif the text string is not null
                 elsif t_txt /= null then
                     v_iname := (others => nul);
-                    for i in 1 to c_stm_text_len loop
+                    for i in 1 to t_txt'length loop
                         v_iname(i) := t_txt(i);
                         if t_txt(i) = txt_enclosing_quote then
                             v_iname(i) := nul;
@@ -1017,6 +1227,16 @@ package body tb_interpreter_pkg is
         assert v_stat = open_ok
         report lf & "error: unable to open stimulus_file  " & path_name & file_name
         severity failure;
+        -- a pre-compiled stimulus file is loaded as is, it has been tokenized and tested already
+        file_read_line(stimulus, l);
+        file_close(stimulus);
+        if l(1 to c_compiled_stimulus_header'length) = c_compiled_stimulus_header then
+            read_compiled_instruction_file(path_name, file_name, var_list, inst_sequ, file_list, stm_value_width);
+            index_inst_sequ(inst_sequ);
+            resolve_inst_sequ(inst_sequ, var_list, file_list, stm_value_width);
+            return;
+        end if;
+        file_open(v_stat, stimulus, path_name & file_name, read_mode);
         -- copy file name to type text_line
         for i in 1 to path_name'high loop
             v_name(i) := path_name(i);
@@ -1061,7 +1281,7 @@ package body tb_interpreter_pkg is
                 -- elsif the text string is not null
                 elsif t_txt /= null then
                     v_iname := (others => nul);
-                    for i in 1 to c_stm_text_len loop
+                    for i in 1 to t_txt'length loop
                         v_iname(i) := t_txt(i);
                         if t_txt(i) = txt_enclosing_quote then
                             v_iname(i) := nul;
@@ -1095,8 +1315,84 @@ package body tb_interpreter_pkg is
         var_list := v_var_prt;
         inst_sequ := v_sequ_ptr;
         file_list := v_tmp_fn;
-        --  now that all the stimulus is loaded, test for invalid variables
-        test_inst_sequ(inst_sequ, v_tmp_fn, var_list, stm_value_width);
+        index_inst_sequ(inst_sequ);
+        --  now that all the stimulus is loaded, test for invalid variables and bind
+        --  the operands so executing an instruction does not look up names
+        resolve_inst_sequ(inst_sequ, var_list, file_list, stm_value_width);
+    end procedure;
+
+    procedure resolve_inst_sequ(variable inst_sequ : in stim_line_ptr;
+                                variable var_list : in var_field_ptr;
+                                variable file_list : in file_def_ptr;
+                                constant stm_value_width : in integer) is
+        variable inst_ptr : stim_line_ptr;
+        variable file_ptr : file_def_ptr;
+        variable field : text_field;
+        variable temp_field : text_field;
+        variable valid : integer;
+        variable num_fields : integer;
+
+        procedure resolve_field(constant k : in integer; variable l : in line; constant nth : in string) is
+        begin
+            if l /= null then
+                line_to_text_field(l, field);
+                if is_digit(field(1)) then
+                    inst_ptr.operand_values(k) := stim_to_stm_value(field, file_ptr.file_name, inst_ptr.file_line, stm_value_width);
+                else
+                    -- comparators and variable indexes do not change, a $ variable is bound to its record
+                    access_variable(var_list, field, inst_ptr.operand_values(k), valid);
+                    assert valid = 1
+                    report lf & "error: " & nth & " variable on stimulus line " & (integer'image(inst_ptr.file_line)) & " is not valid!!" & lf & "in file " & file_ptr.file_name
+                    severity failure;
+                    if field(1) = '$' then
+                        temp_field := (others => nul);
+                        temp_field(1 to max_field_len - 1) := field(2 to max_field_len);
+                        find_variable(var_list, temp_field, inst_ptr.operand_vars(k));
+                    end if;
+                end if;
+            end if;
+        end procedure;
+    begin
+        inst_ptr := inst_sequ;
+        while inst_ptr /= null loop
+            file_ptr := file_list;
+            while file_ptr.next_rec /= null loop
+                if file_ptr.rec_idx = inst_ptr.file_idx then
+                    exit;
+                end if;
+                file_ptr := file_ptr.next_rec;
+            end loop;
+            inst_ptr.file_ref := file_ptr;
+            line_to_text_field(inst_ptr.instruction, field);
+            inst_ptr.opcode := instruction_opcode(field);
+            -- operands are kept for the given fields only
+            if inst_ptr.inst_field_6 /= null then
+                num_fields := 6;
+            elsif inst_ptr.inst_field_5 /= null then
+                num_fields := 5;
+            elsif inst_ptr.inst_field_4 /= null then
+                num_fields := 4;
+            elsif inst_ptr.inst_field_3 /= null then
+                num_fields := 3;
+            elsif inst_ptr.inst_field_2 /= null then
+                num_fields := 2;
+            elsif inst_ptr.inst_field_1 /= null then
+                num_fields := 1;
+            else
+                num_fields := 0;
+            end if;
+            if num_fields > 0 then
+                inst_ptr.operand_values := new t_stm_array(1 to num_fields)(stm_value_width - 1 downto 0);
+                inst_ptr.operand_vars := new var_field_ptr_array(1 to num_fields);
+            end if;
+            resolve_field(1, inst_ptr.inst_field_1, "first");
+            resolve_field(2, inst_ptr.inst_field_2, "second");
+            resolve_field(3, inst_ptr.inst_field_3, "third");
+            resolve_field(4, inst_ptr.inst_field_4, "forth");
+            resolve_field(5, inst_ptr.inst_field_5, "fifth");
+            resolve_field(6, inst_ptr.inst_field_6, "sixth");
+            inst_ptr := inst_ptr.next_rec;
+        end loop;
     end procedure;
 
     procedure stm_text_substitude_wvar(variable var_list : in var_field_ptr;
@@ -1106,22 +1402,18 @@ package body tb_interpreter_pkg is
                                        variable stack_called_files : stack_text_line_array;
                                        variable stack_called_file_line_numbers : stack_numbers_array;
                                        variable stack_called_labels : stack_text_field_array;
-                                       variable stm_text_substituded : out stm_text;
+                                       variable stm_text_substituded : out stm_text_ptr;
                                        constant stm_value_width : in integer) is
         variable src_i : integer;
         variable src_tail_i : integer;
-        variable dest_i : integer;
-        variable f_src_i : integer;
-        variable f_dest_i : integer;
-        variable f_dest_txt_str : stm_text;
-        variable k : integer;
+        variable run_begin : integer;
         variable src_tail_begin : integer;
-        variable dest_txt_str : stm_text;
+        variable dest : line;
+        variable dest_len : integer;
         variable v1 : unsigned(stm_value_width - 1 downto 0);
         variable valid : integer;
         variable tmp_field : text_field;
         variable tmp_i : integer;
-        variable input_txt : stm_text;
 
         variable insert_var : boolean;
         variable format : base;
@@ -1133,15 +1425,43 @@ package body tb_interpreter_pkg is
         variable stack_called_file_line_number : integer;
         variable stack_called_label : text_field;
 
+        -- append to the message, the buffer is doubled when it is full
+        procedure append(constant s : in string) is
+            variable grown : line;
+        begin
+            if dest_len + s'length > dest'length then
+                grown := new string(1 to 2 * (dest_len + s'length));
+                grown(1 to dest_len) := dest(1 to dest_len);
+                deallocate(dest);
+                dest := grown;
+            end if;
+            dest(dest_len + 1 to dest_len + s'length) := s;
+            dest_len := dest_len + s'length;
+        end procedure;
+
+        procedure append_until_nul(constant s : in string;
+                                   constant first : in integer) is
+            variable last : integer;
+        begin
+            last := first - 1;
+            while last < s'high loop
+                if s(last + 1) = nul then
+                    exit;
+                end if;
+                last := last + 1;
+            end loop;
+            append(s(first to last));
+        end procedure;
+
     begin
+        stm_text_substituded := null;
         if ptr = null then
             return;
         end if;
-        txt_to_string(ptr, input_txt);
         -- determine variables tail_start in src string
         src_i := 1;
         src_tail_begin := 0;
-        while src_i <= c_stm_text_len loop
+        while src_i <= ptr'length loop
             if src_i > 1 then
                 if ptr(src_i - 1) = '\' and ptr(src_i) = txt_enclosing_quote then
                     src_i := src_i + 1;
@@ -1162,51 +1482,26 @@ package body tb_interpreter_pkg is
         end loop;
         src_i := 1;
         src_tail_i := src_tail_begin;
-        dest_i := 1;
-        dest_txt_str := (others => nul);
-        while src_i <= src_tail_begin and dest_i <= c_stm_text_len loop
-            if src_i < src_tail_begin then
-                if ptr(src_i) = '\' and ptr(src_i + 1) = txt_enclosing_quote then
-                    src_i := src_i + 1;
-                end if;
-            end if;
-
-            -- copy until next '{'
-            while src_i < src_tail_begin and dest_i <= c_stm_text_len loop
+        dest := new string(1 to ptr'length + 1);
+        dest_len := 0;
+        while src_i <= src_tail_begin loop
+            -- copy until next '{', skip '\' before txt_enclosing_quote
+            run_begin := src_i;
+            while src_i < src_tail_begin loop
                 if ptr(src_i) = '{' then
                     exit;
-                else
-                    dest_txt_str(dest_i) := ptr(src_i);
+                elsif ptr(src_i) = '\' and ptr(src_i + 1) = txt_enclosing_quote then
+                    append(ptr(run_begin to src_i - 1));
                     src_i := src_i + 1;
-                    dest_i := dest_i + 1;
+                    run_begin := src_i;
                 end if;
+                src_i := src_i + 1;
             end loop;
+            append(ptr(run_begin to src_i - 1));
             if src_i = src_tail_begin then
                 -- src end reached
-                f_src_i := 1;
-                f_dest_i := 1;
-                f_dest_txt_str := (others => nul);
-                while f_src_i < dest_i loop
-                    if f_src_i + 1 < dest_i then
-                        if dest_txt_str(f_src_i) = '\' and dest_txt_str(f_src_i + 1) = txt_enclosing_quote then
-                            -- skip '/' before txt_enclosing_quote
-                            f_src_i := f_src_i + 1;
-                            f_dest_txt_str(f_dest_i) := dest_txt_str(f_src_i);
-                            f_src_i := f_src_i + 1;
-                            f_dest_i := f_dest_i + 1;
-                        else
-                            -- don't skip '/' before others but txt_enclosing_quote
-                            f_dest_txt_str(f_dest_i) := dest_txt_str(f_src_i);
-                            f_src_i := f_src_i + 1;
-                            f_dest_i := f_dest_i + 1;
-                        end if;
-                    else
-                        f_dest_txt_str(f_dest_i) := dest_txt_str(f_src_i);
-                        f_src_i := f_src_i + 1;
-                        f_dest_i := f_dest_i + 1;
-                    end if;
-                end loop;
-                stm_text_substituded := f_dest_txt_str;
+                stm_text_substituded := new string'(dest(1 to dest_len));
+                deallocate(dest);
                 return;
             end if;
             -- place to embed a var found
@@ -1217,7 +1512,7 @@ package body tb_interpreter_pkg is
                 src_i := src_i + 1;
                 format := hex;
                 insert_var := true;
-                while src_i < src_tail_begin and dest_i <= c_stm_text_len loop
+                while src_i < src_tail_begin loop
                     if ptr(src_i) = '}' then
                         -- default insert variable hex
                         exit;
@@ -1254,7 +1549,7 @@ package body tb_interpreter_pkg is
                                 insert_call_stack_line_number := true;
                             else
                                 assert (false)
-                                report lf & "error: wrong substitution format in {...} brackets " & stm_text_crop(input_txt)
+                                report lf & "error: wrong substitution format in {...} brackets " & ptr.all
                                 severity failure;
                             end if;
                             src_i := src_i + 1;
@@ -1268,7 +1563,7 @@ package body tb_interpreter_pkg is
                             end if;
                         else
                             assert (false)
-                            report lf & "error: wrong substitution format in {...} brackets " & stm_text_crop(input_txt)
+                            report lf & "error: wrong substitution format in {...} brackets " & ptr.all
                             severity failure;
                         end if;
                     end if;
@@ -1278,20 +1573,20 @@ package body tb_interpreter_pkg is
                 src_i := src_i + 1;
             else
                 assert (false)
-                report lf & "error: missing closing } bracket " & stm_text_crop(input_txt)
+                report lf & "error: missing closing } bracket " & ptr.all
                 severity failure;
             end if;
 
             if insert_var then
-                while src_tail_i <= c_stm_text_len loop
+                while src_tail_i <= ptr'length loop
                     if ptr(src_tail_i) = '$' then
                         exit;
                     else
                         src_tail_i := src_tail_i + 1;
                     end if;
                 end loop;
-                assert ptr(src_tail_i) = '$'
-                report lf & "error: missing variable for substitution bracket " & stm_text_crop(input_txt)
+                assert src_tail_i <= ptr'length
+                report lf & "error: missing variable for substitution bracket " & ptr.all
                 severity failure;
                 tmp_field := (others => nul);
                 tmp_i := 1;
@@ -1299,7 +1594,10 @@ package body tb_interpreter_pkg is
                 src_tail_i := src_tail_i + 1;
                 tmp_i := tmp_i + 1;
                 -- parse to the next space
-                while ptr(src_tail_i) /= ' ' and ptr(src_tail_i) /= nul loop
+                while src_tail_i <= ptr'length loop
+                    if ptr(src_tail_i) = ' ' or ptr(src_tail_i) = nul then
+                        exit;
+                    end if;
                     tmp_field(tmp_i) := ptr(src_tail_i);
                     src_tail_i := src_tail_i + 1;
                     tmp_i := tmp_i + 1;
@@ -1309,131 +1607,25 @@ package body tb_interpreter_pkg is
                 report lf & "invalid variable found in stm_text_ptr: ignoring."
                 severity warning;
                 if valid = 1 then
-                    dest_txt_str := ew_str_cat(dest_txt_str, ew_to_str(v1, format));
-                    k := 1;
-                    while dest_txt_str(k) /= nul loop
-                        k := k + 1;
-                    end loop;
-                    dest_i := k;
+                    append_until_nul(ew_to_str(v1, format), 1);
                 end if;
             elsif insert_call_stack_file then
                 stack_called_file := stack_called_files(stack_ptr - previous_level)(1 to max_field_len);
-                dest_txt_str := ew_str_cat(dest_txt_str, stack_called_file);
-                k := 1;
-                while dest_txt_str(k) /= nul loop
-                    k := k + 1;
-                end loop;
-                dest_i := k;
+                append_until_nul(stack_called_file, 1);
             elsif insert_call_stack_line_number then
                 stack_called_file_line_number := stack_called_file_line_numbers(stack_ptr - previous_level);
-                dest_txt_str := ew_str_cat(dest_txt_str, ew_to_str(stack_called_file_line_number, dec));
-                k := 1;
-                while dest_txt_str(k) /= nul loop
-                    k := k + 1;
-                end loop;
-                dest_i := k;
+                append_until_nul(ew_to_str(stack_called_file_line_number, dec), 1);
             elsif insert_call_stack_label then
                 stack_called_label := stack_called_labels(stack_ptr - previous_level);
-                dest_txt_str := ew_str_cat(dest_txt_str, stack_called_label, 2);
-                k := 1;
-                while dest_txt_str(k) /= nul loop
-                    k := k + 1;
-                end loop;
-                dest_i := k;
+                append_until_nul(stack_called_label, 2);
             end if;
         end loop;
+        deallocate(dest);
         assert false
-        report lf & "error: txt_print_wvar ended abnormally " & stm_text_crop(input_txt)
+        report lf & "error: txt_print_wvar ended abnormally " & ptr.all
         severity failure;
     end procedure;
 
-    procedure test_inst_sequ(variable inst_sequ : in stim_line_ptr;
-                             variable file_list : in file_def_ptr;
-                             variable var_list : in var_field_ptr;
-                             constant stm_value_width : in integer) is
-        variable temp_text_field : text_field;
-        variable inst_ptr : stim_line_ptr;
-        variable v_p : unsigned(stm_value_width - 1 downto 0);
-        variable valid : integer;
-        variable line : integer; -- value of the file_line
-        variable file_name : text_line;
-        variable tmp_file_list : file_def_ptr := file_list;
-    begin
-        inst_ptr := inst_sequ;
-        -- go through all the instructions
-        while inst_ptr.next_rec /= null loop
-            line := inst_ptr.file_line;
-            get_instruction_file_name(tmp_file_list, inst_ptr.file_idx, file_name);
-            temp_text_field := inst_ptr.inst_field_1;
-            if temp_text_field(1) /= nul then
-                if is_digit(temp_text_field(1)) then
-                    null;
-                else
-                    access_variable(var_list, temp_text_field, v_p, valid);
-                    assert valid = 1
-                    report lf & "error: first variable on stimulus line " & (integer'image(line)) & " is not valid!!" & lf & "in file " & file_name
-                    severity failure;
-                end if;
-            end if;
-            temp_text_field := inst_ptr.inst_field_2;
-            if temp_text_field(1) /= nul then
-                if is_digit(temp_text_field(1)) then
-                    null;
-                else
-                    access_variable(var_list, temp_text_field, v_p, valid);
-                    assert valid = 1
-                    report lf & "error: second variable on stimulus line " & (integer'image(line)) & " is not valid!!" & lf & "in file " & file_name
-                    severity failure;
-                end if;
-            end if;
-            temp_text_field := inst_ptr.inst_field_3;
-            if temp_text_field(1) /= nul then
-                if is_digit(temp_text_field(1)) then
-                    null;
-                else
-                    access_variable(var_list, temp_text_field, v_p, valid);
-                    assert valid = 1
-                    report lf & "error: third variable on stimulus line " & (integer'image(line)) & " is not valid!!" & lf & "in file " & file_name
-                    severity failure;
-                end if;
-            end if;
-            temp_text_field := inst_ptr.inst_field_4;
-            if temp_text_field(1) /= nul then
-                if is_digit(temp_text_field(1)) then
-                    null;
-                else
-                    access_variable(var_list, temp_text_field, v_p, valid);
-                    assert valid = 1
-                    report lf & "error: forth variable on stimulus line " & (integer'image(line)) & " is not valid!!" & lf & "in file " & file_name
-                    severity failure;
-                end if;
-            end if;
-            temp_text_field := inst_ptr.inst_field_5;
-            if temp_text_field(1) /= nul then
-                if is_digit(temp_text_field(1)) then
-                    null;
-                else
-                    access_variable(var_list, temp_text_field, v_p, valid);
-                    assert valid = 1
-                    report lf & "error: fifth variable on stimulus line " & (integer'image(line)) & " is not valid!!" & lf & "in file " & file_name
-                    severity failure;
-                end if;
-            end if;
-            temp_text_field := inst_ptr.inst_field_6;
-            if temp_text_field(1) /= nul then
-                if is_digit(temp_text_field(1)) then
-                    null;
-                else
-                    access_variable(var_list, temp_text_field, v_p, valid);
-                    assert valid = 1
-                    report lf & "error: sixth variable on stimulus line " & (integer'image(line)) & " is not valid!!" & lf & "in file " & file_name
-                    severity failure;
-                end if;
-            end if;
-            inst_ptr := inst_ptr.next_rec;
-        end loop;
-    end procedure;
-
     procedure tokenize_line(variable text_line : in text_line;
                             variable otoken1 : out text_field;
                             variable otoken2 : out text_field;
@@ -1452,7 +1644,6 @@ package body tb_interpreter_pkg is
         variable comment_found : integer := 0;
         variable txt_found : integer := 0;
         variable j : integer;
-        variable txt_ptr_tmp : stm_text_ptr;
         variable txt_str : stm_text;
         variable token1 : text_field;
         variable token2 : text_field;
@@ -1479,7 +1670,6 @@ package body tb_interpreter_pkg is
         token8 := (others => nul);
         token9 := (others => nul);
         txt_ptr := null;
-        txt_ptr_tmp := null;
         valid := 0;
         txt_found := 0;
         j := 1;
@@ -1497,7 +1687,6 @@ package body tb_interpreter_pkg is
             if txt_found = 0 and (c(1) = DOUBLE_QUOTE or c(1) = SINGLE_QUOTE) then
                 txt_found := 1;
                 txt_enclosing_quote := c(1);
-                txt_ptr_tmp := new stm_text;
                 next;
             end if;
             -- if we have found a txt string
@@ -1510,7 +1699,6 @@ package body tb_interpreter_pkg is
                 -- till the very end of text_line
                 if text_line(i) /= nul then
                     txt_str(j) := text_line(i);
-                    txt_ptr_copy(txt_ptr_tmp, txt_ptr, txt_str);
                     j := j + 1;
                 else
                     exit;
@@ -1621,6 +1809,10 @@ package body tb_interpreter_pkg is
                 exit;
             end if;
         end loop;
+        -- the text is allocated once with its length
+        if txt_found = 1 and j > 1 then
+            new_stm_text_ptr(txt_str(1 to j - 1), txt_ptr);
+        end if;
         -- did we find a comment and there is a token
         if comment_found = 1 then
             if token_index /= 0 then
@@ -1669,10 +1861,15 @@ package body tb_interpreter_pkg is
                              variable stack_called_file_line_numbers : stack_numbers_array;
                              variable stack_called_labels : stack_text_field_array;
                              constant stm_value_width : in integer) is
-        variable stm_text_substituded : stm_text;
+        variable stm_text_substituded : stm_text_ptr;
     begin
         stm_text_substitude_wvar(var_list, ptr, txt_enclosing_quote, stack_ptr, stack_called_files, stack_called_file_line_numbers, stack_called_labels, stm_text_substituded, stm_value_width);
-        print(stm_text_substituded);
+        if stm_text_substituded /= null then
+            print(stm_text_substituded.all);
+            deallocate(stm_text_substituded);
+        else
+            print("");
+        end if;
     end procedure;
 
     procedure update_variable(variable var_list : in var_field_ptr;
@@ -1701,20 +1898,14 @@ package body tb_interpreter_pkg is
                               variable valid : out integer) is
         variable ptr : var_field_ptr;
     begin
-        ptr := var_list;
+        find_variable(var_list, index, ptr);
         valid := 0;
-        while ptr.next_rec /= null loop
-            if (ptr.var_index = index and ptr.var_stm_type /= STM_CONST_VALUE_TYPE) then
+        if ptr /= null then
+            -- constants are not updated
+            if ptr.var_stm_type /= STM_CONST_VALUE_TYPE then
                 ptr.var_value := value;
                 valid := 1;
-                exit;
             end if;
-            ptr := ptr.next_rec;
-        end loop;
-        -- check the current one
-        if ptr.var_index = index and ptr.var_stm_type /= STM_CONST_VALUE_TYPE then
-            ptr.var_value := value;
-            valid := 1;
         end if;
     end procedure;
 
@@ -1734,17 +1925,9 @@ package body tb_interpreter_pkg is
                               variable valid : out integer) is
         variable ptr : var_field_ptr;
     begin
-        ptr := var_list;
+        find_variable(var_list, index, ptr);
         valid := 0;
-        while ptr.next_rec /= null loop
-            if ptr.var_index = index then
-                ptr.var_stm_text := var_stm_text;
-                valid := 1;
-                exit;
-            end if;
-            ptr := ptr.next_rec;
-        end loop;
-        if ptr.var_index = index then
+        if ptr /= null then
             ptr.var_stm_text := var_stm_text;
             valid := 1;
         end if;
@@ -1766,20 +1949,14 @@ package body tb_interpreter_pkg is
                               variable valid : out integer) is
         variable ptr : var_field_ptr;
     begin
-        ptr := var_list;
+        find_variable(var_list, index, ptr);
         valid := 0;
-        while ptr.next_rec /= null loop
-            if ptr.var_index = index and ptr.var_stm_type /= STM_CONST_VALUE_TYPE then
+        if ptr /= null then
+            -- constants are not updated
+            if ptr.var_stm_type /= STM_CONST_VALUE_TYPE then
                 ptr.var_stm_array := stm_array;
                 valid := 1;
-                exit;
             end if;
-            ptr := ptr.next_rec;
-        end loop;
-        -- check the current one
-        if ptr.var_index = index and ptr.var_stm_type /= STM_CONST_VALUE_TYPE then
-            ptr.var_stm_array := stm_array;
-            valid := 1;
         end if;
     end procedure;
 
@@ -1799,17 +1976,9 @@ package body tb_interpreter_pkg is
                               variable valid : out integer) is
         variable ptr : var_field_ptr;
     begin
-        ptr := var_list;
+        find_variable(var_list, index, ptr);
         valid := 0;
-        while ptr.next_rec /= null loop
-            if (ptr.var_index = index) then
-                ptr.var_stm_lines := stm_lines;
-                valid := 1;
-                exit;
-            end if;
-            ptr := ptr.next_rec;
-        end loop;
-        if ptr.var_index = index then
+        if ptr /= null then
             ptr.var_stm_lines := stm_lines;
             valid := 1;
         end if;
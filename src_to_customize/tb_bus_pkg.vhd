@@ -69,6 +69,28 @@ package tb_bus_pkg is
                        variable valid : out integer;
                        variable successfull : out boolean;
                        variable timeout : in time);
+
+    procedure bus_write_array(signal bus_down : out t_bus_down;
+                              signal bus_up : in t_bus_up;
+                              variable address : in unsigned;
+                              variable data : in t_stm_array_ptr;
+                              variable access_width : in integer;
+                              variable bus_number : in integer;
+                              variable outstanding : in integer;
+                              variable valid : out integer;
+                              variable successfull : out boolean;
+                              variable timeout : in time);
+
+    procedure bus_read_array(signal bus_down : out t_bus_down;
+                             signal bus_up : in t_bus_up;
+                             variable address : in unsigned;
+                             variable data : in t_stm_array_ptr;
+                             variable access_width : in integer;
+                             variable bus_number : in integer;
+                             variable outstanding : in integer;
+                             variable valid : out integer;
+                             variable successfull : out boolean;
+                             variable timeout : in time);
 end;
 
 package body tb_bus_pkg is
@@ -295,4 +317,121 @@ package body tb_bus_pkg is
         end case;
 
     end procedure;
+
+    -- buses without a block transfer of their own access the elements one by one
+    procedure bus_write_array(signal bus_down : out t_bus_down;
+                              signal bus_up : in t_bus_up;
+                              variable address : in unsigned;
+                              variable data : in t_stm_array_ptr;
+                              variable access_width : in integer;
+                              variable bus_number : in integer;
+                              variable outstanding : in integer;
+                              variable valid : out integer;
+                              variable successfull : out boolean;
+                              variable timeout : in time) is
+        variable element_address : unsigned(address'range);
+    begin
+        valid := 1;
+        case bus_number is
+            when 0 =>
+                write_wishbone_32_array(
+                    bus_down.wishbone32,
+                    bus_up.wishbone32,
+                    address,
+                    data,
+                    access_width,
+                    successfull,
+                    timeout);
+
+            when 4 =>
+                write_avalonmm_32_array(
+                    bus_down.avalonmm32,
+                    bus_up.avalonmm32,
+                    address,
+                    data,
+                    access_width,
+                    successfull,
+                    timeout);
+
+            when 6 =>
+                write_axi4lite_32_array(
+                    bus_down.axi4lite32,
+                    bus_up.axi4lite32,
+                    address,
+                    data,
+                    access_width,
+                    outstanding,
+                    successfull,
+                    timeout);
+
+            when others =>
+                element_address := address;
+                for i in 0 to data'length - 1 loop
+                    bus_write(bus_down, bus_up, element_address, data(i), access_width, bus_number, valid, successfull, timeout);
+                    if valid = 0 or not successfull then
+                        return;
+                    end if;
+                    element_address := element_address + access_width / 8;
+                end loop;
+        end case;
+
+    end procedure;
+
+    procedure bus_read_array(signal bus_down : out t_bus_down;
+                             signal bus_up : in t_bus_up;
+                             variable address : in unsigned;
+                             variable data : in t_stm_array_ptr;
+                             variable access_width : in integer;
+                             variable bus_number : in integer;
+                             variable outstanding : in integer;
+                             variable valid : out integer;
+                             variable successfull : out boolean;
+                             variable timeout : in time) is
+        variable element_address : unsigned(address'range);
+    begin
+        valid := 1;
+        case bus_number is
+            when 0 =>
+                read_wishbone_32_array(
+                    bus_down.wishbone32,
+                    bus_up.wishbone32,
+                    address,
+                    data,
+                    access_width,
+                    successfull,
+                    timeout);
+
+            when 4 =>
+                read_avalonmm_32_array(
+                    bus_down.avalonmm32,
+                    bus_up.avalonmm32,
+                    address,
+                    data,
+                    access_width,
+                    successfull,
+                    timeout);
+
+            when 6 =>
+                read_axi4lite_32_array(
+                    bus_down.axi4lite32,
+                    bus_up.axi4lite32,
+                    address,
+                    data,
+                    access_width,
+                    outstanding,
+                    successfull,
+                    timeout);
+
+            when others =>
+                element_address := address;
+                for i in 0 to data'length - 1 loop
+                    bus_read(bus_down, bus_up, element_address, data(i), access_width, bus_number, valid, successfull, timeout);
+                    if valid = 0 or not successfull then
+                        return;
+                    end if;
+                    element_address := element_address + access_width / 8;
+                end loop;
+        end case;
+
+    end procedure;
 end package body;
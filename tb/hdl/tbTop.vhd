@@ -42,6 +42,7 @@ entity tbTop is
         stimulus_file : string := "testMain.stm";
         stimulus_main_entry_label : string := "$testMain";
         stimulus_test_suite_index : integer := 255;
+        stimulus_profile_file : string := "";
         Ram32InitialCellValues : array_of_std_logic_vector(0 to 63)(31 downto 0) := (others => x"BABABABA");
         machine_value_width : integer := 2 ** (stimulus_test_suite_index rem 4) * 32;
         machine_address_width : integer := 31
@@ -104,6 +105,7 @@ begin
             stimulus_path => stimulus_path,
             stimulus_file => stimulus_file,
             stimulus_main_entry_label => stimulus_main_entry_label,
+            stimulus_profile_file => stimulus_profile_file,
             machine_value_width => machine_value_width,
             machine_address_width => machine_address_width
         )